@@ -13,74 +13,12 @@ import sys
 import os
 from datetime import datetime
 
-# Agregar el directorio actual al path para importar los módulos
+# Agregar el directorio actual y Main al path para importar los módulos
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Main'))
 
 from config import ARCHIVO_EXCEL
-
-def validar_numero_telefono_mejorado(numero) -> str | None:
-    """
-    Función mejorada de validación (copia de la versión optimizada)
-    """
-    import pandas as pd
-    import re
-    
-    # Verificar si el número es nulo, vacío o NaN
-    if numero is None or pd.isna(numero):
-        return None
-    
-    # Convertir a string y manejar números flotantes
-    try:
-        if isinstance(numero, float):
-            if pd.isna(numero):
-                return None
-            numero_str = str(int(numero))
-        else:
-            numero_str = str(numero).strip()
-    except (ValueError, OverflowError):
-        return None
-    
-    # Verificar que no esté vacío después de la conversión
-    if not numero_str or numero_str.lower() in ['nan', 'none', 'null', '']:
-        return None
-    
-    # Remover todos los caracteres que no sean dígitos
-    numero_limpio = re.sub(r'[^\d]', '', numero_str)
-    
-    # Verificar que queden dígitos después de la limpieza
-    if not numero_limpio or not numero_limpio.isdigit():
-        return None
-    
-    # Remover prefijo de país Argentina (54) si existe
-    if numero_limpio.startswith('54'):
-        numero_limpio = numero_limpio[2:]
-    
-    # Manejar números que empiezan con 0
-    if numero_limpio.startswith('0'):
-        numero_limpio = numero_limpio[1:]
-    
-    # Verificar longitud
-    if len(numero_limpio) < 8 or len(numero_limpio) > 12:
-        return None
-    
-    # Formatear según el caso
-    if numero_limpio.startswith('11') and len(numero_limpio) == 10:
-        return f"549{numero_limpio}"
-    elif numero_limpio.startswith('9') and len(numero_limpio) == 11:
-        return f"54{numero_limpio}"
-    elif numero_limpio.startswith('9') and len(numero_limpio) == 10:
-        return f"54{numero_limpio}"
-    elif len(numero_limpio) == 10:
-        return f"549{numero_limpio}"
-    elif len(numero_limpio) == 8:
-        return f"5411{numero_limpio}"
-    elif len(numero_limpio) == 9:
-        return f"549{numero_limpio}"
-    elif len(numero_limpio) == 11:
-        return f"54{numero_limpio}"
-    
-    return None
-
+from utils import normalizar_telefonos
 
 def crear_directorio_corregidos():
     """
@@ -154,7 +92,7 @@ def corregir_telefonos_excel(archivo_excel):
         df_corregido[f'{columna_telefono}_Original'] = df_corregido[columna_telefono].copy()
         
         # Aplicar la validación/corrección
-        df_corregido[columna_telefono] = df_corregido[columna_telefono].apply(validar_numero_telefono_mejorado)
+        df_corregido[columna_telefono], _ = normalizar_telefonos(df_corregido[columna_telefono])
         
         # Estadísticas después de la corrección
         telefonos_corregidos = df_corregido[columna_telefono].notna().sum()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de Parseo de Fechas
+=============================
+
+Compara el parseo celda por celda de una columna de fechas (pd.to_datetime
+sobre la columna completa) contra el parseo por valores únicos que usa
+DataHandler (factorizar, parsear los únicos y reconstruir por códigos).
+
+Uso:
+    python benchmark_fechas.py [cantidad_filas]
+"""
+
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+# Agregar el directorio actual al path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_handler import DataHandler
+
+FORMATO = '%d/%m/%y'
+REPETICIONES = 3
+
+
+def generar_columna(cantidad_filas: int, semilla: int = 42) -> pd.Series:
+    """Genera una columna de fechas como texto con la repetición típica de una planilla VTV."""
+    rng = np.random.default_rng(semilla)
+    # Aproximadamente 4 años de días hábiles de revisión
+    dias = pd.date_range('2021-01-01', '2024-12-31', freq='B')
+    fechas = dias[rng.integers(0, len(dias), cantidad_filas)]
+    serie = pd.Series(fechas.strftime(FORMATO), dtype=object)
+    # Algunas celdas vacías, como en los archivos reales
+    serie[rng.random(cantidad_filas) < 0.01] = None
+    return serie
+
+
+def medir(funcion, *args, **kwargs):
+    """Devuelve (mejor tiempo en segundos, resultado) de varias repeticiones."""
+    mejor = float('inf')
+    resultado = None
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        resultado = funcion(*args, **kwargs)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main():
+    cantidad_filas = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+
+    print("=" * 60)
+    print("           BENCHMARK DE PARSEO DE FECHAS")
+    print("=" * 60)
+
+    serie = generar_columna(cantidad_filas)
+    print(f"📊 Filas: {cantidad_filas:,} | Valores distintos: {serie.nunique():,}")
+
+    tiempo_actual, fechas_actual = medir(pd.to_datetime, serie, format=FORMATO, errors='coerce')
+    tiempo_unicos, fechas_unicos = medir(DataHandler._parsear_unicos, serie, format=FORMATO, errors='coerce')
+
+    iguales = fechas_actual.equals(fechas_unicos.astype(fechas_actual.dtype))
+
+    print(f"⏱️  Celda por celda : {tiempo_actual * 1000:9.1f} ms")
+    print(f"⏱️  Valores únicos  : {tiempo_unicos * 1000:9.1f} ms")
+    print(f"🚀 Aceleración     : {tiempo_actual / tiempo_unicos:9.1f}x")
+    print(f"✅ Resultados idénticos: {iguales}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de Lectores de Datos
+==============================
+
+Genera una planilla sintética con las columnas de un Excel VTV real, la guarda
+en cada formato soportado (xlsx, csv, parquet, feather) y mide cuánto tarda
+DataHandler en cargarla y procesarla con cada lector. También verifica que
+todos los lectores produzcan los mismos datos procesados.
+
+Uso:
+    python benchmark_lectores.py [cantidad_filas]
+"""
+
+import sys
+import os
+import time
+import tempfile
+import logging
+import numpy as np
+import pandas as pd
+
+# Agregar el directorio actual al path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_handler import DataHandler
+from lectores import CALAMINE_DISPONIBLE, PYARROW_DISPONIBLE
+
+COLUMNAS_COMPARADAS = ['_patente', 'NumeroValidado', '_fecha_revision', '_fecha_vencimiento', '_marca', '_modelo']
+
+
+def generar_planilla(cantidad_filas: int, semilla: int = 42) -> pd.DataFrame:
+    """Genera un DataFrame con la forma de la planilla de clientes (incluye columnas que no se usan)."""
+    rng = np.random.default_rng(semilla)
+    revision = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, cantidad_filas), unit='D')
+    return pd.DataFrame({
+        'Patente': [f"AB{i:06d}" for i in range(cantidad_filas)],
+        'NumeroDeWhatsapp': rng.integers(3_750_000_000, 3_759_999_999, cantidad_filas),
+        'FechaDeRevision': revision.strftime('%d/%m/%y'),
+        'FechaDeVencimiento': (revision + pd.DateOffset(years=1)).strftime('%d/%m/%y'),
+        'MARCA': rng.choice(['FORD', 'FIAT', 'VOLKSWAGEN', 'CHEVROLET', 'RENAULT'], cantidad_filas),
+        'MODELO': rng.choice(['FIESTA', 'PALIO', 'GOL', 'CORSA', 'CLIO'], cantidad_filas),
+        'EMAIL': 'cliente@ejemplo.com',
+        'OBLEA': rng.integers(0, 1_000_000_000, cantidad_filas),
+        'NRO_INTERNO': np.arange(cantidad_filas),
+    })
+
+
+def escribir_formatos(df: pd.DataFrame, directorio: str) -> dict:
+    """Guarda la planilla en cada formato y devuelve {lector: ruta}."""
+    rutas = {'openpyxl': os.path.join(directorio, 'planilla.xlsx')}
+    df.to_excel(rutas['openpyxl'], index=False)
+    if CALAMINE_DISPONIBLE:
+        rutas['calamine'] = rutas['openpyxl']
+
+    rutas['csv'] = os.path.join(directorio, 'planilla.csv')
+    df.to_csv(rutas['csv'], index=False)
+
+    if PYARROW_DISPONIBLE:
+        rutas['parquet'] = os.path.join(directorio, 'planilla.parquet')
+        df.to_parquet(rutas['parquet'], index=False)
+        rutas['feather'] = os.path.join(directorio, 'planilla.feather')
+        df.to_feather(rutas['feather'])
+    return rutas
+
+
+def medir(lector: str, ruta: str):
+    """Devuelve (segundos, DataFrame procesado) para una carga completa sin caché."""
+    handler = DataHandler(ruta, usar_cache=False, lector=lector)
+    inicio = time.perf_counter()
+    df = handler._leer_y_procesar()
+    return time.perf_counter() - inicio, df
+
+
+def main():
+    cantidad_filas = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    logging.basicConfig(level=logging.WARNING)
+
+    print("=" * 60)
+    print("           BENCHMARK DE LECTORES DE DATOS")
+    print("=" * 60)
+    print(f"📊 Filas: {cantidad_filas:,}")
+    if not CALAMINE_DISPONIBLE:
+        print("ℹ️  python-calamine no está instalado: se omite el lector calamine.")
+    if not PYARROW_DISPONIBLE:
+        print("ℹ️  pyarrow no está instalado: se omiten parquet y feather.")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        rutas = escribir_formatos(generar_planilla(cantidad_filas), directorio)
+
+        referencia = None
+        tiempo_base = None
+        for lector, ruta in rutas.items():
+            segundos, df = medir(lector, ruta)
+            datos = df[COLUMNAS_COMPARADAS].astype(str)
+            if referencia is None:
+                referencia, tiempo_base = datos, segundos
+            iguales = datos.equals(referencia)
+            print(f"⏱️  {lector:<9}: {segundos * 1000:9.1f} ms  "
+                  f"({tiempo_base / segundos:5.1f}x)  {'✅' if iguales else '❌ datos distintos'}")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
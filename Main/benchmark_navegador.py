@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark del Modo de Navegador
+===============================
+
+Abre una sesión de WhatsAppNotifier en cada modo de navegador (normal y
+liviano) y mide cuánto consume Chrome: memoria residente (RSS) y CPU de todo
+el árbol de procesos que lanza ChromeDriver, en reposo y mientras envía los
+mensajes de prueba. Sirve para estimar cuántas sesiones entran por servidor.
+
+Por defecto usa la página simulada de debug_navegacion_enlace.py (no toca la
+cuenta real). Con una URL se mide contra esa página usando CHROME_PROFILE_PATH,
+que para WhatsApp Web tiene que tener la sesión iniciada; en ese caso solo se
+mide el reposo, sin enviar mensajes.
+
+Requiere psutil (pip install psutil).
+
+Uso:
+    python benchmark_navegador.py [segundos_reposo] [url]
+"""
+
+import sys
+import os
+import time
+import tempfile
+import logging
+
+# Agregar el directorio actual al path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from whatsapp_notifier import WhatsAppNotifier
+from debug_navegacion_enlace import iniciar_servidor, NUMEROS_PRUEBA, MENSAJE_PRUEBA
+from config import CHROME_PROFILE_PATH
+
+
+def procesos_chrome(notificador) -> list:
+    """Procesos de Chrome de una sesión: todos los hijos de su ChromeDriver."""
+    return psutil.Process(notificador.driver.service.process.pid).children(recursive=True)
+
+
+def consumo(procesos: list) -> tuple:
+    """Devuelve (RSS total en MB, segundos de CPU acumulados) de los procesos que siguen vivos."""
+    rss, cpu = 0, 0.0
+    for proceso in procesos:
+        try:
+            rss += proceso.memory_info().rss
+            tiempos = proceso.cpu_times()
+            cpu += tiempos.user + tiempos.system
+        except psutil.NoSuchProcess:
+            pass
+    return rss / 1024 / 1024, cpu
+
+
+def medir(modo: str, url: str, perfil: str, segundos_reposo: float, enviar: bool) -> dict | None:
+    inicio = time.perf_counter()
+    notificador = WhatsAppNotifier(url_whatsapp=url, perfil_chrome=perfil,
+                                   modo_navegador=modo, sesion_persistente=False)
+    if not notificador.inicializar_driver():
+        return None
+    try:
+        if not notificador.abrir_whatsapp():
+            return None
+        arranque = time.perf_counter() - inicio
+        procesos = procesos_chrome(notificador)
+
+        _, cpu_inicial = consumo(procesos)
+        time.sleep(segundos_reposo)
+        rss_reposo, cpu_reposo = consumo(procesos)
+
+        resultado = {
+            'arranque': arranque,
+            'procesos': len(procesos),
+            'rss_reposo': rss_reposo,
+            'cpu_reposo': (cpu_reposo - cpu_inicial) / segundos_reposo * 100,
+        }
+        if enviar:
+            inicio_envio = time.perf_counter()
+            for numero in NUMEROS_PRUEBA:
+                notificador.enviar_notificacion(numero, MENSAJE_PRUEBA.format(numero=numero))
+            rss_envio, cpu_envio = consumo(procesos)
+            resultado.update({
+                'rss_envio': rss_envio,
+                'cpu_por_mensaje': (cpu_envio - cpu_reposo) / len(NUMEROS_PRUEBA),
+                'segundos_por_mensaje': (time.perf_counter() - inicio_envio) / len(NUMEROS_PRUEBA),
+            })
+        return resultado
+    finally:
+        notificador.cerrar()
+
+
+def main():
+    if psutil is None:
+        print("❌ Este benchmark necesita psutil: pip install psutil")
+        sys.exit(1)
+
+    segundos_reposo = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    url = sys.argv[2] if len(sys.argv) > 2 else None
+    logging.basicConfig(level=logging.WARNING)
+
+    servidor = None
+    if url is None:
+        servidor = iniciar_servidor()
+        url = f"http://127.0.0.1:{servidor.server_address[1]}"
+    enviar = servidor is not None
+
+    print("=" * 90)
+    print("                     BENCHMARK DEL MODO DE NAVEGADOR")
+    print("=" * 90)
+    print(f"🌐 Página: {url} | Reposo medido: {segundos_reposo:.0f} s")
+
+    try:
+        for modo in WhatsAppNotifier.MODOS_NAVEGADOR:
+            if enviar:
+                with tempfile.TemporaryDirectory() as perfil:
+                    resultado = medir(modo, url, perfil, segundos_reposo, enviar)
+            else:
+                resultado = medir(modo, url, CHROME_PROFILE_PATH, segundos_reposo, enviar)
+
+            if resultado is None:
+                print(f"  {modo:<8} ❌ no se pudo abrir la sesión")
+                continue
+            linea = (f"  {modo:<8} arranque: {resultado['arranque']:5.1f} s | procesos: {resultado['procesos']:2d} | "
+                     f"RSS reposo: {resultado['rss_reposo']:7.1f} MB | CPU reposo: {resultado['cpu_reposo']:5.1f} %")
+            if enviar:
+                linea += (f"\n  {'':<8} RSS enviando: {resultado['rss_envio']:7.1f} MB | "
+                          f"CPU por mensaje: {resultado['cpu_por_mensaje']:5.2f} s | "
+                          f"tiempo por mensaje: {resultado['segundos_por_mensaje']:5.2f} s")
+            print(linea)
+    finally:
+        if servidor is not None:
+            servidor.shutdown()
+    print("=" * 90)
+
+
+if __name__ == "__main__":
+    main()
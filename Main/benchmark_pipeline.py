@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark del Pipeline Asíncrono
+================================
+
+Compara la campaña secuencial (cargar y filtrar todo, después enviar) con
+PipelineCampana sobre una planilla sintética en CSV, usando el notificador
+simulado de benchmark_pool_envio.py (sin abrir Chrome). Mide el tiempo total,
+el tiempo hasta el primer envío y el pico de memoria de Python (tracemalloc),
+y verifica que los dos caminos envíen los mismos mensajes y reporten los
+mismos fallos.
+
+Uso:
+    python benchmark_pipeline.py [cantidad_filas] [segundos_por_mensaje]
+"""
+
+import sys
+import os
+import time
+import asyncio
+import tempfile
+import logging
+import tracemalloc
+import pandas as pd
+
+# Agregar el directorio actual al path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_handler import DataHandler
+from plantillas import RenderizadorMensajes
+from pool_envio import PoolEnvio
+from pipeline import PipelineCampana
+from benchmark_lectores import generar_planilla
+from benchmark_pool_envio import NotificadorSimulado
+from config import MENSAJE_TEMPLATE, MENSAJE_VENCIDO_TEMPLATE
+
+SESIONES = 2
+
+
+class NotificadorCronometrado(NotificadorSimulado):
+    """Notificador simulado que anota cuándo se hizo el primer envío."""
+
+    primer_envio = None
+
+    def enviar_notificacion(self, numero: str, mensaje: str):
+        if NotificadorCronometrado.primer_envio is None:
+            NotificadorCronometrado.primer_envio = time.perf_counter()
+        return super().enviar_notificacion(numero, mensaje)
+
+
+def crear_pool() -> PoolEnvio:
+    return PoolEnvio([f"perfil_{i}" for i in range(SESIONES)], intervalo=0,
+                     crear_notificador=NotificadorCronometrado)
+
+
+def secuencial(ruta: str, renderizador, reporte: str):
+    handler = DataHandler(ruta, usar_cache=False, lector='csv')
+    vencimientos = handler.cargar_y_filtrar_streaming()
+    pool = crear_pool()
+    pool.iniciar()
+    resultado = pool.enviar(renderizador.iterar(handler.iterar_notificaciones(vencimientos)), len(vencimientos))
+    handler.crear_reporte_fallidos(resultado.fallidos, reporte)
+    enviados = sorted(numero for n in pool.notificadores for numero in n.numeros)
+    pool.cerrar()
+    return enviados, len(resultado.fallidos)
+
+
+def asincrono(ruta: str, renderizador, reporte: str):
+    handler = DataHandler(ruta, usar_cache=False, lector='csv')
+    pool = crear_pool()
+    resumen = asyncio.run(PipelineCampana(handler, renderizador, pool, archivo_reporte=reporte).ejecutar())
+    enviados = sorted(numero for n in pool.notificadores for numero in n.numeros)
+    return enviados, resumen.fallidos
+
+
+def medir(funcion, *args):
+    """Devuelve (segundos, segundos hasta el primer envío, pico de memoria en MB, resultado)."""
+    NotificadorCronometrado.primer_envio = None
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    primer_envio = (NotificadorCronometrado.primer_envio or inicio) - inicio
+    return segundos, primer_envio, pico / 1024 / 1024, resultado
+
+
+def main():
+    cantidad_filas = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    NotificadorSimulado.demora = float(sys.argv[2]) if len(sys.argv) > 2 else 0.001
+    logging.basicConfig(level=logging.CRITICAL)
+
+    renderizador = RenderizadorMensajes(MENSAJE_TEMPLATE, MENSAJE_VENCIDO_TEMPLATE)
+
+    print("=" * 70)
+    print("                 BENCHMARK DEL PIPELINE ASÍNCRONO")
+    print("=" * 70)
+    print(f"📄 Filas: {cantidad_filas} | Sesiones: {SESIONES} | "
+          f"Demora por mensaje: {NotificadorSimulado.demora * 1000:.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        planilla = generar_planilla(cantidad_filas)
+        # Vencimientos alrededor de hoy, para que haya mensajes que enviar
+        hoy = pd.Timestamp.today().normalize()
+        vencimiento = hoy + pd.to_timedelta(pd.RangeIndex(cantidad_filas) % 60 - 30, unit='D')
+        planilla['FechaDeVencimiento'] = vencimiento.strftime('%d/%m/%y')
+        planilla['FechaDeRevision'] = (vencimiento - pd.DateOffset(years=1)).strftime('%d/%m/%y')
+        ruta = os.path.join(directorio, 'planilla.csv')
+        planilla.to_csv(ruta, index=False)
+        del planilla
+
+        resultados = {}
+        for nombre, funcion in (('secuencial', secuencial), ('pipeline', asincrono)):
+            reporte = os.path.join(directorio, f"fallidos_{nombre}.xlsx")
+            segundos, primer_envio, pico_mb, (enviados, fallidos) = medir(funcion, ruta, renderizador, reporte)
+            resultados[nombre] = (enviados, fallidos)
+            print(f"  {nombre:<11} total: {segundos:6.2f} s | primer envío: {primer_envio:5.2f} s | "
+                  f"pico de memoria: {pico_mb:7.1f} MB | mensajes: {len(enviados)} | fallidos: {fallidos}")
+
+    iguales = resultados['secuencial'] == resultados['pipeline']
+    print(f"\n🔁 Mismos envíos y fallos en ambos modos: {'✅' if iguales else '❌'}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
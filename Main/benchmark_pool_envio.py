@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark del Envío en Paralelo
+===============================
+
+Mide cuánto tarda PoolEnvio en repartir una campaña entre 1, 2 y 4 sesiones.
+Cada sesión usa un notificador simulado que tarda un tiempo fijo por mensaje
+(sin abrir Chrome), así se ve el efecto del reparto y del intervalo por
+sesión. También verifica que cada número vaya siempre a la misma sesión y
+que el reporte de fallidos quede en el orden de la campaña.
+
+Uso:
+    python benchmark_pool_envio.py [cantidad_mensajes] [segundos_por_mensaje]
+"""
+
+import sys
+import os
+import time
+import logging
+
+# Agregar el directorio actual al path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_handler import Notificacion
+from pool_envio import PoolEnvio
+
+
+class NotificadorSimulado:
+    """Imita a WhatsAppNotifier: tarda `demora` segundos por mensaje y falla con los números terminados en 0."""
+
+    demora = 0.05
+
+    def __init__(self, perfil_chrome: str):
+        self.perfil_chrome = perfil_chrome
+        self.numeros = []
+
+    def inicializar_driver(self):
+        return True
+
+    def abrir_whatsapp(self):
+        return True
+
+    def enviar_notificacion(self, numero: str, mensaje: str):
+        time.sleep(self.demora)
+        self.numeros.append(numero)
+        if numero.endswith('0'):
+            return False, "Número simulado inválido"
+        return True, "Enviado"
+
+    def cerrar(self):
+        pass
+
+
+def generar_campana(cantidad: int) -> list:
+    return [
+        (Notificacion(f"AB{i:06d}", 'FORD', 'FIESTA', f"549375{i:07d}", f"375{i:07d}",
+                      '01/01/2024', '01/01/2025', bool(i % 2), i % 30),
+         f"Mensaje {i}")
+        for i in range(cantidad)
+    ]
+
+
+def medir(sesiones: int, campana: list, intervalo: float):
+    pool = PoolEnvio([f"perfil_{i}" for i in range(sesiones)], intervalo=intervalo,
+                     crear_notificador=NotificadorSimulado)
+    pool.iniciar()
+    inicio = time.perf_counter()
+    resultado = pool.enviar(iter(campana), len(campana))
+    segundos = time.perf_counter() - inicio
+    asignacion_fija = all(
+        pool.asignar(numero) == i for i, n in enumerate(pool.notificadores) for numero in n.numeros
+    )
+    pool.cerrar()
+    return segundos, resultado, asignacion_fija
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    NotificadorSimulado.demora = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    intervalo = NotificadorSimulado.demora
+    # Los fallos simulados son esperados: no registrarlos
+    logging.basicConfig(level=logging.CRITICAL)
+
+    print("=" * 60)
+    print("           BENCHMARK DEL ENVÍO EN PARALELO")
+    print("=" * 60)
+    print(f"📊 Mensajes: {cantidad}, demora por mensaje: {NotificadorSimulado.demora}s, "
+          f"intervalo por sesión: {intervalo}s")
+
+    campana = generar_campana(cantidad)
+    tiempo_base = None
+    for sesiones in (1, 2, 4):
+        segundos, resultado, asignacion_fija = medir(sesiones, campana, intervalo)
+        tiempo_base = tiempo_base or segundos
+        en_orden = [f['Patente'] for f in resultado.fallidos] == sorted(f['Patente'] for f in resultado.fallidos)
+        print(f"⏱️  {sesiones} sesión(es): {segundos:6.2f} s ({tiempo_base / segundos:4.1f}x)  "
+              f"enviados {resultado.enviados}, fallidos {len(resultado.fallidos)}  "
+              f"{'✅' if asignacion_fija and en_orden else '❌ asignación u orden incorrectos'}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Caché de Datos
+========================
+
+Guarda en disco (Parquet o Feather) el DataFrame ya procesado por DataHandler
+para que una ejecución posterior sobre el mismo Excel no tenga que volver a
+parsearlo ni a detectar formatos de fecha.
+
+La clave de la caché combina la ruta, el tamaño, la fecha de modificación y el
+hash del contenido del archivo, junto con la configuración de columnas, el
+modo detallado y el lector usado. Si cualquiera de ellos cambia, la entrada se
+considera vencida y se elimina.
+
+También guarda, por archivo, los formatos de fecha detectados en cada columna
+para usarlos como pista en la próxima ejecución.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import pandas as pd
+
+from config import DIRECTORIO_CACHE, FORMATO_CACHE
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_DISPONIBLE = True
+except ImportError:
+    PYARROW_DISPONIBLE = False
+
+
+def _nombre_entrada(archivo: str) -> str:
+    """Nombre base de las entradas de caché asociadas a un archivo."""
+    return hashlib.sha1(os.path.abspath(archivo).encode('utf-8')).hexdigest()[:16]
+
+
+class CacheDatos:
+    """Caché columnar del DataFrame procesado, una entrada por archivo Excel."""
+
+    # Incrementar cuando cambie el procesamiento para invalidar cachés viejas
+    VERSION = 7
+    FORMATOS = ('parquet', 'feather')
+    TAMANO_BLOQUE_HASH = 1024 * 1024
+
+    def __init__(self, directorio: str = DIRECTORIO_CACHE, formato: str = FORMATO_CACHE):
+        self.directorio = directorio
+        self.formato = formato if formato in self.FORMATOS else 'parquet'
+
+    @property
+    def disponible(self) -> bool:
+        """Indica si existe un motor columnar instalado (pyarrow)."""
+        return PYARROW_DISPONIBLE
+
+    def _rutas(self, archivo: str) -> tuple[str, str]:
+        """Devuelve las rutas del archivo de datos y de metadatos para un Excel."""
+        base = os.path.join(self.directorio, _nombre_entrada(archivo))
+        return f"{base}.{self.formato}", f"{base}.json"
+
+    def _hash_contenido(self, archivo: str) -> str:
+        """Calcula el SHA-256 del archivo leyéndolo por bloques."""
+        sha = hashlib.sha256()
+        with open(archivo, 'rb') as f:
+            for bloque in iter(lambda: f.read(self.TAMANO_BLOQUE_HASH), b''):
+                sha.update(bloque)
+        return sha.hexdigest()
+
+    def _clave(self, archivo: str, configuracion: dict, con_hash: bool = True) -> dict:
+        """Construye la clave de la caché para el archivo y la configuración de columnas."""
+        estado = os.stat(archivo)
+        clave = {
+            'version': self.VERSION,
+            'ruta': os.path.abspath(archivo),
+            'tamano': estado.st_size,
+            'mtime_ns': estado.st_mtime_ns,
+            'columnas': hashlib.sha1(
+                json.dumps(configuracion, sort_keys=True).encode('utf-8')
+            ).hexdigest(),
+        }
+        if con_hash:
+            clave['sha256'] = self._hash_contenido(archivo)
+        return clave
+
+    def cargar(self, archivo: str, configuracion: dict) -> tuple[pd.DataFrame, dict] | None:
+        """
+        Intenta recuperar el DataFrame procesado desde la caché.
+
+        Args:
+            archivo (str): Ruta del Excel original.
+            configuracion (dict): Configuración de columnas usada para el mapeo.
+
+        Returns:
+            tuple | None: (DataFrame, columnas_mapeadas) o None si no hay una entrada válida.
+        """
+        if not self.disponible:
+            return None
+
+        ruta_datos, ruta_meta = self._rutas(archivo)
+        if not (os.path.exists(ruta_datos) and os.path.exists(ruta_meta)):
+            return None
+
+        try:
+            with open(ruta_meta, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+
+            # Primero comparar lo barato (tamaño, mtime, versión) y recién después el hash
+            clave_rapida = self._clave(archivo, configuracion, con_hash=False)
+            clave_guardada = meta.get('clave', {})
+            if any(clave_guardada.get(k) != v for k, v in clave_rapida.items()):
+                logger.info("♻️ La caché de datos está desactualizada, se reconstruirá.")
+                self.invalidar(archivo)
+                return None
+
+            if clave_guardada.get('sha256') != self._hash_contenido(archivo):
+                logger.info("♻️ El contenido del Excel cambió, se reconstruirá la caché.")
+                self.invalidar(archivo)
+                return None
+
+            if self.formato == 'feather':
+                df = pd.read_feather(ruta_datos)
+            else:
+                df = pd.read_parquet(ruta_datos)
+
+            logger.info(f"⚡ Datos recuperados desde la caché: {ruta_datos}")
+            return df, meta.get('columnas_mapeadas', {})
+
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo leer la caché de datos ({e}), se reconstruirá.")
+            self.invalidar(archivo)
+            return None
+
+    def guardar(self, archivo: str, configuracion: dict, df: pd.DataFrame, columnas_mapeadas: dict):
+        """Guarda el DataFrame procesado y sus metadatos en la caché."""
+        if not self.disponible:
+            logger.debug("pyarrow no está instalado, la caché de datos queda deshabilitada.")
+            return
+
+        ruta_datos, ruta_meta = self._rutas(archivo)
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            try:
+                self._escribir(df, ruta_datos)
+            except Exception:
+                # Columnas con tipos mezclados (ej: números y texto) se guardan como texto
+                self._escribir(self._normalizar_tipos_mixtos(df), ruta_datos)
+
+            meta = {
+                'clave': self._clave(archivo, configuracion),
+                'columnas_mapeadas': columnas_mapeadas,
+            }
+            with open(ruta_meta, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False, indent=2)
+
+            logger.info(f"💾 Caché de datos actualizada: {ruta_datos}")
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo guardar la caché de datos: {e}")
+            self.invalidar(archivo)
+
+    def invalidar(self, archivo: str):
+        """Elimina la entrada de caché asociada al archivo."""
+        for ruta in self._rutas(archivo):
+            try:
+                if os.path.exists(ruta):
+                    os.remove(ruta)
+            except OSError as e:
+                logger.debug(f"No se pudo eliminar '{ruta}': {e}")
+
+    def _escribir(self, df: pd.DataFrame, ruta: str):
+        if self.formato == 'feather':
+            df.reset_index(drop=True).to_feather(ruta)
+        else:
+            df.to_parquet(ruta, index=False)
+
+    @staticmethod
+    def _normalizar_tipos_mixtos(df: pd.DataFrame) -> pd.DataFrame:
+        """Convierte a texto las columnas object con tipos mezclados, preservando los nulos."""
+        df = df.copy()
+        for columna in df.columns:
+            serie = df[columna]
+            if serie.dtype == object:
+                tipos = serie.dropna().map(type).unique()
+                if len(tipos) > 1:
+                    df[columna] = serie.where(serie.isna(), serie.astype(str))
+        return df
+
+
+class PistasFormato:
+    """
+    Recuerda el formato de fecha detectado para cada columna de un archivo.
+
+    A diferencia de la caché de datos, las pistas no se descartan cuando el
+    archivo cambia: un Excel al que se le agregan filas suele conservar el
+    mismo formato de fecha.
+    """
+
+    def __init__(self, archivo: str, directorio: str = DIRECTORIO_CACHE):
+        self.ruta = os.path.join(directorio, f"{_nombre_entrada(archivo)}.formatos.json")
+        self._pistas = None
+
+    def _cargar(self) -> dict:
+        if self._pistas is None:
+            try:
+                with open(self.ruta, 'r', encoding='utf-8') as f:
+                    self._pistas = json.load(f)
+            except (OSError, ValueError):
+                self._pistas = {}
+        return self._pistas
+
+    def obtener(self, columna: str) -> str | None:
+        """Devuelve el formato recordado para la columna, si existe."""
+        return self._cargar().get(columna)
+
+    def guardar(self, columna: str, formato: str):
+        """Guarda el formato detectado para la columna (solo escribe si cambió)."""
+        pistas = self._cargar()
+        if pistas.get(columna) == formato:
+            return
+        pistas[columna] = formato
+        try:
+            os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            with open(self.ruta, 'w', encoding='utf-8') as f:
+                json.dump(pistas, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.debug(f"No se pudo guardar la pista de formato de fecha: {e}")
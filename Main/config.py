@@ -19,6 +19,46 @@ ARCHIVO_EXCEL = os.getenv('ARCHIVO_EXCEL', 'resultado_vencimientos_telefonos_cor
 REPORTE_FALLIDOS_EXCEL = os.getenv('REPORTE_FALLIDOS_EXCEL', 'reporte_fallidos.xlsx')
 LOG_FILE = os.getenv('LOG_FILE', 'vtv_notificaciones.log')
 CHROME_PROFILE_PATH = os.path.join(os.getcwd(), "chrome_profile")
+# Perfiles de Chrome para enviar en paralelo, uno por línea de WhatsApp, ej: "chrome_linea1,chrome_linea2"
+# Si no se indica, se usa una sola sesión con CHROME_PROFILE_PATH
+PERFILES_CHROME = [
+    os.path.abspath(perfil.strip()) for perfil in os.getenv('PERFILES_CHROME', '').split(',') if perfil.strip()
+] or [CHROME_PROFILE_PATH]
+
+# --- Logging ---
+# Nivel general y niveles por módulo, ej: "whatsapp_notifier=DEBUG,data_handler=WARNING"
+LOG_NIVEL = os.getenv('LOG_NIVEL', 'INFO').upper()
+LOG_NIVELES_MODULOS = os.getenv('LOG_NIVELES_MODULOS', '')
+# Rotación del archivo de log: 'tamano' (LOG_MAX_BYTES) o 'tiempo' (LOG_ROTACION_CUANDO)
+LOG_ROTACION = os.getenv('LOG_ROTACION', 'tamano').lower()
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+LOG_ROTACION_CUANDO = os.getenv('LOG_ROTACION_CUANDO', 'midnight')
+LOG_ARCHIVOS_RESPALDO = int(os.getenv('LOG_ARCHIVOS_RESPALDO', '7'))
+
+# --- Caché de Datos Procesados ---
+# Guarda el DataFrame ya procesado en formato columnar para evitar releer el Excel
+USAR_CACHE_DATOS = os.getenv('USAR_CACHE_DATOS', 'true').lower() in ('1', 'true', 'si', 'sí', 'yes')
+DIRECTORIO_CACHE = os.getenv('DIRECTORIO_CACHE', os.path.join(os.getcwd(), '.cache_vtv'))
+FORMATO_CACHE = os.getenv('FORMATO_CACHE', 'parquet').lower()  # 'parquet' o 'feather'
+
+# --- Carga por Bloques (Streaming) ---
+# Para Excel muy grandes: procesa el archivo por bloques y conserva solo las filas a notificar
+CARGA_STREAMING = os.getenv('CARGA_STREAMING', 'false').lower() in ('1', 'true', 'si', 'sí', 'yes')
+TAMANO_CHUNK = int(os.getenv('TAMANO_CHUNK', '5000'))
+
+# --- Pipeline Asíncrono ---
+# Carga, filtra, arma y envía los mensajes en etapas solapadas, con colas acotadas entre ellas
+PIPELINE_ASINCRONO = os.getenv('PIPELINE_ASINCRONO', 'false').lower() in ('1', 'true', 'si', 'sí', 'yes')
+TAMANO_COLA_PIPELINE = int(os.getenv('TAMANO_COLA_PIPELINE', '20'))
+
+# --- Lector de Datos ---
+# 'auto' elige según la extensión: calamine para Excel (si está instalado), csv, parquet o feather
+LECTOR_DATOS = os.getenv('LECTOR_DATOS', 'auto').lower()
+
+# --- Diagnóstico del Procesamiento ---
+# En modo detallado se registra cada fila procesada (solo para depurar archivos chicos)
+DIAGNOSTICO_DETALLADO = os.getenv('DIAGNOSTICO_DETALLADO', 'false').lower() in ('1', 'true', 'si', 'sí', 'yes')
+TAMANO_MUESTRA_DIAGNOSTICO = int(os.getenv('TAMANO_MUESTRA_DIAGNOSTICO', '20'))
 
 # --- Parámetros de Notificación ---
 INTERVALO_MENSAJES = int(os.getenv('INTERVALO_MENSAJES', '5'))
@@ -36,6 +76,31 @@ MENSAJE_TEMPLATE = os.getenv('MENSAJE_TEMPLATE', MENSAJE_TEMPLATE_DEFAULT)
 MENSAJE_VENCIDO_TEMPLATE = os.getenv('MENSAJE_VENCIDO_TEMPLATE', MENSAJE_VENCIDO_TEMPLATE_DEFAULT)
 
 # --- Configuración de Selenium ---
+# URL base de WhatsApp Web (se puede apuntar a la página simulada para pruebas locales)
+URL_WHATSAPP = os.getenv('URL_WHATSAPP', 'https://web.whatsapp.com').rstrip('/')
+# 'busqueda': abre cada chat escribiendo el número en el buscador
+# 'enlace': abre el chat directo con el enlace /send?phone=<número>, sin usar el buscador
+MODO_NAVEGACION = os.getenv('MODO_NAVEGACION', 'busqueda').lower()
+# 'insertar': escribe el mensaje completo de una vez en la caja (conserva emojis)
+# 'teclado': lo tipea tecla por tecla con send_keys (quita los caracteres fuera del BMP)
+METODO_ESCRITURA = os.getenv('METODO_ESCRITURA', 'insertar').lower()
+# 'normal': Chrome visible y maximizado
+# 'liviano': sin ventana (headless), ventana chica y sin descargar imágenes, avatares, audio, video
+# ni fuentes, para correr más sesiones por servidor. El perfil tiene que tener la sesión ya iniciada
+MODO_NAVEGADOR = os.getenv('MODO_NAVEGADOR', 'normal').lower()
+# Estadísticas de aciertos de los selectores de WhatsApp Web (ordenan los candidatos entre ejecuciones)
+ARCHIVO_SELECTORES = os.getenv('ARCHIVO_SELECTORES', os.path.join(DIRECTORIO_CACHE, 'selectores.json'))
+# Ajuste del tiempo máximo (segundos) de cada espera del navegador, ej: "chat_abierto=15,mensaje_enviado=20"
+# Los pasos y sus valores por defecto están en PLAZOS_ESPERA (whatsapp_notifier.py)
+TIEMPOS_ESPERA = os.getenv('TIEMPOS_ESPERA', '')
+
+# --- Sesión Persistente ---
+# Con SESION_PERSISTENTE el notificador se conecta (por el puerto de depuración remota) al Chrome
+# que dejó abierto sesion_persistente.py, en lugar de abrir y cerrar un navegador en cada ejecución
+SESION_PERSISTENTE = os.getenv('SESION_PERSISTENTE', 'false').lower() in ('1', 'true', 'si', 'sí', 'yes')
+# Ejecutable de Chrome para la sesión persistente; vacío = se busca la instalación habitual
+CHROME_BINARIO = os.getenv('CHROME_BINARIO', '')
+
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -47,23 +112,19 @@ def validar_configuracion():
     Valida que las plantillas de mensajes estén correctamente configuradas.
     """
     import logging
+    from plantillas import validar_plantilla, CAMPOS_REQUERIDOS, CAMPOS_REQUERIDOS_VENCIDO
     logger = logging.getLogger(__name__)
     
-    # Verificar que las plantillas contengan los campos requeridos
-    campos_requeridos = ['patente', 'marca', 'modelo', 'fecha_revision', 'fecha_vencimiento']
-    campos_vencido = campos_requeridos + ['dias_vencidos']
-    
-    # Validar MENSAJE_TEMPLATE
-    for campo in campos_requeridos:
-        if f'{{{campo}}}' not in MENSAJE_TEMPLATE:
-            logger.warning(f"Campo '{campo}' no encontrado en MENSAJE_TEMPLATE")
-    
-    # Validar MENSAJE_VENCIDO_TEMPLATE
-    for campo in campos_vencido:
-        if f'{{{campo}}}' not in MENSAJE_VENCIDO_TEMPLATE:
-            logger.warning(f"Campo '{campo}' no encontrado en MENSAJE_VENCIDO_TEMPLATE")
+    # Compilar las plantillas y verificar que contengan los campos requeridos
+    problemas = (
+        validar_plantilla(MENSAJE_TEMPLATE, 'MENSAJE_TEMPLATE', CAMPOS_REQUERIDOS)
+        + validar_plantilla(MENSAJE_VENCIDO_TEMPLATE, 'MENSAJE_VENCIDO_TEMPLATE', CAMPOS_REQUERIDOS_VENCIDO)
+    )
+    for problema in problemas:
+        logger.warning(problema)
     
     logger.info("Configuración de mensajes validada.")
+    return problemas
 
 # --- Función para mostrar configuración actual ---
 def mostrar_configuracion():
@@ -89,8 +150,7 @@ def mostrar_configuracion():
     print(f"- Reporte de fallidos: {REPORTE_FALLIDOS_EXCEL}")
     print("="*60)
 
-# Ejecutar validación al importar el módulo
+# La validación de las plantillas la llama main.py: al importar config, plantillas y
+# utils todavía no se pueden cargar (los dos importan config)
 if __name__ == "__main__":
-    mostrar_configuracion()
-else:
-    validar_configuracion()
\ No newline at end of file
+    mostrar_configuracion()
\ No newline at end of file
@@ -4,14 +4,34 @@
 Corrección del módulo DataHandler - Formato de fechas corregido
 """
 
+import os
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta
 import logging
-from utils import validar_numero_telefono
-from config import DIAS_ANTICIPACION
+from typing import NamedTuple, Iterator
+from utils import normalizar_telefonos
+from config import DIAS_ANTICIPACION, USAR_CACHE_DATOS, TAMANO_CHUNK, LECTOR_DATOS, DIAGNOSTICO_DETALLADO
+from cache_datos import CacheDatos, PistasFormato
+from lectores import crear_lector
+from diagnostico import Diagnostico
 
 logger = logging.getLogger(__name__)
 
+
+class Notificacion(NamedTuple):
+    """Datos de un cliente a notificar (registro inmutable y compacto)."""
+    patente: str
+    marca: str
+    modelo: str
+    numero: str
+    numero_original: str
+    fecha_revision: str
+    fecha_vencimiento: str
+    esta_vencida: bool
+    dias_vencidos: int
+
+
 class DataHandler:
     """Gestiona la carga y el procesamiento de datos del archivo Excel."""
     
@@ -36,10 +56,66 @@ class DataHandler:
         'modelo': ['Modelo', 'MODELO', 'Model']
     }
     
-    def __init__(self, archivo_excel: str):
+    # Tipos con los que se leen las columnas detectadas (las fechas se procesan aparte)
+    TIPOS_COLUMNAS = {
+        'patente': 'string',
+        'telefono': 'string',
+        'marca': 'category',
+        'modelo': 'category'
+    }
+    
+    # Resolución de las fechas procesadas (no hace falta más precisión que segundos)
+    TIPO_FECHA = 'datetime64[s]'
+    
+    # FORMATOS CORREGIDOS - Procesamiento inteligente
+    FORMATOS_FECHA = [
+        '%d/%m/%y',    # 28/03/25 -> 2025-03-28 (FORMATO ARGENTINO)
+        '%m/%d/%y',    # 03/28/25 -> 2025-03-28 (FORMATO US)
+        '%d/%m/%Y',    # 28/03/2025 -> 2025-03-28 
+        '%m/%d/%Y',    # 03/28/2025 -> 2025-03-28
+        '%d-%m-%y',    # 28-03-25 -> 2025-03-28
+        '%d-%m-%Y',    # 28-03-2025 -> 2025-03-28
+        '%Y-%m-%d',    # 2025-03-28 -> 2025-03-28
+        '%Y/%m/%d',    # 2025/03/28 -> 2025-03-28
+        '%Y-%m-%d %H:%M:%S',  # 2025-03-28 10:30:00 (exportaciones CSV)
+        '%Y/%m/%d %H:%M:%S',  # 2025/03/28 10:30:00
+    ]
+    
+    # Texto que empieza con el año (2025-01-05, 2025/01/05 10:30): nunca se lee con el día primero
+    PATRON_ANIO_PRIMERO = r'^\d{4}[-/.]'
+    
+    # Cantidad de valores usados para elegir el formato de fecha
+    TAMANO_MUESTRA_FECHAS = 300
+    
+    # Fechas guardadas por Excel como número de serie (días desde esta fecha)
+    ORIGEN_SERIAL_EXCEL = '1899-12-30'
+    SERIAL_EXCEL_MAXIMO = 2958465  # 31/12/9999
+    
+    def __init__(self, archivo_excel: str, usar_cache: bool = USAR_CACHE_DATOS, lector: str = LECTOR_DATOS,
+                 detallado: bool = DIAGNOSTICO_DETALLADO):
         self.archivo_excel = archivo_excel
+        self.lector = crear_lector(archivo_excel, lector)
+        self.detallado = detallado
+        self.diagnostico = Diagnostico()
         self.df = None
         self.columnas_mapeadas = {}
+        self.filas_leidas = 0
+        self.cache = CacheDatos() if usar_cache else None
+        self.pistas_formato = PistasFormato(archivo_excel)
+
+    def _configuracion_columnas(self) -> dict:
+        """
+        Devuelve la configuración que forma parte de la clave de caché.
+
+        Incluye el modo detallado (que conserva las columnas de fecha originales)
+        y el lector, porque los dos cambian el DataFrame que se guarda.
+        """
+        return {
+            'requeridas': self.COLUMNAS_REQUERIDAS,
+            'alternativas': self.COLUMNAS_ALTERNATIVAS,
+            'detallado': self.detallado,
+            'lector': self.lector.nombre,
+        }
 
     def _detectar_columnas(self, df: pd.DataFrame) -> dict:
         """Detecta automáticamente las columnas del Excel."""
@@ -93,150 +169,363 @@ class DataHandler:
             )
             raise ValueError(mensaje_error)
 
-    def _procesar_fechas_mejorado(self, df: pd.DataFrame, columna: str) -> pd.Series:
+    def _muestra_estratificada(self, valores: pd.Series) -> pd.Series:
+        """Toma una muestra repartida uniformemente a lo largo de la columna."""
+        if len(valores) <= self.TAMANO_MUESTRA_FECHAS:
+            return valores
+        posiciones = np.linspace(0, len(valores) - 1, self.TAMANO_MUESTRA_FECHAS).astype(int)
+        return valores.iloc[posiciones]
+
+    @staticmethod
+    def _parsear_unicos(valores: pd.Series, **kwargs) -> pd.Series:
+        """
+        Parsea cada valor distinto una sola vez y reconstruye la columna por códigos.
+
+        Las columnas de fechas repiten mucho (cientos de vehículos revisados el
+        mismo día), así que factorizar antes de pd.to_datetime reduce el trabajo
+        a la cantidad de fechas distintas.
+
+        Args:
+            valores (pd.Series): Valores a convertir.
+            **kwargs: Argumentos para pd.to_datetime (format, dayfirst, errors...).
+
+        Returns:
+            pd.Series: Fechas convertidas con el mismo índice que `valores`.
+        """
+        codigos, unicos = pd.factorize(valores)
+        fechas_unicas = pd.DatetimeIndex(pd.to_datetime(pd.Index(unicos), **kwargs))
+        fechas = fechas_unicas.take(codigos, allow_fill=True, fill_value=pd.NaT)
+        return pd.Series(fechas, index=valores.index)
+
+    def _rankear_formatos(self, muestra: pd.Series, columna: str) -> list:
+        """
+        Ordena los formatos candidatos según cuántas fechas de la muestra interpretan.
+
+        Si hay una pista guardada de una ejecución anterior y esta interpreta la
+        muestra completa, se usa directamente sin probar los demás formatos.
+        """
+        if len(muestra) == 0:
+            return []
+
+        pista = self.pistas_formato.obtener(columna)
+        if pista in self.FORMATOS_FECHA:
+            if pd.to_datetime(muestra, format=pista, errors='coerce').notna().all():
+                logger.info(f"💡 Usando formato recordado '{pista}' para {columna}")
+                return [pista] + [f for f in self.FORMATOS_FECHA if f != pista]
+
+        resultados = []
+        for formato in self.FORMATOS_FECHA:
+            try:
+                fechas_validas = pd.to_datetime(muestra, format=formato, errors='coerce').notna().sum()
+            except Exception as e:
+                logger.debug(f"✗ Error con formato '{formato}': {e}")
+                continue
 
-        logger.info(f"🔍 Procesando fechas de la columna: {columna}")
+            if fechas_validas > 0:
+                logger.info(f"✓ Formato '{formato}': {fechas_validas} fechas válidas de {len(muestra)} en la muestra")
+                resultados.append((formato, fechas_validas))
+            else:
+                logger.debug(f"✗ Formato '{formato}': 0 fechas válidas")
+
+        # Orden estable: ante empate gana el que aparece primero en FORMATOS_FECHA
+        resultados.sort(key=lambda r: r[1], reverse=True)
+        return [formato for formato, _ in resultados]
+
+    @staticmethod
+    def _normalizar_datetime(fechas: pd.Series) -> pd.Series:
+        """Lleva una serie de fechas nativas a datetime64[ns] sin zona horaria."""
+        fechas = pd.to_datetime(fechas, errors='coerce')
+        if getattr(fechas.dt, 'tz', None) is not None:
+            fechas = fechas.dt.tz_localize(None)
+        return fechas.astype('datetime64[ns]')
+
+    def _convertir_seriales_excel(self, numeros: pd.Series) -> pd.Series:
+        """Convierte números de serie de Excel (días desde 1899-12-30) a fechas."""
+        numeros = pd.to_numeric(numeros, errors='coerce')
+        # Fuera del rango de fechas de Excel se consideran valores inválidos
+        numeros = numeros.where((numeros >= 1) & (numeros <= self.SERIAL_EXCEL_MAXIMO))
+        return pd.to_datetime(numeros, unit='D', origin=self.ORIGEN_SERIAL_EXCEL, errors='coerce').astype('datetime64[ns]')
+
+    def _inferir_fechas(self, valores: pd.Series, dayfirst: bool) -> pd.Series:
+        """
+        Parsea por inferencia las fechas que ningún formato conocido interpretó.
+
+        `dayfirst` solo se aplica al texto que no empieza con el año: el que sí
+        (ISO con o sin hora) se lee como ISO 8601 y, si no, con el mes primero.
+        """
+        anio_primero = valores.str.match(self.PATRON_ANIO_PRIMERO)
+        fechas = pd.Series(pd.NaT, index=valores.index, dtype='datetime64[ns]')
+        if anio_primero.any():
+            iso = valores[anio_primero]
+            fechas.loc[anio_primero] = self._parsear_unicos(iso, format='ISO8601', errors='coerce')
+            pendientes = fechas.loc[anio_primero].isna()
+            if pendientes.any():
+                fechas.loc[pendientes[pendientes].index] = self._parsear_unicos(
+                    iso[pendientes], errors='coerce', dayfirst=False
+                )
+        if (~anio_primero).any():
+            fechas.loc[~anio_primero] = self._parsear_unicos(valores[~anio_primero], errors='coerce', dayfirst=dayfirst)
+        return fechas
+
+    def _parsear_fechas_texto(self, texto: pd.Series, columna: str) -> tuple[pd.Series, str | None]:
+        """
+        Parsea las celdas de texto de una columna de fechas.
+
+        Returns:
+            tuple: (fechas con el mismo índice que `texto`, descripción del formato usado).
+        """
+        # Limpiar datos: remover espacios y convertir a string
+        serie_limpia = texto.astype(str).str.strip()
 
-        # Obtener muestra de datos para debugging
-        muestra_datos = df[columna].dropna().head(10).tolist()
-        logger.info(f"📋 Muestra de datos de fecha: {muestra_datos}")
+        # Valores realmente presentes (astype(str) convierte los nulos en 'nan')
+        con_valor = texto.notna() & ~serie_limpia.isin(['', 'nan', 'NaT', 'None'])
+        valores = serie_limpia[con_valor]
 
-        # Limpiar datos: remover espacios y convertir a string
-        serie_limpia = df[columna].astype(str).str.strip()
-
-        # FORMATOS CORREGIDOS - Procesamiento inteligente
-        formatos_fecha = [
-            '%d/%m/%y',    # 28/03/25 -> 2025-03-28 (FORMATO ARGENTINO)
-            '%m/%d/%y',    # 03/28/25 -> 2025-03-28 (FORMATO US)
-            '%d/%m/%Y',    # 28/03/2025 -> 2025-03-28 
-            '%m/%d/%Y',    # 03/28/2025 -> 2025-03-28
-            '%d-%m-%y',    # 28-03-25 -> 2025-03-28
-            '%d-%m-%Y',    # 28-03-2025 -> 2025-03-28
-            '%Y-%m-%d',    # 2025-03-28 -> 2025-03-28
-            '%Y/%m/%d'     # 2025/03/28 -> 2025-03-28
-        ]
-
-        fechas_procesadas = None
+        # Detectar el formato sobre una muestra y parsear la columna completa una sola vez
+        muestra = self._muestra_estratificada(valores)
+        ranking = self._rankear_formatos(muestra, columna)
+
+        fechas_procesadas = pd.Series(pd.NaT, index=texto.index, dtype='datetime64[ns]')
         formato_exitoso = None
-        mejor_resultado = 0
 
-        # Estrategia mejorada: probar ambos formatos y elegir el mejor
-        for formato in formatos_fecha:
+        if ranking:
+            formato_exitoso = ranking[0]
+            fechas_procesadas.loc[con_valor] = self._parsear_unicos(valores, format=formato_exitoso, errors='coerce')
+
+            # Solo las filas que el formato ganador no pudo interpretar pasan por el resto
+            pendientes = con_valor & fechas_procesadas.isna()
+            formatos_fallback = ranking[1:] + [f for f in self.FORMATOS_FECHA if f not in ranking]
+            for formato in formatos_fallback:
+                if not pendientes.any():
+                    break
+                parciales = self._parsear_unicos(serie_limpia[pendientes], format=formato, errors='coerce').dropna()
+                if len(parciales) > 0:
+                    logger.info(f"↪️ Formato '{formato}' recuperó {len(parciales)} fechas no interpretadas por '{formato_exitoso}'")
+                    fechas_procesadas.loc[parciales.index] = parciales
+                    pendientes = con_valor & fechas_procesadas.isna()
+
+            if pendientes.any():
+                parciales = self._inferir_fechas(serie_limpia[pendientes], dayfirst=True).dropna()
+                if len(parciales) > 0:
+                    logger.info(f"↪️ Inferencia automática recuperó {len(parciales)} fechas")
+                    fechas_procesadas.loc[parciales.index] = parciales
+
+            self.pistas_formato.guardar(columna, formato_exitoso)
+
+        elif len(valores) > 0:
+            # Si ningún formato específico funciona, usar inferencia automática
+            logger.info("🔄 Intentando inferencia automática...")
             try:
-                # Probar conversión
-                fechas_temp = pd.to_datetime(serie_limpia, format=formato, errors='coerce')
+                # Elegir día primero / mes primero sobre la muestra (sin las fechas que empiezan con el año)
+                muestra_ambigua = muestra[~muestra.str.match(self.PATRON_ANIO_PRIMERO)]
+                validas_dia = pd.to_datetime(muestra_ambigua, errors='coerce', dayfirst=True).notna().sum()
+                validas_mes = pd.to_datetime(muestra_ambigua, errors='coerce', dayfirst=False).notna().sum()
+                dayfirst = validas_dia >= validas_mes
+                formato_exitoso = "inferencia automática (día primero)" if dayfirst else "inferencia automática (mes primero)"
 
-                # Contar fechas válidas
-                fechas_validas = fechas_temp.notna().sum()
+                fechas_procesadas.loc[con_valor] = self._inferir_fechas(valores, dayfirst)
+                logger.info(f"✓ {formato_exitoso.capitalize()}: {fechas_procesadas.notna().sum()} fechas válidas")
 
-                if fechas_validas > 0:
-                    logger.info(f"✓ Formato '{formato}': {fechas_validas} fechas válidas de {len(serie_limpia)}")
+            except Exception as e:
+                logger.error(f"❌ Error en inferencia automática: {e}")
 
-                    # Usar el formato que procese MÁS fechas
-                    if fechas_validas > mejor_resultado:
-                        fechas_procesadas = fechas_temp
-                        formato_exitoso = formato
-                        mejor_resultado = fechas_validas
+        return fechas_procesadas, formato_exitoso
 
-                        # Si procesamos todas las fechas, usar este formato
-                        if fechas_validas == len(serie_limpia.replace('nan', pd.NA).dropna()):
-                            logger.info(f"🎯 Formato perfecto encontrado: {formato}")
-                            break
-                else:
-                    logger.debug(f"✗ Formato '{formato}': 0 fechas válidas")
+    def _procesar_fechas_mejorado(self, df: pd.DataFrame, columna: str) -> pd.Series:
 
-            except Exception as e:
-                logger.debug(f"✗ Error con formato '{formato}': {e}")
-                continue
-            
-        # Si ningún formato específico funciona, usar inferencia automática
-        if fechas_procesadas is None or mejor_resultado == 0:
-            logger.info("🔄 Intentando inferencia automática...")
-            try:
-                # Probar interpretación automática con día primero
-                fechas_procesadas = pd.to_datetime(serie_limpia, errors='coerce', dayfirst=True)
-                fechas_validas = fechas_procesadas.notna().sum()
-
-                if fechas_validas > mejor_resultado:
-                    logger.info(f"✓ Inferencia automática (dayfirst=True): {fechas_validas} fechas válidas")
-                    formato_exitoso = "inferencia automática (día primero)"
-                    mejor_resultado = fechas_validas
-                else:
-                    # Probar con month first
-                    fechas_procesadas = pd.to_datetime(serie_limpia, errors='coerce', dayfirst=False)
-                    fechas_validas = fechas_procesadas.notna().sum()
-                    if fechas_validas > mejor_resultado:
-                        logger.info(f"✓ Inferencia automática (month first): {fechas_validas} fechas válidas")
-                        formato_exitoso = "inferencia automática (mes primero)"
-                        mejor_resultado = fechas_validas
+        logger.info(f"🔍 Procesando fechas de la columna: {columna}")
 
-            except Exception as e:
-                logger.error(f"❌ Error en inferencia automática: {e}")
-                fechas_procesadas = pd.Series([pd.NaT] * len(serie_limpia))
+        # Obtener muestra de datos para debugging
+        muestra_datos = df[columna].dropna().head(10).tolist()
+        logger.info(f"📋 Muestra de datos de fecha: {muestra_datos}")
+
+        serie = df[columna]
+        fechas_procesadas = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+        formato_exitoso = None
+
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            # Celdas de fecha reales: no hace falta pasar por texto
+            fechas_procesadas = self._normalizar_datetime(serie)
+            formato_exitoso = "fecha nativa de Excel"
+
+        elif pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+            fechas_procesadas = self._convertir_seriales_excel(serie)
+            formato_exitoso = "número de serie de Excel"
 
-        # Logging de resultados detallado
+        else:
+            # Columna mixta: clasificar cada celda por su tipo y convertir cada grupo por separado
+            if pd.api.types.is_string_dtype(serie.dtype) and serie.dtype != object:
+                es_texto = serie.notna()
+                es_fecha = es_numero = pd.Series(False, index=serie.index)
+            else:
+                tipos = serie.map(type)
+                tipos_unicos = tipos.unique()
+                tipos_fecha = [t for t in tipos_unicos if issubclass(t, (date, np.datetime64))]
+                tipos_numero = [t for t in tipos_unicos
+                                if issubclass(t, (int, float, np.number)) and not issubclass(t, (bool, np.bool_))]
+                tipos_texto = [t for t in tipos_unicos if issubclass(t, str)]
+                es_fecha = tipos.isin(tipos_fecha)
+                es_numero = tipos.isin(tipos_numero) & serie.notna()
+                es_texto = tipos.isin(tipos_texto)
+
+            partes = []
+            if es_fecha.any():
+                fechas_procesadas.loc[es_fecha] = self._normalizar_datetime(serie[es_fecha])
+                partes.append(f"fechas nativas ({es_fecha.sum()})")
+            if es_numero.any():
+                fechas_procesadas.loc[es_numero] = self._convertir_seriales_excel(serie[es_numero])
+                partes.append(f"números de serie ({es_numero.sum()})")
+            if es_texto.any():
+                fechas_texto, formato_texto = self._parsear_fechas_texto(serie[es_texto], columna)
+                fechas_procesadas.loc[es_texto] = fechas_texto
+                partes.append(f"{formato_texto} ({es_texto.sum()})" if partes else formato_texto)
+
+            formato_exitoso = " + ".join(str(p) for p in partes) if partes else None
+
+        # Resumen de resultados (acotado; el mapeo fila por fila solo en modo detallado)
         if fechas_procesadas is not None:
-            fechas_validas = fechas_procesadas.notna().sum()
-            fechas_invalidas = fechas_procesadas.isna().sum()
+            no_procesadas = fechas_procesadas.isna()
+            fechas_invalidas = int(no_procesadas.sum())
+            fechas_validas = len(fechas_procesadas) - fechas_invalidas
 
-            logger.info(f"📊 Resultado final para {columna}:")
-            logger.info(f"  - Formato exitoso: {formato_exitoso}")
-            logger.info(f"  - Fechas válidas: {fechas_validas}")
-            logger.info(f"  - Fechas inválidas: {fechas_invalidas}")
+            logger.info(f"📊 Resultado para {columna}: {formato_exitoso} | válidas: {fechas_validas} | inválidas: {fechas_invalidas}")
 
-            # Mostrar rango de fechas válidas
             if fechas_validas > 0:
                 fecha_min = fechas_procesadas.min()
                 fecha_max = fechas_procesadas.max()
                 logger.info(f"  - Rango de fechas: {fecha_min.strftime('%d/%m/%Y')} a {fecha_max.strftime('%d/%m/%Y')}")
 
-                # Mostrar TODAS las fechas procesadas con sus valores originales
+            self.diagnostico.contar(f"{columna} - fechas válidas", fechas_validas)
+            self.diagnostico.contar(f"{columna} - fechas inválidas", fechas_invalidas)
+            self.diagnostico.histograma(f"{columna} - años", fechas_procesadas.dt.year.astype('Int64'))
+
+            originales_invalidas = serie[no_procesadas & serie.notna()]
+            if len(originales_invalidas) > 0:
+                self.diagnostico.muestrear(f"{columna} - fechas no procesadas", originales_invalidas.tolist())
+
+            if self.detallado:
                 logger.info("  - Mapeo completo:")
-                for i, (orig, proc) in enumerate(zip(serie_limpia, fechas_procesadas)):
+                for orig, proc in zip(serie, fechas_procesadas):
                     if pd.notna(proc):
                         logger.info(f"    {orig} -> {proc.strftime('%d/%m/%Y')}")
                     else:
                         logger.info(f"    {orig} -> NO PROCESADA")
 
-            # Advertencia si hay fechas no procesadas
-            if fechas_invalidas > 0:
-                logger.warning(f"⚠️  {fechas_invalidas} fechas no pudieron ser procesadas")
-                fechas_no_procesadas = serie_limpia[fechas_procesadas.isna()]
-                logger.warning(f"   Fechas problemáticas: {fechas_no_procesadas.tolist()}")
-
         return fechas_procesadas
 
+    def _procesar_dataframe(self, df: pd.DataFrame, columnas_encontradas: dict) -> pd.DataFrame:
+        """
+        Genera las columnas procesadas (fechas, teléfono validado y columnas estandarizadas).
+
+        Las columnas estandarizadas se obtienen renombrando las originales (sin
+        copiarlas) y las fechas originales se descartan una vez convertidas,
+        salvo en modo detallado, donde se conservan para depurar.
+        """
+        # Procesar fechas con el método mejorado
+        fecha_revision_col = columnas_encontradas['fecha_revision']
+        fecha_vencimiento_col = columnas_encontradas['fecha_vencimiento']
+        
+        df['_fecha_revision'] = self._procesar_fechas_mejorado(df, fecha_revision_col).astype(self.TIPO_FECHA)
+        df['_fecha_vencimiento'] = self._procesar_fechas_mejorado(df, fecha_vencimiento_col).astype(self.TIPO_FECHA)
+        
+        # Validar números de teléfono
+        telefono_col = columnas_encontradas['telefono']
+        df['NumeroValidado'], df['_motivo_telefono'] = normalizar_telefonos(df[telefono_col])
+        invalidos = df['NumeroValidado'].isna()
+        self.diagnostico.histograma("Teléfonos por motivo", df['_motivo_telefono'])
+        if invalidos.any():
+            self.diagnostico.muestrear("Teléfonos inválidos", df.loc[invalidos & df[telefono_col].notna(), telefono_col].tolist())
+        
+        # Crear columnas estandarizadas renombrando las originales
+        renombres = {}
+        for campo in ('patente', 'telefono', 'marca', 'modelo'):
+            columna = columnas_encontradas[campo]
+            if columna in renombres:
+                # Dos campos mapeados a la misma columna: el segundo sí necesita su propia columna
+                df[f'_{campo}'] = df[columna]
+            else:
+                renombres[columna] = f'_{campo}'
+        df = df.rename(columns=renombres)
+        
+        if not self.detallado:
+            df = df.drop(columns=[c for c in (fecha_revision_col, fecha_vencimiento_col) if c in df.columns])
+        
+        return df
+
+    def reporte_memoria(self) -> pd.DataFrame:
+        """Muestra y devuelve el uso de memoria de self.df por columna."""
+        if self.df is None:
+            print("❌ No hay datos cargados.")
+            return pd.DataFrame()
+        
+        uso = self.df.memory_usage(deep=True, index=False)
+        reporte = pd.DataFrame({
+            'tipo': self.df.dtypes.astype(str),
+            'bytes': uso,
+            'bytes_por_fila': (uso / max(len(self.df), 1)).round(1),
+        }).sort_values('bytes', ascending=False)
+        
+        print("\n" + "="*60)
+        print("           USO DE MEMORIA DE LOS DATOS")
+        print("="*60)
+        print(reporte.to_string())
+        print(f"\n📦 Total: {uso.sum() / 1024 ** 2:.2f} MB en {len(self.df)} registros")
+        print("="*60)
+        return reporte
+
+    def _tipos_lectura(self, columnas_encontradas: dict) -> dict:
+        """Traduce TIPOS_COLUMNAS a los nombres reales de columna del Excel."""
+        return {
+            columnas_encontradas[campo]: tipo
+            for campo, tipo in self.TIPOS_COLUMNAS.items()
+            if campo in columnas_encontradas
+        }
+
+    def _leer_y_procesar(self) -> pd.DataFrame:
+        """
+        Lee el archivo en dos fases y genera las columnas procesadas.
+
+        Primero lee solo el encabezado para detectar las columnas; después lee
+        únicamente las columnas mapeadas, con tipos explícitos para que los
+        teléfonos no pasen por float ni se carguen columnas que no se usan.
+        """
+        encabezado = self.lector.leer_encabezado()
+        
+        # Detectar columnas automáticamente
+        columnas_encontradas = self._detectar_columnas(pd.DataFrame(columns=encabezado))
+        self._validar_columnas_requeridas(columnas_encontradas)
+        
+        # Guardar el mapeo
+        self.columnas_mapeadas = columnas_encontradas
+        
+        columnas_usadas = list(dict.fromkeys(columnas_encontradas.values()))
+        df = self.lector.leer(columnas_usadas, self._tipos_lectura(columnas_encontradas))
+        
+        logger.info(f"📥 Columnas leídas con '{self.lector.nombre}': {len(columnas_usadas)} de {len(encabezado)}")
+        logger.info("🔄 Procesando datos...")
+        return self._procesar_dataframe(df, columnas_encontradas)
+
     def cargar_y_procesar_datos(self):
-        """Carga, valida y procesa los datos del archivo Excel."""
+        """Carga, valida y procesa los datos del archivo Excel (usando la caché si es válida)."""
         try:
             logger.info(f"📊 Cargando datos desde '{self.archivo_excel}'...")
-            df = pd.read_excel(self.archivo_excel)
-            
-            # Detectar columnas automáticamente
-            columnas_encontradas = self._detectar_columnas(df)
-            self._validar_columnas_requeridas(columnas_encontradas)
-            
-            # Guardar el mapeo
-            self.columnas_mapeadas = columnas_encontradas
-            
-            logger.info("🔄 Procesando datos...")
-            
-            # Procesar fechas con el método mejorado
-            fecha_revision_col = columnas_encontradas['fecha_revision']
-            fecha_vencimiento_col = columnas_encontradas['fecha_vencimiento']
-            
-            df['_fecha_revision'] = self._procesar_fechas_mejorado(df, fecha_revision_col)
-            df['_fecha_vencimiento'] = self._procesar_fechas_mejorado(df, fecha_vencimiento_col)
             
-            # Validar números de teléfono
-            telefono_col = columnas_encontradas['telefono']
-            df['NumeroValidado'] = df[telefono_col].apply(validar_numero_telefono)
+            df = None
+            # En modo detallado se procesa siempre (desde la caché no habría mapeo ni diagnóstico)
+            # y no se guarda, para no pisar la entrada de las ejecuciones normales
+            usar_cache = self.cache is not None and not self.detallado
+            if usar_cache and os.path.exists(self.archivo_excel):
+                resultado = self.cache.cargar(self.archivo_excel, self._configuracion_columnas())
+                if resultado is not None:
+                    df, self.columnas_mapeadas = resultado
+                    # Parquet no tiene resolución de segundos: restaurar el tipo de las fechas
+                    df = df.astype({'_fecha_revision': self.TIPO_FECHA, '_fecha_vencimiento': self.TIPO_FECHA})
+                    logger.info("ℹ️ Datos tomados de la caché: el diagnóstico de la carga no se repite.")
             
-            # Crear columnas estandarizadas
-            df['_patente'] = df[columnas_encontradas['patente']]
-            df['_telefono'] = df[columnas_encontradas['telefono']]
-            df['_marca'] = df[columnas_encontradas['marca']]
-            df['_modelo'] = df[columnas_encontradas['modelo']]
+            if df is None:
+                df = self._leer_y_procesar()
+                if usar_cache:
+                    self.cache.guardar(self.archivo_excel, self._configuracion_columnas(), df, self.columnas_mapeadas)
             
             self.df = df
             logger.info(f"✅ Datos cargados y procesados exitosamente: {len(self.df)} registros.")
@@ -250,6 +539,7 @@ class DataHandler:
             logger.info(f"  - Fechas de revisión válidas: {fechas_revision_validas}/{len(df)}")
             logger.info(f"  - Fechas de vencimiento válidas: {fechas_vencimiento_validas}/{len(df)}")
             logger.info(f"  - Teléfonos válidos: {telefonos_validos}/{len(df)}")
+            self._emitir_diagnostico("Diagnóstico de la carga")
             
             return self.df
         
@@ -260,12 +550,13 @@ class DataHandler:
             logger.error(f"❌ Error crítico al cargar los datos: {e}")
             raise
 
-    def filtrar_vencimientos_proximos(self) -> pd.DataFrame:
-        """Filtra los registros cuya VTV está por vencer O ya está vencida."""
-        if self.df is None:
-            logger.error("❌ Los datos no han sido cargados. Ejecute 'cargar_y_procesar_datos' primero.")
-            return pd.DataFrame()
-    
+    def _emitir_diagnostico(self, titulo: str):
+        """Registra el resumen de diagnóstico acumulado y lo reinicia."""
+        self.diagnostico.emitir_resumen(titulo)
+        self.diagnostico.reiniciar()
+
+    def _limites_vencimiento(self):
+        """Devuelve (fecha_actual, fecha_limite_pasada, fecha_limite_futura) para el filtro."""
         fecha_actual = datetime.now().date()
         fecha_limite_futura = fecha_actual + timedelta(days=DIAS_ANTICIPACION)
         
@@ -277,49 +568,73 @@ class DataHandler:
         fecha_limite_pasada = datetime(2020, 1, 1).date()  # Fecha muy antigua para capturar todos
         
         # ===== FIN DEL CAMBIO =====
-        logger.info(f"🔍 Filtrando vencimientos:")
-        logger.info(f"  - VTV vencidas desde: {fecha_limite_pasada}")
-        logger.info(f"  - Fecha actual: {fecha_actual}")
-        logger.info(f"  - VTV por vencer hasta: {fecha_limite_futura} ({DIAS_ANTICIPACION} días)")
+        return fecha_actual, fecha_limite_pasada, fecha_limite_futura
+
+    def _filtrar_dataframe(self, df: pd.DataFrame, log_detalle: bool = True) -> pd.DataFrame:
+        """
+        Aplica el filtro de vencimientos a un DataFrame ya procesado.
+
+        Trabaja con máscaras sobre arrays datetime64[D]: no crea columnas de
+        objetos date ni copias intermedias, y calcula esta_vencida,
+        dias_vencidos y dias_restantes como arrays enteros.
+        """
+        fecha_actual, fecha_limite_pasada, fecha_limite_futura = self._limites_vencimiento()
+        hoy = np.datetime64(fecha_actual, 'D')
         
         # Filtrar registros válidos
         columnas_criticas = ['_fecha_vencimiento', '_fecha_revision', 'NumeroValidado', '_marca', '_modelo']
-        df_valido = self.df.dropna(subset=columnas_criticas).copy()
+        completos = df[columnas_criticas].notna().all(axis=1).to_numpy()
+        cantidad_completos = int(completos.sum())
         
-        logger.info(f"📋 Registros con datos completos: {len(df_valido)}/{len(self.df)}")
+        if log_detalle:
+            logger.info(f"📋 Registros con datos completos: {cantidad_completos}/{len(df)}")
         
-        if len(df_valido) == 0:
-            logger.warning("⚠️ No hay registros con datos completos para procesar.")
+        if cantidad_completos == 0:
+            if log_detalle:
+                logger.warning("⚠️ No hay registros con datos completos para procesar.")
             return pd.DataFrame()
         
-        # Convertir fechas a date objects
-        df_valido['FechaVencimiento_Date'] = df_valido['_fecha_vencimiento'].dt.date
-        df_valido['FechaRevision_Date'] = df_valido['_fecha_revision'].dt.date
+        # Truncar a día (equivalente a .dt.date, pero sin salir de numpy)
+        vencimiento = df['_fecha_vencimiento'].to_numpy(dtype='datetime64[D]')
         
-        # DEBUG: Mostrar todas las fechas procesadas
-        logger.info("🔍 DEBUG - Fechas procesadas:")
-        for idx, row in df_valido.iterrows():
-            logger.info(f"  - {row['_patente']}: Vencimiento {row['FechaVencimiento_Date']} - Revisión {row['FechaRevision_Date']}")
+        if log_detalle and self.detallado:
+            # DEBUG: Mostrar todas las fechas procesadas
+            logger.info("🔍 DEBUG - Fechas procesadas:")
+            revision = df['_fecha_revision'].to_numpy(dtype='datetime64[D]')
+            for patente, venc, rev in zip(df['_patente'][completos], vencimiento[completos], revision[completos]):
+                logger.info(f"  - {patente}: Vencimiento {venc} - Revisión {rev}")
         
-        # Filtrar por rango de fechas
-        vencimientos = df_valido[
-            (df_valido['FechaVencimiento_Date'] >= fecha_limite_pasada) & 
-            (df_valido['FechaVencimiento_Date'] <= fecha_limite_futura)
-        ].copy()
+        # Filtrar por rango de fechas (NaT nunca cumple las comparaciones)
+        en_rango = (
+            completos
+            & (vencimiento >= np.datetime64(fecha_limite_pasada, 'D'))
+            & (vencimiento <= np.datetime64(fecha_limite_futura, 'D'))
+        )
         
         # Agregar información de estado
-        vencimientos['esta_vencida'] = vencimientos['FechaVencimiento_Date'] < fecha_actual
-        vencimientos['dias_vencidos'] = (fecha_actual - vencimientos['FechaVencimiento_Date']).apply(
-            lambda x: x.days if hasattr(x, 'days') else 0
+        dias = (hoy - vencimiento[en_rango]).astype(np.int64)
+        vencimientos = df[en_rango].assign(
+            esta_vencida=dias > 0,
+            dias_vencidos=np.maximum(dias, 0),
+            dias_restantes=np.maximum(-dias, 0),
         )
         
-        # DEBUG: Mostrar detalles de cada vencimiento
-        logger.info("🔍 DEBUG - Análisis de vencimientos:")
-        for idx, row in vencimientos.iterrows():
-            estado = "VENCIDA" if row['esta_vencida'] else "PRÓXIMA"
-            dias = row['dias_vencidos'] if row['esta_vencida'] else (row['FechaVencimiento_Date'] - fecha_actual).days
-            logger.info(f"  - {row['_patente']}: {estado} - {row['FechaVencimiento_Date']} ({dias} días)")
+        self.diagnostico.contar("Vencimientos - vencidas", int((dias > 0).sum()))
+        self.diagnostico.contar("Vencimientos - próximas a vencer", int((dias <= 0).sum()))
         
+        if log_detalle and self.detallado:
+            # DEBUG: Mostrar detalles de cada vencimiento
+            logger.info("🔍 DEBUG - Análisis de vencimientos:")
+            for patente, venc, vencida, dias_fila in zip(
+                vencimientos['_patente'], vencimiento[en_rango], vencimientos['esta_vencida'], dias
+            ):
+                estado = "VENCIDA" if vencida else "PRÓXIMA"
+                logger.info(f"  - {patente}: {estado} - {venc} ({abs(dias_fila)} días)")
+        
+        return vencimientos
+
+    def _log_resumen_vencimientos(self, vencimientos: pd.DataFrame):
+        """Registra el resumen de vencidas / próximas con algunos ejemplos."""
         # Separar para logging
         vencidas = vencimientos[vencimientos['esta_vencida']]
         proximas = vencimientos[~vencimientos['esta_vencida']]
@@ -339,11 +654,106 @@ class DataHandler:
         if len(proximas) > 0:
             logger.info("📄 VTV PRÓXIMAS A VENCER (ejemplos):")
             for _, row in proximas.head(5).iterrows():
-                dias_restantes = (row['FechaVencimiento_Date'] - fecha_actual).days
-                logger.info(f"  - {row['_marca']} {row['_modelo']}: {row['_patente']} (vence en {dias_restantes} días)")
+                logger.info(f"  - {row['_marca']} {row['_modelo']}: {row['_patente']} (vence en {row['dias_restantes']} días)")
+
+    def filtrar_vencimientos_proximos(self) -> pd.DataFrame:
+        """Filtra los registros cuya VTV está por vencer O ya está vencida."""
+        if self.df is None:
+            logger.error("❌ Los datos no han sido cargados. Ejecute 'cargar_y_procesar_datos' primero.")
+            return pd.DataFrame()
+    
+        fecha_actual, fecha_limite_pasada, fecha_limite_futura = self._limites_vencimiento()
+        logger.info(f"🔍 Filtrando vencimientos:")
+        logger.info(f"  - VTV vencidas desde: {fecha_limite_pasada}")
+        logger.info(f"  - Fecha actual: {fecha_actual}")
+        logger.info(f"  - VTV por vencer hasta: {fecha_limite_futura} ({DIAS_ANTICIPACION} días)")
         
+        vencimientos = self._filtrar_dataframe(self.df)
+        
+        if 'esta_vencida' in vencimientos.columns:
+            self._log_resumen_vencimientos(vencimientos)
+        self._emitir_diagnostico("Diagnóstico del filtro")
         return vencimientos
 
+    def iterar_vencimientos_por_bloques(self, tamano_chunk: int = TAMANO_CHUNK) -> Iterator[pd.DataFrame]:
+        """
+        Lee el Excel por bloques y produce, bloque a bloque, las filas a notificar.
+
+        La detección de columnas se hace una sola vez sobre el encabezado; el
+        procesamiento de fechas, la validación de teléfonos y el filtro de
+        vencimientos se aplican a cada bloque, así que solo hay un bloque en
+        memoria a la vez. Los bloques sin filas a notificar no se producen.
+        Al terminar, `filas_leidas` tiene la cantidad total de filas del archivo.
+
+        Args:
+            tamano_chunk (int): Cantidad de filas por bloque.
+
+        Yields:
+            pd.DataFrame: Vencimientos de cada bloque (mismo formato que filtrar_vencimientos_proximos).
+        """
+        self.filas_leidas = 0
+
+        # Detectar columnas una única vez, sobre el encabezado
+        columnas_encontradas = self._detectar_columnas(pd.DataFrame(columns=self.lector.leer_encabezado()))
+        self._validar_columnas_requeridas(columnas_encontradas)
+        self.columnas_mapeadas = columnas_encontradas
+        fechas = [columnas_encontradas['fecha_revision'], columnas_encontradas['fecha_vencimiento']]
+        columnas_usadas = list(dict.fromkeys(columnas_encontradas.values()))
+        # Igual que la carga completa: solo las columnas mapeadas, con los mismos tipos
+        bloques = self.lector.iterar_bloques(tamano_chunk, columnas_usadas, self._tipos_lectura(columnas_encontradas), fechas)
+
+        for numero_bloque, bloque in enumerate(bloques, start=1):
+            self.filas_leidas += len(bloque)
+            procesado = self._procesar_dataframe(bloque, columnas_encontradas)
+            coincidencias = self._filtrar_dataframe(procesado, log_detalle=False)
+
+            logger.info(f"  - Bloque {numero_bloque}: {len(bloque)} filas, {len(coincidencias)} a notificar")
+            if not coincidencias.empty:
+                yield coincidencias
+
+        if not self.filas_leidas:
+            logger.warning("⚠️ El archivo no contiene filas para procesar.")
+
+    def cargar_y_filtrar_streaming(self, tamano_chunk: int = TAMANO_CHUNK) -> pd.DataFrame:
+        """
+        Carga el Excel por bloques y conserva únicamente las filas a notificar.
+
+        La memoria depende de la cantidad de vehículos a notificar y no del
+        tamaño del archivo. Este modo no usa la caché de datos.
+
+        Args:
+            tamano_chunk (int): Cantidad de filas por bloque.
+
+        Returns:
+            pd.DataFrame: Vencimientos encontrados (mismo formato que filtrar_vencimientos_proximos).
+        """
+        try:
+            logger.info(f"📊 Cargando datos en modo streaming desde '{self.archivo_excel}' (bloques de {tamano_chunk} filas)...")
+            
+            partes = list(self.iterar_vencimientos_por_bloques(tamano_chunk))
+            if not self.filas_leidas:
+                return pd.DataFrame()
+            
+            vencimientos = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+            # concat devuelve object cuando las categorías difieren entre bloques
+            categoricas = [c for c, tipo in partes[0].dtypes.items() if tipo == 'category'] if partes else []
+            vencimientos = vencimientos.astype({c: 'category' for c in categoricas})
+            self.df = vencimientos
+            
+            logger.info(f"✅ Streaming completado: {self.filas_leidas} registros leídos, {len(vencimientos)} conservados.")
+            
+            if not vencimientos.empty:
+                self._log_resumen_vencimientos(vencimientos)
+            self._emitir_diagnostico("Diagnóstico de la carga por bloques")
+            return vencimientos
+        
+        except FileNotFoundError:
+            logger.error(f"❌ Error: El archivo '{self.archivo_excel}' no fue encontrado.")
+            raise
+        except Exception as e:
+            logger.error(f"❌ Error crítico al cargar los datos en modo streaming: {e}")
+            raise
+
     def crear_reporte_fallidos(self, fallidos: list, archivo_salida: str):
         """Crea un archivo Excel con los detalles de los mensajes fallidos."""
         if not fallidos:
@@ -358,31 +768,54 @@ class DataHandler:
         except Exception as e:
             logger.error(f"❌ No se pudo generar el reporte de fallidos: {e}")
 
-    def obtener_datos_para_envio(self, vencimientos_df: pd.DataFrame) -> list:
-        """Convierte el DataFrame de vencimientos a lista de diccionarios para envío."""
-        datos_envio = []
+    @staticmethod
+    def _formatear_fechas(fechas: pd.Series, formato: str = '%d/%m/%Y') -> list:
+        """Formatea una columna de fechas (sin nulos) como texto, una sola vez por fecha distinta."""
+        codigos, unicas = pd.factorize(fechas)
+        textos = np.asarray(unicas.strftime(formato), dtype=object)
+        return textos[codigos].tolist()
+
+    def iterar_notificaciones(self, vencimientos_df: pd.DataFrame,
+                              tamano_bloque: int = TAMANO_CHUNK) -> Iterator[Notificacion]:
+        """
+        Genera las notificaciones a enviar de forma perezosa.
+
+        Las fechas se formatean de forma vectorizada un bloque a la vez, así
+        que nunca se materializan todos los registros junto al DataFrame.
+
+        Args:
+            vencimientos_df (pd.DataFrame): Resultado de filtrar_vencimientos_proximos.
+            tamano_bloque (int): Cantidad de filas convertidas por vez.
+
+        Yields:
+            Notificacion: Un registro por cliente con fechas válidas.
+        """
+        if vencimientos_df.empty:
+            return
         
-        for _, row in vencimientos_df.iterrows():
-            if pd.isna(row['_fecha_vencimiento']) or pd.isna(row['_fecha_revision']):
-                continue
-                
-            fecha_vencimiento_str = row['_fecha_vencimiento'].strftime('%d/%m/%Y')
-            fecha_revision_str = row['_fecha_revision'].strftime('%d/%m/%Y')
+        con_fechas = vencimientos_df['_fecha_vencimiento'].notna() & vencimientos_df['_fecha_revision'].notna()
+        datos = vencimientos_df[con_fechas.to_numpy()]
+        
+        for inicio in range(0, len(datos), tamano_bloque):
+            bloque = datos.iloc[inicio:inicio + tamano_bloque]
+            esta_vencida = bloque['esta_vencida'].to_numpy(dtype=bool)
+            dias_vencidos = np.where(esta_vencida, bloque['dias_vencidos'].to_numpy(), 0)
             
-            dato = {
-                'patente': row['_patente'],
-                'marca': row['_marca'],
-                'modelo': row['_modelo'],
-                'numero': row['NumeroValidado'],
-                'numero_original': row['_telefono'],
-                'fecha_revision': fecha_revision_str,
-                'fecha_vencimiento': fecha_vencimiento_str,
-                'esta_vencida': row['esta_vencida'],
-                'dias_vencidos': row['dias_vencidos'] if row['esta_vencida'] else 0
-            }
-            datos_envio.append(dato)
-        
-        return datos_envio
+            yield from map(Notificacion._make, zip(
+                bloque['_patente'].tolist(),
+                bloque['_marca'].tolist(),
+                bloque['_modelo'].tolist(),
+                bloque['NumeroValidado'].tolist(),
+                bloque['_telefono'].tolist(),
+                self._formatear_fechas(bloque['_fecha_revision']),
+                self._formatear_fechas(bloque['_fecha_vencimiento']),
+                esta_vencida.tolist(),
+                dias_vencidos.tolist(),
+            ))
+
+    def obtener_datos_para_envio(self, vencimientos_df: pd.DataFrame) -> list:
+        """Convierte el DataFrame de vencimientos a lista de diccionarios (usar iterar_notificaciones)."""
+        return [n._asdict() for n in self.iterar_notificaciones(vencimientos_df)]
 
     def obtener_info_columnas(self) -> dict:
         """Devuelve información sobre las columnas detectadas."""
@@ -429,9 +862,12 @@ class DataHandler:
                 columna = self.columnas_mapeadas[campo]
                 print(f"\n🔍 Analizando columna: {columna}")
                 
-                # Mostrar datos originales
-                datos_originales = self.df[columna].dropna().head(10)
-                print(f"📋 Datos originales: {datos_originales.tolist()}")
+                # Mostrar datos originales (solo se conservan en modo detallado)
+                if columna in self.df.columns:
+                    datos_originales = self.df[columna].dropna().head(10)
+                    print(f"📋 Datos originales: {datos_originales.tolist()}")
+                else:
+                    print("📋 Datos originales no conservados (activar DIAGNOSTICO_DETALLADO para verlos)")
                 
                 # Mostrar datos procesados
                 columna_procesada = f"_{campo}"
@@ -15,7 +15,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from data_handler import DataHandler
-from utils import configurar_logging
+from utils import configurar_logging, vaciar_logs
 
 def main():
     """Función principal para debuggear fechas."""
@@ -117,6 +117,7 @@ def main():
         traceback.print_exc()
     
     finally:
+        vaciar_logs()
         input("\n🔚 Presiona Enter para salir...")
 
 if __name__ == "__main__":
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de Debug para la Navegación de WhatsAppNotifier
+======================================================
+
+Levanta un servidor local con una página que imita WhatsApp Web
+(whatsapp_simulado.html) y envía mensajes de prueba con WhatsAppNotifier,
+midiendo la latencia por mensaje en cada modo de navegación y
+comprobando que el texto llegue intacto. No usa la cuenta real ni el
+perfil de Chrome del proceso principal.
+
+Uso:
+    python debug_navegacion_enlace.py [enlace|busqueda|ambos]
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Agregar el directorio actual al path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from whatsapp_notifier import WhatsAppNotifier
+from utils import configurar_logging
+
+PAGINA_SIMULADA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'whatsapp_simulado.html')
+
+# Los números terminados en 0000 son inválidos para la página simulada
+NUMEROS_PRUEBA = ['5493757323221', '5493757212432', '5491100000000', '5493757456353']
+# Con emoji y acentos para comprobar que el texto llega intacto
+MENSAJE_PRUEBA = "Hola 🚗 Recordatorio de VTV para el número {numero}. ¡Gracias!"
+
+
+class ManejadorPaginaSimulada(BaseHTTPRequestHandler):
+    """Responde cualquier ruta (incluida /send?phone=...) con la página simulada."""
+
+    def do_GET(self):
+        with open(PAGINA_SIMULADA, 'rb') as f:
+            contenido = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def iniciar_servidor() -> ThreadingHTTPServer:
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), ManejadorPaginaSimulada)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def probar_modo(modo: str, url: str):
+    """Envía los mensajes de prueba en un modo y muestra la latencia de cada uno."""
+    print(f"\n🔍 Modo de navegación: {modo}")
+    with tempfile.TemporaryDirectory() as perfil:
+        notificador = WhatsAppNotifier(modo_navegacion=modo, url_whatsapp=url, perfil_chrome=perfil)
+        if not notificador.inicializar_driver():
+            return
+        try:
+            if not notificador.abrir_whatsapp():
+                return
+
+            tiempos = []
+            for numero in NUMEROS_PRUEBA:
+                inicio = time.perf_counter()
+                exito, razon = notificador.enviar_notificacion(numero, MENSAJE_PRUEBA.format(numero=numero))
+                segundos = time.perf_counter() - inicio
+                tiempos.append(segundos)
+                print(f"  {'✅' if exito else '❌'} {numero}: {segundos:5.2f} s - {razon}")
+
+            enviados = notificador.driver.execute_script("return window.vtvEnviados;") or []
+            print(f"📨 Mensajes recibidos por la página: {[e['numero'] for e in enviados]}")
+            intactos = all(e['texto'] == MENSAJE_PRUEBA.format(numero=e['numero']) for e in enviados)
+            print(f"🔤 Texto intacto (emoji y acentos): {'✅' if intactos else '❌'}")
+            print(f"⏱️  Promedio por mensaje: {sum(tiempos) / len(tiempos):.2f} s")
+        finally:
+            notificador.cerrar()
+
+
+def main():
+    configurar_logging()
+    opcion = sys.argv[1] if len(sys.argv) > 1 else 'ambos'
+    modos = WhatsAppNotifier.MODOS_NAVEGACION if opcion == 'ambos' else (opcion,)
+
+    servidor = iniciar_servidor()
+    url = f"http://127.0.0.1:{servidor.server_address[1]}"
+
+    print("="*80)
+    print("               DEBUG DE NAVEGACIÓN DE WHATSAPP (PÁGINA SIMULADA)")
+    print("="*80)
+    print(f"🌐 Página simulada en: {url}")
+
+    try:
+        for modo in modos:
+            probar_modo(modo, url)
+    finally:
+        servidor.shutdown()
+    print("="*80)
+
+
+if __name__ == "__main__":
+    main()
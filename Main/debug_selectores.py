@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de Debug de Selectores
+=============================
+
+Muestra las estadísticas que el notificador acumuló sobre los selectores de
+WhatsApp Web (aciertos, fallos, tasa y latencia media por rol) y marca los
+que nunca acertaron, para podarlos de las listas de whatsapp_notifier.py.
+
+Uso:
+    python debug_selectores.py [minimo_intentos]
+"""
+
+import sys
+import os
+
+# Agregar el directorio actual al path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from selectores import RegistroSelectores
+
+
+def main():
+    minimo_intentos = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    registro = RegistroSelectores()
+
+    print("="*100)
+    print("                         ESTADÍSTICAS DE SELECTORES")
+    print("="*100)
+    print(f"📁 Archivo: {registro.ruta}")
+
+    filas = registro.resumen()
+    if not filas:
+        print("ℹ️  Todavía no hay estadísticas registradas.")
+        return
+
+    rol_actual = None
+    for fila in filas:
+        if fila['rol'] != rol_actual:
+            rol_actual = fila['rol']
+            print(f"\n🔍 {rol_actual}")
+            print(f"  {'aciertos':>8} {'fallos':>7} {'tasa':>6} {'ms':>8}  selector")
+        print(f"  {fila['aciertos']:>8} {fila['fallos']:>7} {fila['tasa']:>6.2f} "
+              f"{fila['latencia_ms']:>8.1f}  {fila['selector']}")
+
+    muertos = registro.selectores_muertos(minimo_intentos)
+    print("\n" + "="*100)
+    if muertos:
+        print(f"🗑️  Selectores sin aciertos en {minimo_intentos} intentos o más (candidatos a eliminar):")
+        for fila in muertos:
+            print(f"  - [{fila['rol']}] {fila['selector']}")
+    else:
+        print(f"✅ No hay selectores sin aciertos con {minimo_intentos} intentos o más.")
+    print("="*100)
+
+
+if __name__ == "__main__":
+    main()
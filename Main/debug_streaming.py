@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de Debug de la Carga por Bloques
+=======================================
+
+Compara la carga por bloques (cargar_y_filtrar_streaming, la que usan
+CARGA_STREAMING y el pipeline asíncrono) con la carga completa
+(cargar_y_procesar_datos + filtrar_vencimientos_proximos), columna por
+columna, y muestra las diferencias. Sin argumentos genera planillas de prueba en CSV y Excel con
+fechas ISO con hora y fechas con el día primero; con un archivo, compara ese.
+
+Uso:
+    python debug_streaming.py [archivo] [tamano_chunk]
+"""
+
+import sys
+import os
+import tempfile
+import logging
+import pandas as pd
+
+# Agregar el directorio actual al path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from data_handler import DataHandler
+from benchmark_lectores import generar_planilla
+
+def generar_archivos(directorio: str, cantidad_filas: int = 2000) -> list:
+    """Planillas de prueba con vencimientos alrededor de hoy, en dos formatos de fecha."""
+    planilla = generar_planilla(cantidad_filas)
+    # Solo días del 1 al 12 (mes anterior, actual y siguiente): cada fecha se puede leer
+    # con el día o con el mes primero, que es donde las dos cargas podrían diferir
+    filas = pd.RangeIndex(cantidad_filas)
+    inicio_mes = pd.Timestamp.today().normalize().replace(day=1)
+    meses = [inicio_mes + pd.DateOffset(months=m) for m in (-1, 0, 1)]
+    vencimiento = pd.DatetimeIndex([meses[(i // 12) % 3] for i in filas]) + pd.to_timedelta(filas % 12, unit='D')
+    revision = vencimiento - pd.DateOffset(years=1)
+
+    rutas = []
+    for nombre, formato in (('iso', '%Y-%m-%d %H:%M:%S'), ('dia_primero', '%d/%m/%Y')):
+        planilla['FechaDeVencimiento'] = (vencimiento + pd.Timedelta(hours=10, minutes=30)).strftime(formato)
+        planilla['FechaDeRevision'] = revision.strftime(formato)
+        ruta = os.path.join(directorio, f"planilla_{nombre}.csv")
+        planilla.to_csv(ruta, index=False)
+        rutas.append(ruta)
+    ruta = os.path.join(directorio, 'planilla_dia_primero.xlsx')
+    planilla.to_excel(ruta, index=False)
+    rutas.append(ruta)
+    return rutas
+
+
+def comparar(archivo: str, tamano_chunk: int) -> bool:
+    """Carga el archivo de las dos formas y muestra si coinciden."""
+    completo = DataHandler(archivo, usar_cache=False)
+    completo.cargar_y_procesar_datos()
+    esperado = completo.filtrar_vencimientos_proximos().reset_index(drop=True)
+
+    por_bloques = DataHandler(archivo, usar_cache=False)
+    obtenido = por_bloques.cargar_y_filtrar_streaming(tamano_chunk).reset_index(drop=True)
+
+    nombre = os.path.basename(archivo)
+    if list(esperado.columns) != list(obtenido.columns):
+        print(f"❌ {nombre}: columnas distintas:\n   completa:    {list(esperado.columns)}\n"
+              f"   por bloques: {list(obtenido.columns)}")
+        return False
+    if len(esperado) != len(obtenido):
+        print(f"❌ {nombre}: {len(esperado)} filas en la carga completa, {len(obtenido)} por bloques")
+        return False
+
+    diferencias = [
+        columna for columna in esperado.columns
+        if not esperado[columna].astype(object).equals(obtenido[columna].astype(object))
+    ]
+    if diferencias:
+        print(f"❌ {nombre}: columnas distintas: {', '.join(diferencias)}")
+        for columna in diferencias:
+            distintas = esperado[columna].astype(object) != obtenido[columna].astype(object)
+            muestra = pd.DataFrame({'completa': esperado.loc[distintas, columna],
+                                    'por_bloques': obtenido.loc[distintas, columna]}).head(3)
+            print(muestra.to_string())
+        return False
+
+    print(f"✅ {nombre}: {len(obtenido)} vencimientos iguales en ambas cargas")
+    return True
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+    tamano_chunk = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    print("="*80)
+    print("            DEBUG DE LA CARGA POR BLOQUES VS. CARGA COMPLETA")
+    print("="*80)
+
+    if len(sys.argv) > 1:
+        iguales = comparar(sys.argv[1], tamano_chunk)
+    else:
+        with tempfile.TemporaryDirectory() as directorio:
+            iguales = all([comparar(ruta, tamano_chunk) for ruta in generar_archivos(directorio)])
+
+    print("="*80)
+    sys.exit(0 if iguales else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Diagnóstico
+=====================
+
+Reemplaza el logging fila por fila del procesamiento de datos por métricas
+acotadas: contadores, histogramas y una muestra de reservorio de valores
+problemáticos. El costo en memoria y en líneas de log no depende de la
+cantidad de filas; el volcado completo solo se hace en modo detallado
+(DIAGNOSTICO_DETALLADO=true).
+"""
+
+import logging
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+from config import TAMANO_MUESTRA_DIAGNOSTICO
+
+logger = logging.getLogger(__name__)
+
+
+class MuestraReservorio:
+    """
+    Muestra uniforme de tamaño fijo sobre un flujo de valores (algoritmo R).
+
+    Los lotes se procesan de forma vectorizada: solo se recorren en Python
+    los elementos que efectivamente entran al reservorio.
+    """
+
+    def __init__(self, capacidad: int, semilla: int = 0):
+        self.capacidad = capacidad
+        self.vistos = 0
+        self.valores = []
+        self._rng = np.random.default_rng(semilla)
+
+    def agregar(self, valores):
+        """Agrega un lote de valores al flujo muestreado."""
+        valores = list(valores)
+        if not valores or self.capacidad <= 0:
+            self.vistos += len(valores)
+            return
+
+        # Llenar el reservorio con los primeros valores
+        libres = max(self.capacidad - len(self.valores), 0)
+        self.valores.extend(valores[:libres])
+        restantes = valores[libres:]
+        inicio = self.vistos + libres
+        self.vistos += len(valores)
+        if not restantes:
+            return
+
+        # El elemento i-ésimo del flujo reemplaza a uno al azar con probabilidad capacidad / (i + 1)
+        posiciones = self._rng.integers(0, np.arange(inicio + 1, inicio + len(restantes) + 1))
+        for indice in np.flatnonzero(posiciones < self.capacidad):
+            self.valores[posiciones[indice]] = restantes[indice]
+
+
+class Diagnostico:
+    """Acumula métricas del procesamiento y las emite como un resumen compacto."""
+
+    def __init__(self, tamano_muestra: int = TAMANO_MUESTRA_DIAGNOSTICO):
+        self.tamano_muestra = tamano_muestra
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta todas las métricas acumuladas."""
+        self.contadores = Counter()
+        self.histogramas = {}
+        self.muestras = {}
+
+    @property
+    def vacio(self) -> bool:
+        return not (self.contadores or self.histogramas or self.muestras)
+
+    def contar(self, clave: str, cantidad: int = 1):
+        """Suma `cantidad` al contador `clave`."""
+        self.contadores[clave] += int(cantidad)
+
+    def histograma(self, nombre: str, valores: pd.Series):
+        """Acumula la frecuencia de cada valor de la serie en el histograma `nombre`."""
+        conteo = valores.value_counts(dropna=False)
+        histograma = self.histogramas.setdefault(nombre, Counter())
+        for valor, cantidad in conteo.items():
+            if cantidad:
+                histograma[str(valor)] += int(cantidad)
+
+    def muestrear(self, nombre: str, valores):
+        """Agrega valores a la muestra de reservorio `nombre`."""
+        if nombre not in self.muestras:
+            self.muestras[nombre] = MuestraReservorio(self.tamano_muestra, semilla=len(self.muestras))
+        self.muestras[nombre].agregar(valores)
+
+    def emitir_resumen(self, titulo: str = "Diagnóstico del procesamiento", maximo_categorias: int = 10):
+        """Registra un resumen acotado de todo lo acumulado."""
+        if self.vacio:
+            return
+
+        logger.info(f"🩺 {titulo}:")
+        for clave, cantidad in sorted(self.contadores.items()):
+            logger.info(f"  - {clave}: {cantidad}")
+
+        for nombre, histograma in self.histogramas.items():
+            comunes = histograma.most_common(maximo_categorias)
+            detalle = ', '.join(f"{valor}: {cantidad}" for valor, cantidad in comunes)
+            otros = len(histograma) - len(comunes)
+            if otros > 0:
+                detalle += f" (+{otros} valores más)"
+            logger.info(f"  - {nombre}: {detalle}")
+
+        for nombre, muestra in self.muestras.items():
+            if muestra.vistos:
+                logger.warning(f"⚠️  {nombre}: {muestra.vistos} casos, muestra: {muestra.valores}")
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Lectores de Datos
+===========================
+
+Backends intercambiables para leer la planilla de clientes. Todos exponen la
+misma interfaz (encabezado, lectura de columnas con tipos y lectura por
+bloques) para que DataHandler detecte y procese las columnas igual sin
+importar el formato de origen:
+
+- openpyxl: Excel (.xlsx) con el motor por defecto de pandas.
+- calamine: Excel (.xlsx/.xls/.ods) con el motor en Rust (python-calamine).
+- csv:      exportaciones CSV con el lector de pyarrow.
+- parquet / feather: formatos columnares leídos de forma nativa.
+"""
+
+import os
+import logging
+from abc import ABC, abstractmethod
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import python_calamine  # noqa: F401
+    CALAMINE_DISPONIBLE = True
+except ImportError:
+    CALAMINE_DISPONIBLE = False
+
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_DISPONIBLE = True
+except ImportError:
+    PYARROW_DISPONIBLE = False
+
+
+class LectorDatos(ABC):
+    """
+    Interfaz común de los lectores.
+
+    Las subclases implementan leer_encabezado, leer e iterar_bloques; a un
+    lector que no los implementa no se lo puede crear.
+    """
+
+    nombre = 'base'
+
+    def __init__(self, archivo: str):
+        self.archivo = archivo
+
+    @abstractmethod
+    def leer_encabezado(self) -> list:
+        """Devuelve los nombres de columna sin leer los datos."""
+
+    @abstractmethod
+    def leer(self, columnas: list, tipos: dict) -> pd.DataFrame:
+        """Lee solo las columnas indicadas aplicando los tipos pedidos."""
+
+    @abstractmethod
+    def iterar_bloques(self, tamano_bloque: int, columnas: list = None, tipos: dict = None, fechas: list = None):
+        """
+        Produce el archivo en DataFrames de a lo sumo `tamano_bloque` filas, sin cargarlo entero.
+
+        Args:
+            tamano_bloque (int): Cantidad de filas por bloque.
+            columnas (list): Columnas a leer (None = todas).
+            tipos (dict): Tipos a aplicar al leer, como en leer().
+            fechas (list): Columnas de fechas, para los formatos que las guardan como
+                texto (CSV): se convierten igual que en la lectura completa.
+        """
+
+
+class LectorExcel(LectorDatos):
+    """Excel leído por pandas con el motor indicado en 'motor'."""
+
+    nombre = 'openpyxl'
+    motor = 'openpyxl'
+
+    def leer_encabezado(self) -> list:
+        return pd.read_excel(self.archivo, nrows=0, engine=self.motor).columns.tolist()
+
+    def leer(self, columnas: list, tipos: dict) -> pd.DataFrame:
+        return pd.read_excel(self.archivo, usecols=columnas, dtype=tipos or None, engine=self.motor)
+
+    def iterar_bloques(self, tamano_bloque: int, columnas: list = None, tipos: dict = None, fechas: list = None):
+        """Recorre la primera hoja en modo read_only de openpyxl, sin cargarla entera."""
+        from openpyxl import load_workbook
+
+        libro = load_workbook(self.archivo, read_only=True, data_only=True)
+        try:
+            # Misma hoja que usa pd.read_excel por defecto (la primera)
+            hoja = libro.worksheets[0]
+            filas = hoja.iter_rows(values_only=True)
+
+            yield from _bloques_de_filas(filas, tamano_bloque, columnas, tipos)
+        finally:
+            libro.close()
+
+
+def _convertir_celda(valor, vacio=None):
+    """Normaliza una celda como lo hace pd.read_excel."""
+    if valor is None or (vacio is not None and valor == vacio):
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+def _bloques_de_filas(filas, tamano_bloque: int, columnas: list = None, tipos: dict = None, vacio=None):
+    """
+    Arma DataFrames de `tamano_bloque` filas a partir de filas de celdas (la primera es el encabezado).
+
+    Solo se conservan las `columnas` pedidas (None = todas). Las filas
+    completamente vacías (en todas las columnas, no solo en las pedidas) se
+    saltean y los números enteros guardados como float pasan a int, igual que
+    en pd.read_excel. Los `tipos` se aplican sobre las celdas tal como se
+    leyeron, antes de que pandas infiera el resto: una columna de teléfonos
+    con celdas vacías pasaría a float y llegaría como '3758781304.0'.
+    `vacio` es el valor con el que el motor representa una celda vacía.
+    """
+    encabezado = next(filas, None)
+    if encabezado is None:
+        return
+    nombres = [str(c) if c not in (None, vacio) else f"Unnamed: {i}" for i, c in enumerate(encabezado)]
+    indices = [i for i, nombre in enumerate(nombres) if columnas is None or nombre in columnas]
+    ancho = len(nombres)
+
+    bloque = []
+    for fila in filas:
+        if all(valor is None or valor == vacio for valor in fila[:ancho]):
+            continue
+        bloque.append(tuple(_convertir_celda(fila[i], vacio) if i < len(fila) else None for i in indices))
+        if len(bloque) >= tamano_bloque:
+            yield _marco_de_filas(bloque, [nombres[i] for i in indices], tipos)
+            bloque = []
+
+    if bloque:
+        yield _marco_de_filas(bloque, [nombres[i] for i in indices], tipos)
+
+
+def _marco_de_filas(filas: list, columnas: list, tipos: dict = None) -> pd.DataFrame:
+    return pd.DataFrame(filas, columns=columnas, dtype=object).astype(tipos or {}).infer_objects()
+
+
+class LectorCalamine(LectorExcel):
+    """Excel (.xlsx/.xls/.ods) leído con calamine (Rust); mucho más rápido que openpyxl en archivos grandes."""
+
+    nombre = 'calamine'
+    motor = 'calamine'
+
+    def iterar_bloques(self, tamano_bloque: int, columnas: list = None, tipos: dict = None, fechas: list = None):
+        """Recorre la primera hoja fila a fila con calamine (openpyxl no abre .xls ni .ods)."""
+        from python_calamine import CalamineWorkbook
+
+        libro = CalamineWorkbook.from_path(self.archivo)
+        try:
+            # calamine representa las celdas vacías con ''
+            filas = libro.get_sheet_by_index(0).iter_rows()
+            yield from _bloques_de_filas(filas, tamano_bloque, columnas, tipos, vacio='')
+        finally:
+            libro.close()
+
+
+class LectorCSV(LectorDatos):
+    """Exportaciones CSV leídas con el motor de pyarrow (o el de C si pyarrow no está)."""
+
+    nombre = 'csv'
+
+    @property
+    def motor(self) -> str:
+        return 'pyarrow' if PYARROW_DISPONIBLE else 'c'
+
+    def leer_encabezado(self) -> list:
+        return pd.read_csv(self.archivo, nrows=0).columns.tolist()
+
+    def leer(self, columnas: list, tipos: dict) -> pd.DataFrame:
+        return pd.read_csv(self.archivo, usecols=columnas, dtype=tipos or None, engine=self.motor)
+
+    def iterar_bloques(self, tamano_bloque: int, columnas: list = None, tipos: dict = None, fechas: list = None):
+        # El motor de pyarrow no admite chunksize; la lectura por bloques usa el de C.
+        # pyarrow convierte las fechas ISO (con o sin hora) al leer el archivo completo;
+        # acá se hace lo mismo con las columnas de fechas, y las que no son ISO quedan como texto.
+        opciones = {'parse_dates': fechas, 'date_format': 'ISO8601'} if fechas and PYARROW_DISPONIBLE else {}
+        with pd.read_csv(self.archivo, usecols=columnas, dtype=tipos or None, chunksize=tamano_bloque,
+                         **opciones) as lector:
+            for bloque in lector:
+                # pyarrow devuelve las columnas en el orden pedido; el motor de C, en el del archivo
+                yield bloque[columnas] if columnas and PYARROW_DISPONIBLE else bloque
+
+
+class LectorParquet(LectorDatos):
+    """Archivos Parquet: lee solo las columnas pedidas directamente del formato columnar."""
+
+    nombre = 'parquet'
+
+    def leer_encabezado(self) -> list:
+        import pyarrow.parquet as pq
+        return pq.read_schema(self.archivo).names
+
+    def leer(self, columnas: list, tipos: dict) -> pd.DataFrame:
+        return pd.read_parquet(self.archivo, columns=columnas).astype(tipos)
+
+    def iterar_bloques(self, tamano_bloque: int, columnas: list = None, tipos: dict = None, fechas: list = None):
+        import pyarrow.parquet as pq
+        for lote in pq.ParquetFile(self.archivo).iter_batches(batch_size=tamano_bloque, columns=columnas):
+            yield lote.to_pandas().astype(tipos or {})
+
+
+class LectorFeather(LectorDatos):
+    """Archivos Feather (Arrow IPC)."""
+
+    nombre = 'feather'
+
+    def leer_encabezado(self) -> list:
+        import pyarrow.ipc as ipc
+        with ipc.open_file(self.archivo) as lector:
+            return lector.schema.names
+
+    def leer(self, columnas: list, tipos: dict) -> pd.DataFrame:
+        return pd.read_feather(self.archivo, columns=columnas).astype(tipos)
+
+    def iterar_bloques(self, tamano_bloque: int, columnas: list = None, tipos: dict = None, fechas: list = None):
+        """Recorre los lotes del archivo de a uno (mapeado en memoria), solo con las columnas pedidas."""
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        with pa.memory_map(self.archivo) as origen, ipc.open_file(origen) as lector:
+            for i in range(lector.num_record_batches):
+                lote = lector.get_batch(i)
+                if columnas is not None:
+                    lote = lote.select(columnas)
+                # Un lote puede tener muchas más filas que un bloque (pandas escribe de a 64K)
+                for inicio in range(0, lote.num_rows, tamano_bloque):
+                    yield lote.slice(inicio, tamano_bloque).to_pandas().astype(tipos or {})
+
+
+LECTORES = {
+    lector.nombre: lector
+    for lector in (LectorExcel, LectorCalamine, LectorCSV, LectorParquet, LectorFeather)
+}
+
+# Lector sugerido según la extensión del archivo cuando se pide 'auto'
+LECTOR_POR_EXTENSION = {
+    '.xlsx': 'calamine',
+    '.xlsm': 'calamine',
+    '.xls': 'calamine',
+    '.ods': 'calamine',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+}
+
+
+def crear_lector(archivo: str, nombre: str = 'auto') -> LectorDatos:
+    """
+    Crea el lector indicado para el archivo.
+
+    Args:
+        archivo (str): Ruta del archivo de datos.
+        nombre (str): 'auto' o uno de LECTORES (openpyxl, calamine, csv, parquet, feather).
+
+    Returns:
+        LectorDatos: Lector listo para usar.
+    """
+    nombre = (nombre or 'auto').lower()
+    if nombre == 'auto':
+        extension = os.path.splitext(archivo)[1].lower()
+        nombre = LECTOR_POR_EXTENSION.get(extension, 'openpyxl')
+
+    if nombre not in LECTORES:
+        raise ValueError(f"Lector de datos desconocido: '{nombre}'. Opciones: auto, {', '.join(LECTORES)}")
+
+    if nombre == 'calamine' and not CALAMINE_DISPONIBLE:
+        logger.info("ℹ️ python-calamine no está instalado, se usa openpyxl para leer el Excel.")
+        nombre = 'openpyxl'
+
+    if nombre in ('parquet', 'feather') and not PYARROW_DISPONIBLE:
+        raise ImportError(f"Para leer archivos {nombre} se necesita pyarrow (pip install pyarrow).")
+
+    return LECTORES[nombre](archivo)
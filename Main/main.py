@@ -8,24 +8,34 @@ Este script orquesta el proceso completo de notificación:
 1. Configura el entorno.
 2. Carga y procesa los datos de los clientes desde un archivo Excel.
 3. Filtra los clientes cuyas VTV están próximas a vencer O ya vencidas.
-4. Inicializa WhatsApp Web a través de Selenium.
-5. Itera sobre los clientes a notificar y envía un mensaje personalizado.
+4. Inicializa una o más sesiones de WhatsApp Web a través de Selenium
+   (en segundo plano, mientras se cargan los datos y se confirma el envío).
+5. Reparte los clientes entre las sesiones y envía un mensaje personalizado.
 6. Genera un reporte con los envíos que no pudieron completarse.
+
+Con PIPELINE_ASINCRONO los pasos 2 a 6 avanzan a la vez, con colas acotadas
+entre ellos (ver pipeline.py).
 """
 
-import time
 import os
+import asyncio
 import logging
+from itertools import islice
 
-from whatsapp_notifier import WhatsAppNotifier
-from data_handler import DataHandler
-from utils import configurar_logging
+from pool_envio import PoolEnvio
+from pipeline import PipelineCampana
+from data_handler import DataHandler, Notificacion
+from utils import configurar_logging, vaciar_logs
+from plantillas import RenderizadorMensajes, ErrorPlantilla
 from config import (
     ARCHIVO_EXCEL,
     REPORTE_FALLIDOS_EXCEL,
-    INTERVALO_MENSAJES,
+    PERFILES_CHROME,
+    CARGA_STREAMING,
+    PIPELINE_ASINCRONO,
     MENSAJE_TEMPLATE,
     MENSAJE_VENCIDO_TEMPLATE,
+    METODO_ESCRITURA,
     mostrar_configuracion,
     validar_configuracion
 )
@@ -33,85 +43,46 @@ from config import (
 # Configurar logging al inicio
 logger = configurar_logging()
 
+_renderizador = None
+
+def obtener_renderizador() -> RenderizadorMensajes:
+    """
+    Devuelve las plantillas de mensajes compiladas (se compilan una sola vez).
+    
+    Raises:
+        ErrorPlantilla: Si alguna plantilla tiene sintaxis inválida o campos inexistentes.
+    """
+    global _renderizador
+    if _renderizador is None:
+        # Solo el tipeo con send_keys necesita quitar los caracteres que ChromeDriver no soporta
+        _renderizador = RenderizadorMensajes(
+            MENSAJE_TEMPLATE, MENSAJE_VENCIDO_TEMPLATE, limpiar=METODO_ESCRITURA == 'teclado'
+        )
+    return _renderizador
+
 def crear_mensaje_personalizado(dato):
     """
     Crea un mensaje personalizado basado en si la VTV está vencida o próxima a vencer.
     
     Args:
-        dato (dict): Diccionario con los datos del cliente
+        dato (Notificacion): Datos del cliente
         
     Returns:
         str: Mensaje personalizado
     """
     try:
-        # Debug: mostrar datos recibidos
-        logger.debug(f"Creando mensaje para: {dato['patente']}")
-        logger.debug(f"Datos recibidos: {dato}")
-        
-        # Verificar que las plantillas están bien configuradas
-        if not isinstance(MENSAJE_TEMPLATE, str) or not isinstance(MENSAJE_VENCIDO_TEMPLATE, str):
-            logger.error("Las plantillas de mensajes no están configuradas correctamente")
-            logger.error(f"MENSAJE_TEMPLATE type: {type(MENSAJE_TEMPLATE)}")
-            logger.error(f"MENSAJE_VENCIDO_TEMPLATE type: {type(MENSAJE_VENCIDO_TEMPLATE)}")
-            return "Error: Plantillas de mensajes no configuradas"
-        
-        if dato['esta_vencida']:
-            # VTV ya vencida - usar plantilla de vencido
-            logger.debug("Usando plantilla de VTV VENCIDA")
-            logger.debug(f"Plantilla: {MENSAJE_VENCIDO_TEMPLATE[:100]}...")
-            
-            try:
-                mensaje = MENSAJE_VENCIDO_TEMPLATE.format(
-                    patente=dato['patente'],
-                    marca=dato['marca'],
-                    modelo=dato['modelo'],
-                    fecha_revision=dato['fecha_revision'],
-                    fecha_vencimiento=dato['fecha_vencimiento'],
-                    dias_vencidos=dato['dias_vencidos']
-                )
-                logger.debug("Mensaje de VTV vencida creado exitosamente")
-                
-            except KeyError as e:
-                logger.error(f"Falta el campo {e} en los datos o en la plantilla")
-                return f"Error: Falta el campo {e} en los datos"
-            except Exception as e:
-                logger.error(f"Error al formatear mensaje de VTV vencida: {e}")
-                return f"Error al formatear mensaje: {e}"
-        else:
-            # VTV próxima a vencer - usar plantilla normal
-            logger.debug("Usando plantilla de VTV PRÓXIMA A VENCER")
-            logger.debug(f"Plantilla: {MENSAJE_TEMPLATE[:100]}...")
-            
-            try:
-                mensaje = MENSAJE_TEMPLATE.format(
-                    patente=dato['patente'],
-                    marca=dato['marca'],
-                    modelo=dato['modelo'],
-                    fecha_revision=dato['fecha_revision'],
-                    fecha_vencimiento=dato['fecha_vencimiento']
-                )
-                logger.debug("Mensaje de VTV próxima a vencer creado exitosamente")
-                
-            except KeyError as e:
-                logger.error(f"Falta el campo {e} en los datos o en la plantilla")
-                return f"Error: Falta el campo {e} en los datos"
-            except Exception as e:
-                logger.error(f"Error al formatear mensaje de VTV próxima: {e}")
-                return f"Error al formatear mensaje: {e}"
-        
-        # Verificar que el mensaje fue creado correctamente
-        if not mensaje or len(mensaje.strip()) == 0:
-            logger.error("El mensaje generado está vacío")
-            return "Error: Mensaje vacío generado"
-            
-        # Log del mensaje generado (solo primeros 100 caracteres para no llenar el log)
-        logger.debug(f"Mensaje generado: {mensaje[:100]}...")
-        
-        return mensaje
-        
+        mensaje = obtener_renderizador().renderizar(dato)
+    except ErrorPlantilla as e:
+        logger.error(f"Las plantillas de mensajes no están configuradas correctamente: {e}")
+        return f"Error: {e}"
     except Exception as e:
         logger.error(f"Error crítico al crear mensaje personalizado: {e}")
         return f"Error crítico: {e}"
+    
+    if not mensaje.strip():
+        logger.error("El mensaje generado está vacío")
+        return "Error: Mensaje vacío generado"
+    return mensaje
 
 def debug_configuracion_inicial():
     """
@@ -135,32 +106,112 @@ def debug_configuracion_inicial():
         logger.error(f"MENSAJE_VENCIDO_TEMPLATE NO ES STRING: {MENSAJE_VENCIDO_TEMPLATE}")
     
     # Probar formateo
-    datos_test = {
-        'patente': 'TEST123',
-        'marca': 'Toyota',
-        'modelo': 'Corolla',
-        'fecha_revision': '01/01/2024',
-        'fecha_vencimiento': '01/01/2025',
-        'esta_vencida': False,
-        'dias_vencidos': 0
-    }
+    datos_test = Notificacion(
+        patente='TEST123',
+        marca='Toyota',
+        modelo='Corolla',
+        numero='',
+        numero_original='',
+        fecha_revision='01/01/2024',
+        fecha_vencimiento='01/01/2025',
+        esta_vencida=False,
+        dias_vencidos=0
+    )
     
     logger.info("🧪 PROBANDO FORMATEO DE MENSAJES...")
     mensaje_test = crear_mensaje_personalizado(datos_test)
     logger.info(f"Mensaje test generado: {mensaje_test[:100]}...")
     
     # Probar mensaje vencido
-    datos_test['esta_vencida'] = True
-    datos_test['dias_vencidos'] = 5
+    datos_test = datos_test._replace(esta_vencida=True, dias_vencidos=5)
     mensaje_vencido_test = crear_mensaje_personalizado(datos_test)
     logger.info(f"Mensaje vencido test generado: {mensaje_vencido_test[:100]}...")
 
+def ejecutar_pipeline(data_handler: DataHandler, pool: PoolEnvio):
+    """
+    Ejecuta la campaña con el pipeline asíncrono (PIPELINE_ASINCRONO).
+
+    La lectura, el armado de mensajes, el envío y el reporte avanzan a la vez,
+    así que los totales recién se conocen al final: la confirmación se pide antes
+    de leer el archivo; los navegadores ya se están abriendo desde antes.
+    """
+    try:
+        renderizador = obtener_renderizador()
+    except ErrorPlantilla as e:
+        logger.critical(f"❌ Error en las plantillas de mensajes: {e}")
+        return
+
+    vaciar_logs()
+    print("\n" + "="*60)
+    print("           NOTIFICADOR DE VENCIMIENTOS VTV")
+    print("="*60)
+    print(f"📊 Se notificarán los vencimientos de '{ARCHIVO_EXCEL}' a medida que se lean.")
+    print("🌐 Google Chrome ya se está abriendo en segundo plano para conectar con WhatsApp Web.")
+    if len(PERFILES_CHROME) > 1:
+        print(f"📱 Se enviará en paralelo con {len(PERFILES_CHROME)} sesiones (una ventana por línea).")
+    print()
+    print("📋 INSTRUCCIONES:")
+    print("  1. Escanea el código QR con tu teléfono si es la primera vez (uno por sesión).")
+    print("  2. Una vez iniciada la sesión, el proceso comenzará automáticamente.")
+    print("  3. NO CIERRES el navegador hasta que el proceso finalice.")
+    print("="*60)
+
+    print("\n📧 CONFIGURACIÓN DE MENSAJES:")
+    mostrar_configuracion()
+
+    vaciar_logs()
+    respuesta = input("\n¿Deseas continuar con el envío de notificaciones? (s/n): ")
+    if respuesta.lower() not in ['s', 'si', 'sí', 'y', 'yes']:
+        logger.info("❌ Proceso cancelado por el usuario.")
+        return
+
+    pipeline = PipelineCampana(data_handler, renderizador, pool)
+    try:
+        resumen = asyncio.run(pipeline.ejecutar())
+    except ValueError as e:
+        logger.critical(f"❌ Error en la estructura del Excel:")
+        logger.critical(str(e))
+        return
+    if resumen is None:
+        return
+
+    proximas = resumen.notificaciones - resumen.vencidas
+    logger.info("\n" + "="*60)
+    logger.info("=== PROCESO DE NOTIFICACIONES COMPLETADO ===")
+    logger.info(f"📊 Registros leídos: {data_handler.filas_leidas}")
+    logger.info(f"📊 Total de vencimientos a notificar: {resumen.notificaciones}")
+    logger.info(f"✅ Mensajes enviados exitosamente: {resumen.enviados}")
+    logger.info(f"❌ Mensajes fallidos: {resumen.fallidos}")
+    logger.info("="*60)
+    logger.info("🎉 El script ha finalizado. Revisa el log y el reporte de fallidos si es necesario.")
+
+    vaciar_logs()
+    print("\n" + "="*60)
+    print("           RESUMEN FINAL")
+    print("="*60)
+    print(f"✅ Enviados exitosamente: {resumen.enviados}/{resumen.notificaciones}")
+    print(f"❌ Fallidos: {resumen.fallidos}/{resumen.notificaciones}")
+
+    if resumen.notificaciones:
+        print("\n📊 DESGLOSE POR TIPO:")
+        if resumen.vencidas > 0:
+            print(f"🔴 VTV Vencidas notificadas: {resumen.vencidas}")
+        if proximas > 0:
+            print(f"🟡 VTV Próximas notificadas: {proximas}")
+
+    if resumen.fallidos:
+        print(f"📄 Reporte de fallidos: {REPORTE_FALLIDOS_EXCEL}")
+    print("="*60)
+
 def ejecutar_proceso():
     """Función principal que ejecuta todo el flujo de notificaciones."""
     logger.info("==================================================")
     logger.info("=== INICIANDO PROCESO DE NOTIFICACIONES DE VTV ===")
     logger.info("==================================================")
     
+    # Validar las plantillas antes de cargar nada
+    validar_configuracion()
+
     # Debug inicial
     debug_configuracion_inicial()
 
@@ -174,10 +225,28 @@ def ejecutar_proceso():
     
     # Mostrar configuración de columnas para debug
     data_handler.mostrar_configuracion_columnas()
-    
+
+    # Abrir Chrome y WhatsApp Web mientras se cargan los datos y el operador revisa la vista previa;
+    # si el proceso termina antes de enviar (sin vencimientos, cancelado, error) se cierran igual
+    pool = PoolEnvio()
+    logger.info(f"🚀 Iniciando {len(pool.perfiles)} sesión(es) de WhatsApp Web en segundo plano...")
+    pool.iniciar_en_segundo_plano()
+    try:
+        if PIPELINE_ASINCRONO:
+            ejecutar_pipeline(data_handler, pool)
+        else:
+            ejecutar_campana(data_handler, pool)
+    finally:
+        pool.cerrar()
+
+def ejecutar_campana(data_handler: DataHandler, pool: PoolEnvio):
+    """Carga todos los vencimientos, pide confirmación y los envía con las sesiones del pool."""
     try:
-        data_handler.cargar_y_procesar_datos()
-        vencimientos_df = data_handler.filtrar_vencimientos_proximos()
+        if CARGA_STREAMING:
+            vencimientos_df = data_handler.cargar_y_filtrar_streaming()
+        else:
+            data_handler.cargar_y_procesar_datos()
+            vencimientos_df = data_handler.filtrar_vencimientos_proximos()
     except ValueError as e:
         logger.critical(f"❌ Error en la estructura del Excel:")
         logger.critical(str(e))
@@ -190,121 +259,72 @@ def ejecutar_proceso():
         logger.info("✅ No hay vencimientos próximos ni vencidos para notificar. Proceso finalizado.")
         return
 
+    # Compilar las plantillas antes de empezar: un error acá invalidaría todos los mensajes
+    try:
+        renderizador = obtener_renderizador()
+    except ErrorPlantilla as e:
+        logger.critical(f"❌ Error en las plantillas de mensajes: {e}")
+        return
+
     # --- 2. Preparar datos para envío ---
-    datos_envio = data_handler.obtener_datos_para_envio(vencimientos_df)
+    # Los registros se generan a medida que se envían; los totales salen del DataFrame
+    total_a_enviar = len(vencimientos_df)
+    vencidas = int(vencimientos_df['esta_vencida'].sum())
+    proximas = total_a_enviar - vencidas
 
     # --- 3. Interacción con el Usuario ---
+    vaciar_logs()
     print("\n" + "="*60)
     print("           NOTIFICADOR DE VENCIMIENTOS VTV")
     print("="*60)
-    print(f"📊 Se encontraron {len(datos_envio)} vencimientos para notificar.")
-    
-    # Separar vencidas de próximas para mostrar estadísticas
-    vencidas = [d for d in datos_envio if d['esta_vencida']]
-    proximas = [d for d in datos_envio if not d['esta_vencida']]
+    print(f"📊 Se encontraron {total_a_enviar} vencimientos para notificar.")
     
-    if len(vencidas) > 0:
-        print(f"🔴 VTV VENCIDAS: {len(vencidas)}")
-    if len(proximas) > 0:
-        print(f"🟡 VTV PRÓXIMAS A VENCER: {len(proximas)}")
+    if vencidas > 0:
+        print(f"🔴 VTV VENCIDAS: {vencidas}")
+    if proximas > 0:
+        print(f"🟡 VTV PRÓXIMAS A VENCER: {proximas}")
     
-    print("🌐 A continuación se abrirá Google Chrome para conectar con WhatsApp Web.")
+    print("🌐 Google Chrome ya se está abriendo en segundo plano para conectar con WhatsApp Web.")
+    if len(PERFILES_CHROME) > 1:
+        print(f"📱 Se enviará en paralelo con {len(PERFILES_CHROME)} sesiones (una ventana por línea).")
     print()
     print("📋 INSTRUCCIONES:")
-    print("  1. Escanea el código QR con tu teléfono si es la primera vez.")
+    print("  1. Escanea el código QR con tu teléfono si es la primera vez (uno por sesión).")
     print("  2. Una vez iniciada la sesión, el proceso comenzará automáticamente.")
     print("  3. NO CIERRES el navegador hasta que el proceso finalice.")
     print("="*60)
 
     # Mostrar preview de los primeros contactos
     print("\n📋 PREVIEW DE CONTACTOS A NOTIFICAR:")
-    for i, dato in enumerate(datos_envio[:5]):
-        estado = "VENCIDA" if dato['esta_vencida'] else "Por vencer"
-        vehiculo_info = f"{dato['marca']} {dato['modelo']} - {dato['patente']}"
-        if dato['esta_vencida']:
-            print(f"  {i+1}. {vehiculo_info} ({estado} hace {dato['dias_vencidos']} días)")
+    for i, dato in enumerate(islice(data_handler.iterar_notificaciones(vencimientos_df, tamano_bloque=5), 5)):
+        estado = "VENCIDA" if dato.esta_vencida else "Por vencer"
+        vehiculo_info = f"{dato.marca} {dato.modelo} - {dato.patente}"
+        if dato.esta_vencida:
+            print(f"  {i+1}. {vehiculo_info} ({estado} hace {dato.dias_vencidos} días)")
         else:
-            print(f"  {i+1}. {vehiculo_info} ({estado} {dato['fecha_vencimiento']})")
-    if len(datos_envio) > 5:
-        print(f"  ... y {len(datos_envio) - 5} más")
+            print(f"  {i+1}. {vehiculo_info} ({estado} {dato.fecha_vencimiento})")
+    if total_a_enviar > 5:
+        print(f"  ... y {total_a_enviar - 5} más")
     
     # Mostrar configuración de mensajes
     print("\n📧 CONFIGURACIÓN DE MENSAJES:")
     mostrar_configuracion()
 
+    vaciar_logs()
     respuesta = input("\n¿Deseas continuar con el envío de notificaciones? (s/n): ")
     if respuesta.lower() not in ['s', 'si', 'sí', 'y', 'yes']:
         logger.info("❌ Proceso cancelado por el usuario.")
         return
 
-    # --- 4. Inicialización de WhatsApp ---
-    logger.info("🚀 Iniciando WhatsApp Web...")
-    notificador = WhatsAppNotifier()
-    if not notificador.inicializar_driver():
-        return
-    if not notificador.abrir_whatsapp():
-        notificador.cerrar()
+    # --- 4. Sesiones de WhatsApp (se abrieron en segundo plano durante la carga) ---
+    if not pool.iniciar():
+        logger.critical("❌ No se pudo iniciar ninguna sesión de WhatsApp Web.")
         return
 
     # --- 5. Proceso de Envío ---
-    enviados_count = 0
-    fallidos_list = []
-    total_a_enviar = len(datos_envio)
-
-    logger.info(f"📤 Comenzando envío de {total_a_enviar} mensajes...")
-
-    for i, dato in enumerate(datos_envio):
-        estado_log = "VENCIDA" if dato['esta_vencida'] else "Por vencer"
-        vehiculo_info = f"{dato['marca']} {dato['modelo']} - {dato['patente']}"
-        logger.info(f"📨 Procesando {i+1}/{total_a_enviar}: {vehiculo_info} ({dato['numero']}) - {estado_log} ---")
-
-        # Crear mensaje personalizado según el estado
-        mensaje = crear_mensaje_personalizado(dato)
-        
-        # Verificar que el mensaje se creó correctamente
-        if mensaje.startswith("Error"):
-            logger.error(f"❌ Error al crear mensaje para {vehiculo_info}: {mensaje}")
-            fallidos_list.append({
-                'Patente': dato['patente'],
-                'Marca': dato['marca'],
-                'Modelo': dato['modelo'],
-                'NumeroDeWhatsapp': dato['numero_original'],
-                'NumeroValidado': dato['numero'],
-                'FechaVencimientoVTV': dato['fecha_vencimiento'],
-                'EstadoVTV': estado_log,
-                'DiasVencidos': dato['dias_vencidos'] if dato['esta_vencida'] else 0,
-                'MotivoDelFallo': mensaje
-            })
-            continue
-        
-        # Log del tipo de mensaje que se enviará
-        tipo_mensaje = "VENCIDA" if dato['esta_vencida'] else "PRÓXIMA A VENCER"
-        logger.info(f"📝 Enviando mensaje de VTV {tipo_mensaje}")
-        logger.debug(f"Mensaje completo: {mensaje}")
-
-        # Enviar notificación
-        exito, razon_fallo = notificador.enviar_notificacion(dato['numero'], mensaje)
-
-        if exito:
-            enviados_count += 1
-            logger.info(f"✅ Mensaje enviado exitosamente a {vehiculo_info}")
-        else:
-            logger.error(f"❌ Fallo al enviar a {vehiculo_info}: {razon_fallo}")
-            fallidos_list.append({
-                'Patente': dato['patente'],
-                'Marca': dato['marca'],
-                'Modelo': dato['modelo'],
-                'NumeroDeWhatsapp': dato['numero_original'],
-                'NumeroValidado': dato['numero'],
-                'FechaVencimientoVTV': dato['fecha_vencimiento'],
-                'EstadoVTV': tipo_mensaje,
-                'DiasVencidos': dato['dias_vencidos'] if dato['esta_vencida'] else 0,
-                'MotivoDelFallo': razon_fallo
-            })
-
-        if i < total_a_enviar - 1:
-            logger.info(f"⏱️ Esperando {INTERVALO_MENSAJES} segundos para el próximo envío...")
-            time.sleep(INTERVALO_MENSAJES)
+    # Cada sesión envía su parte con su propio intervalo; los fallos se combinan en un solo reporte
+    notificaciones = data_handler.iterar_notificaciones(vencimientos_df)
+    enviados_count, fallidos_list = pool.enviar(renderizador.iterar(notificaciones), total_a_enviar)
 
     # --- 6. Finalización y Reporte ---
     logger.info("\n" + "="*60)
@@ -323,23 +343,22 @@ def ejecutar_proceso():
     # Generar reporte de fallidos
     data_handler.crear_reporte_fallidos(fallidos_list, REPORTE_FALLIDOS_EXCEL)
 
-    # Cerrar navegador
-    notificador.cerrar()
     logger.info("🎉 El script ha finalizado. Revisa el log y el reporte de fallidos si es necesario.")
 
     # Mostrar resumen final
+    vaciar_logs()
     print("\n" + "="*60)
     print("           RESUMEN FINAL")
     print("="*60)
     print(f"✅ Enviados exitosamente: {enviados_count}/{total_a_enviar}")
     print(f"❌ Fallidos: {len(fallidos_list)}/{total_a_enviar}")
 
-    if len(vencidas) > 0 or len(proximas) > 0:
+    if vencidas > 0 or proximas > 0:
         print("\n📊 DESGLOSE POR TIPO:")
-        if len(vencidas) > 0:
-            print(f"🔴 VTV Vencidas notificadas: {len(vencidas)}")
-        if len(proximas) > 0:
-            print(f"🟡 VTV Próximas notificadas: {len(proximas)}")
+        if vencidas > 0:
+            print(f"🔴 VTV Vencidas notificadas: {vencidas}")
+        if proximas > 0:
+            print(f"🟡 VTV Próximas notificadas: {proximas}")
 
     if len(fallidos_list) > 0:
         print(f"📄 Reporte de fallidos: {REPORTE_FALLIDOS_EXCEL}")
@@ -354,4 +373,5 @@ if __name__ == "__main__":
     except Exception as e:
         logger.critical(f"💥 Ha ocurrido un error crítico no controlado: {e}", exc_info=True)
     finally:
+        vaciar_logs()
         input("\n🔚 Presiona Enter para salir...")  # Evitar que se cierre inmediatamente
\ No newline at end of file
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Pipeline Asíncrono
+============================
+
+Ejecuta la campaña como un pipeline de asyncio con etapas solapadas:
+
+    carga + filtro  →  armado de mensajes  →  envío (una tarea por sesión)  →  reporte
+
+Entre etapa y etapa hay colas acotadas: si WhatsApp Web va más lento que la
+lectura del Excel, las colas se llenan y las etapas anteriores esperan, así
+la memoria queda acotada por el tamaño de las colas y no por el de la
+campaña. El trabajo bloqueante (pandas, armado de mensajes, Selenium) corre
+en hilos; el bucle de eventos solo mueve los mensajes de una cola a otra.
+
+Los navegadores se abren mientras se leen los primeros bloques, y mientras
+una sesión espera a WhatsApp Web ya se están armando los mensajes
+siguientes y escribiendo el reporte de los anteriores.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from openpyxl import Workbook
+
+from pool_envio import fila_fallido
+from config import TAMANO_CHUNK, TAMANO_COLA_PIPELINE, REPORTE_FALLIDOS_EXCEL
+
+logger = logging.getLogger(__name__)
+
+_FIN = object()  # Marca de fin de una cola
+
+MOTIVO_INTERRUMPIDO = "Envío interrumpido antes de procesarse."
+MOTIVO_MENSAJE_VACIO = "Error: Mensaje vacío generado"
+
+
+class ResumenCampana(NamedTuple):
+    """Totales de una campaña ejecutada con el pipeline."""
+    notificaciones: int
+    enviados: int
+    fallidos: int
+    vencidas: int
+
+
+class ReporteFallidosIncremental:
+    """
+    Reporte de fallidos que se escribe fila a fila a medida que llegan.
+
+    Usa un libro de openpyxl en modo write_only, que vuelca las filas a disco
+    en lugar de conservarlas en memoria. El libro se crea con el primer fallo,
+    así que si no hay fallos no se genera archivo (igual que crear_reporte_fallidos).
+    """
+
+    def __init__(self, archivo_salida: str = REPORTE_FALLIDOS_EXCEL):
+        self.archivo_salida = archivo_salida
+        self.filas = 0
+        self._libro = None
+        self._hoja = None
+
+    def agregar(self, fila: dict):
+        if self._libro is None:
+            self._libro = Workbook(write_only=True)
+            self._hoja = self._libro.create_sheet('Sheet1')
+            self._hoja.append(list(fila))
+        self._hoja.append(list(fila.values()))
+        self.filas += 1
+
+    def guardar(self):
+        """Escribe el archivo (si hubo fallos). Un libro write_only se puede guardar una sola vez."""
+        if self._libro is None:
+            logger.info("✅ No hubo mensajes fallidos, no se generará reporte.")
+            return
+        try:
+            logger.info(f"📊 Generando reporte de envíos fallidos en '{self.archivo_salida}' ({self.filas} filas)...")
+            self._libro.save(self.archivo_salida)
+            logger.info("✅ Reporte de fallidos generado exitosamente.")
+        except Exception as e:
+            logger.error(f"❌ No se pudo generar el reporte de fallidos: {e}")
+        finally:
+            self._libro = None
+
+
+class PipelineCampana:
+    """
+    Campaña completa (carga, filtro, armado, envío y reporte) con etapas solapadas.
+
+    Uso:
+        pipeline = PipelineCampana(data_handler, renderizador, PoolEnvio())
+        resumen = asyncio.run(pipeline.ejecutar())
+    """
+
+    def __init__(self, data_handler, renderizador, pool, tamano_cola: int = TAMANO_COLA_PIPELINE,
+                 tamano_chunk: int = TAMANO_CHUNK, archivo_reporte: str = REPORTE_FALLIDOS_EXCEL):
+        self.data_handler = data_handler
+        self.renderizador = renderizador
+        self.pool = pool
+        self.tamano_cola = tamano_cola
+        self.tamano_chunk = tamano_chunk
+        self.reporte = ReporteFallidosIncremental(archivo_reporte)
+        self.notificaciones = 0
+        self.enviados = 0
+        self.fallidos = 0
+        self.vencidas = 0
+        # Mensajes del bloque en armado que todavía no pasaron a una cola: si la campaña se
+        # interrumpe mientras el armado espera lugar, se reportan como no enviados
+        self._pendientes_armado = deque()
+        self._envios_en_curso = {}  # Future del envío -> (posición, dato)
+
+    # --- Etapas ---
+
+    async def _cargar(self, cola_bloques: asyncio.Queue, ejecutor):
+        """Lee y filtra el archivo de a un bloque; espera si el armado todavía no consumió los anteriores."""
+        loop = asyncio.get_running_loop()
+        bloques = self.data_handler.iterar_vencimientos_por_bloques(self.tamano_chunk)
+        try:
+            while True:
+                bloque = await loop.run_in_executor(ejecutor, next, bloques, _FIN)
+                if bloque is _FIN:
+                    break
+                await cola_bloques.put(bloque)
+        finally:
+            # Cerrar el generador en su hilo: nunca se reanuda desde dos hilos a la vez
+            await asyncio.shield(loop.run_in_executor(ejecutor, bloques.close))
+        await cola_bloques.put(_FIN)
+
+    def _armar_mensajes(self, bloque) -> list:
+        """Arma los mensajes de un bloque (se ejecuta en un hilo)."""
+        return list(self.renderizador.iterar(self.data_handler.iterar_notificaciones(bloque)))
+
+    async def _armar(self, cola_bloques: asyncio.Queue, colas_sesion: list,
+                     cola_resultados: asyncio.Queue, ejecutor):
+        """Arma los mensajes de cada bloque y los reparte en la cola de la sesión que corresponde."""
+        loop = asyncio.get_running_loop()
+        while True:
+            bloque = await cola_bloques.get()
+            if bloque is _FIN:
+                break
+            mensajes = await loop.run_in_executor(ejecutor, self._armar_mensajes, bloque)
+            for dato, mensaje in mensajes:
+                self._pendientes_armado.append((self.notificaciones, dato, mensaje))
+                self.notificaciones += 1
+                self.vencidas += bool(dato.esta_vencida)
+
+            while self._pendientes_armado:
+                posicion, dato, mensaje = self._pendientes_armado[0]
+                if not mensaje.strip():
+                    logger.error(f"❌ Error al crear mensaje para {dato.marca} {dato.modelo} - {dato.patente}: "
+                                 f"{MOTIVO_MENSAJE_VACIO}")
+                    await cola_resultados.put((posicion, dato, False, MOTIVO_MENSAJE_VACIO))
+                else:
+                    # Con la cola de la sesión llena, el armado (y con él la carga) espera
+                    await colas_sesion[self.pool.asignar(dato.numero)].put((posicion, dato, mensaje))
+                # Sale de pendientes recién cuando está en una cola
+                self._pendientes_armado.popleft()
+        for cola in colas_sesion:
+            await cola.put(_FIN)
+        await cola_resultados.put(_FIN)
+
+    async def _enviar(self, indice: int, notificador, cola: asyncio.Queue,
+                      cola_resultados: asyncio.Queue, ejecutor):
+        """Envía los mensajes de una sesión, con el intervalo entre sus propios envíos."""
+        loop = asyncio.get_running_loop()
+        etiqueta = f"[sesión {indice + 1}]"
+        intentos = 0
+        while True:
+            item = await cola.get()
+            if item is _FIN:
+                break
+            posicion, dato, mensaje = item
+
+            if intentos:
+                await asyncio.sleep(self.pool.intervalo)
+            intentos += 1
+
+            vehiculo_info = f"{dato.marca} {dato.modelo} - {dato.patente}"
+            tipo_mensaje = "VENCIDA" if dato.esta_vencida else "PRÓXIMA A VENCER"
+            logger.info(f"📨 {etiqueta} Procesando {posicion + 1}: {vehiculo_info} ({dato.numero}) - {tipo_mensaje} ---")
+            logger.debug(f"Mensaje completo: {mensaje}")
+
+            envio = loop.run_in_executor(ejecutor, notificador.enviar_notificacion, dato.numero, mensaje)
+            self._envios_en_curso[envio] = (posicion, dato)
+            try:
+                # Con shield, si la campaña se interrumpe el mensaje en curso termina igual
+                # y su resultado lo registra _terminar_envios_en_curso
+                exito, razon_fallo = await asyncio.shield(envio)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                exito, razon_fallo = False, f"Error inesperado al enviar: {e}"
+            del self._envios_en_curso[envio]
+
+            if exito:
+                logger.info(f"✅ {etiqueta} Mensaje enviado exitosamente a {vehiculo_info}")
+            else:
+                logger.error(f"❌ {etiqueta} Fallo al enviar a {vehiculo_info}: {razon_fallo}")
+            await cola_resultados.put((posicion, dato, exito, razon_fallo))
+        await cola_resultados.put(_FIN)
+
+    async def _reportar(self, cola_resultados: asyncio.Queue, productores: int):
+        """Cuenta los resultados y agrega los fallos al reporte a medida que llegan."""
+        while productores:
+            resultado = await cola_resultados.get()
+            if resultado is _FIN:
+                productores -= 1
+                continue
+            self._registrar_resultado(resultado)
+
+    def _registrar_resultado(self, resultado: tuple):
+        _, dato, exito, razon_fallo = resultado
+        if exito:
+            self.enviados += 1
+        else:
+            self.fallidos += 1
+            self.reporte.agregar(fila_fallido(dato, razon_fallo))
+
+    async def _terminar_envios_en_curso(self):
+        """Tras una interrupción: espera los mensajes que se estaban enviando y registra su resultado."""
+        for envio, (posicion, dato) in list(self._envios_en_curso.items()):
+            try:
+                exito, razon_fallo = await envio
+            except Exception as e:
+                exito, razon_fallo = False, f"Error inesperado al enviar: {e}"
+            self._registrar_resultado((posicion, dato, exito, razon_fallo))
+        self._envios_en_curso.clear()
+
+    def _descartar_pendientes(self, colas_sesion: list, cola_resultados: asyncio.Queue):
+        """
+        Tras una interrupción: vuelca los resultados ya recibidos y marca como no enviado
+        lo que quedó en cola o armado sin llegar a una cola.
+        """
+        while not cola_resultados.empty():
+            resultado = cola_resultados.get_nowait()
+            if resultado is not _FIN:
+                self._registrar_resultado(resultado)
+        for cola in colas_sesion:
+            while not cola.empty():
+                item = cola.get_nowait()
+                if item is not _FIN:
+                    posicion, dato, _ = item
+                    self._registrar_resultado((posicion, dato, False, MOTIVO_INTERRUMPIDO))
+        while self._pendientes_armado:
+            posicion, dato, mensaje = self._pendientes_armado.popleft()
+            motivo = MOTIVO_INTERRUMPIDO if mensaje.strip() else MOTIVO_MENSAJE_VACIO
+            self._registrar_resultado((posicion, dato, False, motivo))
+
+    # --- Ejecución ---
+
+    async def ejecutar(self) -> ResumenCampana | None:
+        """
+        Ejecuta la campaña completa.
+
+        Los navegadores se inician en paralelo con la lectura del archivo. El
+        reporte de fallidos se guarda siempre, también si la campaña se interrumpe.
+
+        Returns:
+            ResumenCampana | None: Totales de la campaña, o None si no se pudo iniciar ninguna sesión.
+
+        Raises:
+            ValueError: Si el archivo no tiene las columnas requeridas.
+        """
+        loop = asyncio.get_running_loop()
+        ejecutor_carga = ThreadPoolExecutor(max_workers=1, thread_name_prefix='carga')
+        ejecutor_armado = ThreadPoolExecutor(max_workers=1, thread_name_prefix='armado')
+        ejecutor_envio = None
+
+        cola_bloques = asyncio.Queue(maxsize=2)
+        cola_resultados = asyncio.Queue(maxsize=self.tamano_cola)
+        colas_sesion = []
+        tareas = []
+
+        logger.info(f"⏳ Esperando {len(self.pool.perfiles)} sesión(es) de WhatsApp Web mientras se leen los datos...")
+        # En segundo plano dentro del pool, para que pool.cerrar() pueda cancelar el inicio
+        self.pool.iniciar_en_segundo_plano()
+        inicio_sesiones = loop.run_in_executor(None, self.pool.iniciar)
+        carga = asyncio.create_task(self._cargar(cola_bloques, ejecutor_carga))
+        tareas.append(carga)
+        try:
+            # Si la carga falla (por ejemplo, faltan columnas) no hace falta esperar el login
+            await asyncio.wait({inicio_sesiones, carga}, return_when=asyncio.FIRST_COMPLETED)
+            if carga.done() and carga.exception():
+                raise carga.exception()
+            if not await inicio_sesiones:
+                logger.critical("❌ No se pudo iniciar ninguna sesión de WhatsApp Web.")
+                return None
+
+            notificadores = self.pool.notificadores
+            ejecutor_envio = ThreadPoolExecutor(max_workers=len(notificadores), thread_name_prefix='envio')
+            colas_sesion = [asyncio.Queue(maxsize=self.tamano_cola) for _ in notificadores]
+
+            logger.info(f"📤 Comenzando envío con {len(notificadores)} sesión(es)...")
+            tareas.append(asyncio.create_task(
+                self._armar(cola_bloques, colas_sesion, cola_resultados, ejecutor_armado)
+            ))
+            tareas.extend(
+                asyncio.create_task(self._enviar(i, notificador, cola, cola_resultados, ejecutor_envio))
+                for i, (notificador, cola) in enumerate(zip(notificadores, colas_sesion))
+            )
+            tareas.append(asyncio.create_task(self._reportar(cola_resultados, len(notificadores) + 1)))
+
+            await asyncio.gather(*tareas)
+            return ResumenCampana(self.notificaciones, self.enviados, self.fallidos, self.vencidas)
+
+        finally:
+            for tarea in tareas:
+                tarea.cancel()
+            await asyncio.gather(*tareas, return_exceptions=True)
+            await self._terminar_envios_en_curso()
+            self._descartar_pendientes(colas_sesion, cola_resultados)
+
+            # Cerrar primero: si las sesiones todavía están iniciando, cerrar cancela ese inicio
+            await loop.run_in_executor(None, self.pool.cerrar)
+            await asyncio.gather(inicio_sesiones, return_exceptions=True)
+            await loop.run_in_executor(None, self.reporte.guardar)
+
+            for ejecutor in (ejecutor_carga, ejecutor_armado, ejecutor_envio):
+                if ejecutor is not None:
+                    ejecutor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Plantillas de Mensajes
+================================
+
+Compila las plantillas de mensajes una sola vez: las separa con
+string.Formatter().parse en tramos de texto fijo (ya limpiados para
+ChromeDriver) y campos, valida los campos antes de empezar la campaña y
+arma los mensajes de a bloques sobre las columnas de datos, de modo que el
+ciclo de envío solo tiene que tomar el mensaje ya armado.
+"""
+
+import logging
+from itertools import islice
+from string import Formatter
+
+from utils import limpiar_texto_unicode
+
+logger = logging.getLogger(__name__)
+
+# Campos que toda plantilla debería usar y los que se pueden usar
+CAMPOS_REQUERIDOS = ['patente', 'marca', 'modelo', 'fecha_revision', 'fecha_vencimiento']
+CAMPOS_REQUERIDOS_VENCIDO = CAMPOS_REQUERIDOS + ['dias_vencidos']
+CAMPOS_DISPONIBLES = set(CAMPOS_REQUERIDOS_VENCIDO) | {'numero'}
+
+_FORMATEADOR = Formatter()
+
+
+class ErrorPlantilla(ValueError):
+    """La plantilla tiene una sintaxis inválida o usa campos que no existen."""
+
+
+class PlantillaCompilada:
+    """
+    Plantilla parseada una única vez.
+
+    Attributes:
+        literales (list[str]): Tramos de texto fijo, ya limpiados si `limpiar` es True.
+        campos (list[tuple]): (nombre, conversión, formato) de cada campo, en orden.
+    """
+
+    def __init__(self, texto: str, nombre: str = 'plantilla', limpiar: bool = True):
+        if not isinstance(texto, str):
+            raise ErrorPlantilla(f"{nombre} no es texto (tipo {type(texto).__name__})")
+
+        self.nombre = nombre
+        self.texto = texto
+        self._limpiar = limpiar_texto_unicode if limpiar else str
+        self.literales = []
+        self.campos = []
+
+        try:
+            segmentos = list(_FORMATEADOR.parse(texto))
+        except ValueError as e:
+            raise ErrorPlantilla(f"{nombre} tiene una sintaxis inválida: {e}") from e
+
+        literal_actual = []
+        for literal, campo, formato, conversion in segmentos:
+            literal_actual.append(literal)
+            if campo is None:
+                continue
+            if campo not in CAMPOS_DISPONIBLES:
+                raise ErrorPlantilla(
+                    f"{nombre} usa el campo '{{{campo}}}', que no existe. "
+                    f"Campos disponibles: {', '.join(sorted(CAMPOS_DISPONIBLES))}"
+                )
+            self.literales.append(self._limpiar(''.join(literal_actual)))
+            self.campos.append((campo, conversion, formato or ''))
+            literal_actual = []
+        self.literales.append(self._limpiar(''.join(literal_actual)))
+
+    @property
+    def nombres_campos(self) -> set:
+        return {campo for campo, _, _ in self.campos}
+
+    def campos_faltantes(self, requeridos: list) -> list:
+        """Devuelve los campos requeridos que la plantilla no usa."""
+        return [campo for campo in requeridos if campo not in self.nombres_campos]
+
+    def _formatear_valor(self, valor, conversion, formato) -> str:
+        if conversion:
+            valor = _FORMATEADOR.convert_field(valor, conversion)
+        return self._limpiar(_FORMATEADOR.format_field(valor, formato))
+
+    def renderizar_lote(self, columnas: dict, cantidad: int = None) -> list:
+        """
+        Arma los mensajes de un lote a partir de columnas de valores.
+
+        Cada valor distinto de cada campo se formatea y limpia una sola vez.
+
+        Args:
+            columnas (dict): {campo: lista de valores}, todas del mismo largo.
+            cantidad (int): Cantidad de mensajes; se deduce de las columnas si no se indica.
+
+        Returns:
+            list[str]: Un mensaje por posición.
+        """
+        if cantidad is None:
+            cantidad = len(next(iter(columnas.values()))) if columnas else 1
+        partes = [[self.literales[0]] * cantidad]
+        for (campo, conversion, formato), literal in zip(self.campos, self.literales[1:]):
+            cache = {}
+            textos = []
+            for valor in columnas[campo]:
+                try:
+                    texto = cache[valor]
+                except KeyError:
+                    texto = cache[valor] = self._formatear_valor(valor, conversion, formato)
+                except TypeError:
+                    # Valores no hasheables: formatear sin caché
+                    texto = self._formatear_valor(valor, conversion, formato)
+                textos.append(texto + literal)
+            partes.append(textos)
+        return [''.join(mensaje) for mensaje in zip(*partes)]
+
+    def renderizar(self, **valores) -> str:
+        """Arma un único mensaje."""
+        return self.renderizar_lote({campo: [valor] for campo, valor in valores.items()})[0]
+
+
+class RenderizadorMensajes:
+    """
+    Elige la plantilla según el estado de la VTV y arma los mensajes por bloques.
+
+    Con `limpiar` en False los mensajes conservan emojis y acentos tal cual
+    (para cuando el notificador inserta el texto sin tipearlo).
+    """
+
+    def __init__(self, plantilla: str, plantilla_vencido: str, limpiar: bool = True):
+        self.plantilla = PlantillaCompilada(plantilla, 'MENSAJE_TEMPLATE', limpiar)
+        self.plantilla_vencido = PlantillaCompilada(plantilla_vencido, 'MENSAJE_VENCIDO_TEMPLATE', limpiar)
+
+    def renderizar_lote(self, notificaciones: list) -> list:
+        """Arma los mensajes de una lista de Notificacion, en el mismo orden."""
+        if not notificaciones:
+            return []
+
+        mensajes = [None] * len(notificaciones)
+        for vencida, plantilla in ((True, self.plantilla_vencido), (False, self.plantilla)):
+            posiciones = [i for i, n in enumerate(notificaciones) if n.esta_vencida == vencida]
+            if not posiciones:
+                continue
+            columnas = {
+                campo: [getattr(notificaciones[i], campo) for i in posiciones]
+                for campo in plantilla.nombres_campos
+            }
+            for posicion, mensaje in zip(posiciones, plantilla.renderizar_lote(columnas, len(posiciones))):
+                mensajes[posicion] = mensaje
+        return mensajes
+
+    def renderizar(self, notificacion) -> str:
+        """Arma el mensaje de una sola notificación."""
+        return self.renderizar_lote([notificacion])[0]
+
+    def iterar(self, notificaciones, tamano_bloque: int = 500):
+        """
+        Recorre un iterable de Notificacion y produce (notificacion, mensaje).
+
+        Los mensajes se arman de a bloques, sin materializar la campaña entera.
+        """
+        notificaciones = iter(notificaciones)
+        while True:
+            bloque = list(islice(notificaciones, tamano_bloque))
+            if not bloque:
+                return
+            yield from zip(bloque, self.renderizar_lote(bloque))
+
+
+def validar_plantilla(texto: str, nombre: str, requeridos: list) -> list:
+    """
+    Valida una plantilla sin lanzar excepciones.
+
+    Returns:
+        list[str]: Problemas encontrados (vacía si la plantilla es válida).
+    """
+    try:
+        plantilla = PlantillaCompilada(texto, nombre, limpiar=False)
+    except ErrorPlantilla as e:
+        return [str(e)]
+    return [f"Campo '{campo}' no encontrado en {nombre}" for campo in plantilla.campos_faltantes(requeridos)]
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Envío en Paralelo
+===========================
+
+Reparte la campaña entre varias sesiones de WhatsApp Web, una por perfil de
+Chrome (PERFILES_CHROME), cada una con su propio navegador, su propia cola y
+su propio intervalo entre mensajes. Cada número se asigna siempre a la misma
+sesión (crc32 del número), así un cliente recibe los recordatorios desde la
+misma línea en todas las campañas. Los fallos de todas las sesiones se juntan
+en un único reporte, en el orden original de la campaña.
+
+Con un solo perfil el comportamiento es el de siempre: un navegador que
+envía los mensajes de a uno.
+
+Las sesiones se pueden abrir en segundo plano (iniciar_en_segundo_plano)
+mientras se cargan los datos y el operador revisa la vista previa; si el
+operador cancela, cerrar() corta el login en curso y cierra los navegadores.
+Las sesiones cuyo código QR no se escaneó a tiempo mientras tanto reciben
+en iniciar() otra espera completa.
+"""
+
+import queue
+import logging
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+from whatsapp_notifier import WhatsAppNotifier
+from config import PERFILES_CHROME, INTERVALO_MENSAJES
+
+logger = logging.getLogger(__name__)
+
+_FIN = object()  # Marca de fin de la cola de una sesión
+
+
+class ResultadoEnvio(NamedTuple):
+    """Resultado combinado de todas las sesiones."""
+    enviados: int
+    fallidos: list
+
+
+def fila_fallido(dato, motivo: str) -> dict:
+    """Arma la fila del reporte de fallidos para una notificación."""
+    return {
+        'Patente': dato.patente,
+        'Marca': dato.marca,
+        'Modelo': dato.modelo,
+        'NumeroDeWhatsapp': dato.numero_original,
+        'NumeroValidado': dato.numero,
+        'FechaVencimientoVTV': dato.fecha_vencimiento,
+        'EstadoVTV': "VENCIDA" if dato.esta_vencida else "PRÓXIMA A VENCER",
+        'DiasVencidos': dato.dias_vencidos,
+        'MotivoDelFallo': motivo,
+    }
+
+
+class SesionEnvio(threading.Thread):
+    """Una línea de WhatsApp: consume su cola y envía con su propio intervalo."""
+
+    def __init__(self, indice: int, notificador, intervalo: int, total: int,
+                 detener: threading.Event, tamano_cola: int):
+        super().__init__(name=f"sesion-{indice + 1}", daemon=True)
+        self.indice = indice
+        self.notificador = notificador
+        self.intervalo = intervalo
+        self.total = total
+        self.cola = queue.Queue(maxsize=tamano_cola)
+        self._detener = detener
+        self.enviados = 0
+        self.fallidos = []  # (posición en la campaña, fila del reporte)
+
+    @property
+    def etiqueta(self) -> str:
+        return f"[sesión {self.indice + 1}]"
+
+    def run(self):
+        intentos = 0
+        while True:
+            item = self.cola.get()
+            if item is _FIN:
+                return
+            posicion, dato, mensaje = item
+            if self._detener.is_set():
+                self.fallidos.append((posicion, fila_fallido(dato, "Envío interrumpido antes de procesarse.")))
+                continue
+
+            # El intervalo se respeta entre los mensajes de esta misma línea
+            if intentos and self._detener.wait(self.intervalo):
+                self.fallidos.append((posicion, fila_fallido(dato, "Envío interrumpido antes de procesarse.")))
+                continue
+            intentos += 1
+
+            vehiculo_info = f"{dato.marca} {dato.modelo} - {dato.patente}"
+            tipo_mensaje = "VENCIDA" if dato.esta_vencida else "PRÓXIMA A VENCER"
+            logger.info(f"📨 {self.etiqueta} Procesando {posicion + 1}/{self.total}: {vehiculo_info} "
+                        f"({dato.numero}) - {tipo_mensaje} ---")
+            logger.debug(f"Mensaje completo: {mensaje}")
+
+            try:
+                exito, razon_fallo = self.notificador.enviar_notificacion(dato.numero, mensaje)
+            except Exception as e:
+                exito, razon_fallo = False, f"Error inesperado al enviar: {e}"
+
+            if exito:
+                self.enviados += 1
+                logger.info(f"✅ {self.etiqueta} Mensaje enviado exitosamente a {vehiculo_info}")
+            else:
+                logger.error(f"❌ {self.etiqueta} Fallo al enviar a {vehiculo_info}: {razon_fallo}")
+                self.fallidos.append((posicion, fila_fallido(dato, razon_fallo)))
+
+
+class PoolEnvio:
+    """
+    Conjunto de sesiones de WhatsApp Web que envían en paralelo.
+
+    Uso:
+        pool = PoolEnvio()
+        pool.iniciar_en_segundo_plano()  # opcional: abre los navegadores mientras se hace otra cosa
+        if pool.iniciar():
+            resultado = pool.enviar(renderizador.iterar(notificaciones), total)
+        pool.cerrar()
+    """
+
+    def __init__(self, perfiles: list = None, intervalo: int = INTERVALO_MENSAJES,
+                 crear_notificador=WhatsAppNotifier, tamano_cola: int = 50):
+        self.perfiles = list(perfiles or PERFILES_CHROME)
+        self.intervalo = intervalo
+        self.tamano_cola = tamano_cola
+        self._crear_notificador = crear_notificador
+        self.notificadores = []  # Sesiones iniciadas correctamente, en el orden de los perfiles
+        self._detener = threading.Event()
+        self._lock = threading.Lock()
+        self._en_inicio = []  # Notificadores que todavía esperan el login
+        self._sin_login = {}  # Perfil -> notificador cuyo login venció en segundo plano
+        self._inicio = None  # Future del inicio en segundo plano
+
+    def _iniciar_sesion(self, perfil: str, reintentable: bool = False):
+        """
+        Abre el navegador de un perfil y espera el login.
+
+        Con `reintentable` (inicio en segundo plano), si el login vence el navegador
+        queda abierto en _sin_login para que iniciar() le dé otra ventana completa
+        del código QR, ya con el operador atento.
+        """
+        notificador = self._crear_notificador(perfil_chrome=perfil)
+        with self._lock:
+            self._en_inicio.append(notificador)
+        try:
+            if self._detener.is_set() or not notificador.inicializar_driver():
+                return None
+            if not self._detener.is_set() and notificador.abrir_whatsapp():
+                return notificador
+            if reintentable and not self._detener.is_set():
+                with self._lock:
+                    self._sin_login[perfil] = notificador
+                return None
+            notificador.cerrar()
+            return None
+        finally:
+            with self._lock:
+                self._en_inicio.remove(notificador)
+
+    def _abrir_sesiones(self, reintentable: bool = False) -> int:
+        with ThreadPoolExecutor(max_workers=len(self.perfiles), thread_name_prefix='inicio') as ejecutor:
+            sesiones = list(ejecutor.map(lambda perfil: self._iniciar_sesion(perfil, reintentable), self.perfiles))
+        self.notificadores = [n for n in sesiones if n is not None]
+
+        if self._detener.is_set():
+            # Inicio cancelado con cerrar(): las sesiones que llegaron a abrirse se cierran igual
+            return 0
+        if reintentable:
+            if self._sin_login:
+                logger.warning(f"⏳ {len(self._sin_login)} sesión(es) sin iniciar todavía; "
+                               "se esperará el código QR antes de comenzar el envío.")
+            # El resumen lo hace iniciar(), después de reintentar esas sesiones
+            return len(self.notificadores)
+        return self._resumir_sesiones()
+
+    def _resumir_sesiones(self) -> int:
+        """Informa qué perfiles no pudieron iniciar y devuelve la cantidad de sesiones activas."""
+        activos = {notificador.perfil_chrome for notificador in self.notificadores}
+        for perfil in self.perfiles:
+            if perfil not in activos:
+                logger.error(f"❌ No se pudo iniciar la sesión del perfil {perfil}")
+
+        if self.notificadores and len(self.notificadores) < len(self.perfiles):
+            logger.warning(f"⚠️ Solo {len(self.notificadores)} de {len(self.perfiles)} sesiones están activas; "
+                           "los números se reparten entre las disponibles.")
+        return len(self.notificadores)
+
+    def _reintentar_sesion(self, notificador):
+        try:
+            if not self._detener.is_set() and notificador.abrir_whatsapp():
+                return notificador
+            notificador.cerrar()
+            return None
+        finally:
+            with self._lock:
+                self._en_inicio.remove(notificador)
+
+    def _reintentar_login(self):
+        """Vuelve a esperar el login, con la ventana completa del código QR, de las sesiones que vencieron en segundo plano."""
+        with self._lock:
+            pendientes = list(self._sin_login.values())
+            self._sin_login.clear()
+            self._en_inicio.extend(pendientes)  # Así cerrar() también puede cortar esta espera
+        logger.warning(f"📱 {len(pendientes)} sesión(es) de WhatsApp Web sin iniciar: "
+                       "escaneá el código QR en la ventana de cada una.")
+        with ThreadPoolExecutor(max_workers=len(pendientes), thread_name_prefix='login') as ejecutor:
+            listos = [n for n in ejecutor.map(self._reintentar_sesion, pendientes) if n is not None]
+
+        orden = {perfil: i for i, perfil in enumerate(self.perfiles)}
+        with self._lock:
+            cancelado = self._detener.is_set()
+            if not cancelado:
+                # Mismo orden que los perfiles: la asignación de números no depende de quién inició primero
+                self.notificadores = sorted(self.notificadores + listos, key=lambda n: orden[n.perfil_chrome])
+        if cancelado:
+            for notificador in listos:
+                self._cerrar_notificador(notificador)
+
+    def iniciar_en_segundo_plano(self):
+        """
+        Empieza a abrir las sesiones en otro hilo y vuelve enseguida.
+
+        Después, iniciar() espera a que termine ese mismo inicio en lugar de abrir
+        sesiones nuevas. Un perfil sin sesión vinculada puede agotar la espera del
+        código QR mientras se cargan los datos: su navegador queda abierto e
+        iniciar() le vuelve a dar la espera completa.
+        """
+        if self._inicio is None:
+            ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='precalentado')
+            self._inicio = ejecutor.submit(self._abrir_sesiones, True)
+            ejecutor.shutdown(wait=False)
+
+    def iniciar(self) -> int:
+        """
+        Abre todas las sesiones a la vez y espera a que inicien sesión.
+
+        Si ya se inició en segundo plano, espera a que ese inicio termine y
+        reintenta el login de las sesiones que no llegaron a iniciarlo.
+
+        Returns:
+            int: Cantidad de sesiones listas para enviar.
+        """
+        if self._inicio is None:
+            return self._abrir_sesiones()
+        self._inicio.result()
+        if self._sin_login and not self._detener.is_set():
+            self._reintentar_login()
+        if self._detener.is_set():
+            return 0
+        return self._resumir_sesiones()
+
+    def asignar(self, numero: str) -> int:
+        """Índice de la sesión que envía a un número (siempre la misma para un número dado)."""
+        return zlib.crc32(str(numero).encode('utf-8')) % len(self.notificadores)
+
+    def enviar(self, pares, total: int) -> ResultadoEnvio:
+        """
+        Reparte los mensajes entre las sesiones y espera a que terminen.
+
+        Args:
+            pares: Iterable de (Notificacion, mensaje), por ejemplo RenderizadorMensajes.iterar.
+            total (int): Cantidad de mensajes, para los logs de progreso.
+
+        Returns:
+            ResultadoEnvio: Enviados y filas del reporte de fallidos de todas las sesiones.
+        """
+        sesiones = [
+            SesionEnvio(i, notificador, self.intervalo, total, self._detener, self.tamano_cola)
+            for i, notificador in enumerate(self.notificadores)
+        ]
+        for sesion in sesiones:
+            sesion.start()
+
+        logger.info(f"📤 Comenzando envío de {total} mensajes con {len(sesiones)} sesión(es)...")
+        fallidos = []
+        try:
+            for posicion, (dato, mensaje) in enumerate(pares):
+                # El mensaje ya viene armado por el renderizador; solo verificar que no esté vacío
+                if not mensaje.strip():
+                    motivo = "Error: Mensaje vacío generado"
+                    logger.error(f"❌ Error al crear mensaje para {dato.marca} {dato.modelo} - {dato.patente}: {motivo}")
+                    fallidos.append((posicion, fila_fallido(dato, motivo)))
+                    continue
+                sesiones[self.asignar(dato.numero)].cola.put((posicion, dato, mensaje))
+        except BaseException:
+            # Interrupción: cada sesión termina el mensaje en curso y marca el resto como no enviado
+            self._detener.set()
+            raise
+        finally:
+            for sesion in sesiones:
+                sesion.cola.put(_FIN)
+            for sesion in sesiones:
+                sesion.join()
+
+        enviados = 0
+        for sesion in sesiones:
+            enviados += sesion.enviados
+            fallidos.extend(sesion.fallidos)
+            logger.info(f"📊 {sesion.etiqueta} Enviados: {sesion.enviados}, fallidos: {len(sesion.fallidos)}")
+
+        fallidos.sort(key=lambda item: item[0])
+        return ResultadoEnvio(enviados, [fila for _, fila in fallidos])
+
+    @staticmethod
+    def _cerrar_notificador(notificador):
+        try:
+            notificador.cerrar()
+        except Exception as e:
+            logger.warning(f"No se pudo cerrar una sesión de WhatsApp: {e}")
+
+    def cerrar(self):
+        """Cierra los navegadores de todas las sesiones, cancelando el inicio en curso si lo hay."""
+        self._detener.set()
+        with self._lock:
+            en_inicio = self._en_inicio + list(self._sin_login.values())
+            self._sin_login.clear()
+        if en_inicio or (self._inicio is not None and not self._inicio.done()):
+            logger.info("⏹️ Cancelando el inicio de las sesiones de WhatsApp Web...")
+        # Cerrar el navegador corta la espera del login de esa sesión
+        for notificador in en_inicio:
+            self._cerrar_notificador(notificador)
+        if self._inicio is not None:
+            wait([self._inicio])
+        with self._lock:
+            pendientes = list(self._sin_login.values()) + self.notificadores
+            self._sin_login.clear()
+        for notificador in pendientes:
+            self._cerrar_notificador(notificador)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Registro de Selectores
+================================
+
+Los nombres de clase de WhatsApp Web cambian seguido, así que cada elemento
+de la página (caja de búsqueda, resultados, encabezado del chat, botones de
+los modales) tiene una lista de selectores candidatos. Este registro anota
+por rol los aciertos, fallos y la latencia de cada selector, ordena los
+candidatos por tasa de acierto para que el camino habitual sea una sola
+búsqueda, y guarda las estadísticas en un JSON chico entre ejecuciones.
+
+Las estadísticas sirven también para podar los selectores que ya no
+encuentran nada (ver debug_selectores.py).
+"""
+
+import os
+import json
+import atexit
+import time
+import logging
+import threading
+
+from config import ARCHIVO_SELECTORES
+
+logger = logging.getLogger(__name__)
+
+
+class RegistroSelectores:
+    """Estadísticas de aciertos por rol y selector, con orden adaptativo de candidatos."""
+
+    # Cada cuántos registros se guardan las estadísticas sin esperar al cierre
+    REGISTROS_POR_GUARDADO = 50
+
+    def __init__(self, ruta: str = ARCHIVO_SELECTORES):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._estadisticas = None
+        self._pendientes = 0
+
+    def _cargar(self) -> dict:
+        if self._estadisticas is None:
+            try:
+                with open(self.ruta, 'r', encoding='utf-8') as f:
+                    self._estadisticas = json.load(f)
+            except (OSError, ValueError):
+                self._estadisticas = {}
+        return self._estadisticas
+
+    def _entrada(self, rol: str, selector: str) -> dict:
+        return self._cargar().setdefault(rol, {}).setdefault(
+            selector, {'aciertos': 0, 'fallos': 0, 'mediciones': 0, 'ms_total': 0.0}
+        )
+
+    @staticmethod
+    def _tasa(entrada: dict | None) -> float:
+        """Tasa de acierto suavizada: un selector sin datos queda en 0.5."""
+        if not entrada:
+            return 0.5
+        return (entrada['aciertos'] + 1) / (entrada['aciertos'] + entrada['fallos'] + 2)
+
+    @staticmethod
+    def _latencia_ms(entrada: dict | None) -> float:
+        if not entrada or not entrada['mediciones']:
+            return 0.0
+        return entrada['ms_total'] / entrada['mediciones']
+
+    def ordenar(self, rol: str, selectores: list) -> list:
+        """
+        Devuelve los selectores ordenados por tasa de acierto (y luego por latencia).
+
+        A igualdad de estadísticas se conserva el orden original de la lista.
+        """
+        with self._lock:
+            por_selector = self._cargar().get(rol, {})
+            clave = {
+                selector: (-self._tasa(por_selector.get(selector)), self._latencia_ms(por_selector.get(selector)), i)
+                for i, selector in enumerate(selectores)
+            }
+        return sorted(selectores, key=clave.__getitem__)
+
+    def registrar(self, rol: str, selector: str, acierto: bool, segundos: float = None):
+        """Anota un acierto o un fallo del selector y, si se conoce, cuánto tardó."""
+        with self._lock:
+            entrada = self._entrada(rol, selector)
+            entrada['aciertos' if acierto else 'fallos'] += 1
+            if segundos is not None:
+                entrada['mediciones'] += 1
+                entrada['ms_total'] += segundos * 1000
+            self._pendientes += 1
+            guardar = self._pendientes >= self.REGISTROS_POR_GUARDADO
+        if guardar:
+            self.guardar()
+
+    def buscar(self, rol: str, selectores: list, intentar) -> tuple:
+        """
+        Prueba los selectores en orden de ranking hasta que uno encuentra algo.
+
+        Args:
+            rol (str): Elemento de la página que se busca.
+            selectores (list): Selectores candidatos.
+            intentar (callable): Recibe un selector y devuelve el resultado, o None si no encontró nada.
+
+        Returns:
+            tuple: (selector, resultado) del primer acierto, o (None, None).
+        """
+        for selector in self.ordenar(rol, selectores):
+            inicio = time.perf_counter()
+            resultado = intentar(selector)
+            self.registrar(rol, selector, resultado is not None, time.perf_counter() - inicio)
+            if resultado is not None:
+                return selector, resultado
+        return None, None
+
+    def resumen(self, rol: str = None) -> list:
+        """
+        Devuelve las estadísticas como filas ordenadas por rol y ranking.
+
+        Returns:
+            list[dict]: rol, selector, aciertos, fallos, tasa y latencia media en ms.
+        """
+        with self._lock:
+            estadisticas = {r: dict(s) for r, s in self._cargar().items() if rol is None or r == rol}
+        filas = []
+        for nombre_rol in sorted(estadisticas):
+            por_selector = estadisticas[nombre_rol]
+            for selector in self.ordenar(nombre_rol, list(por_selector)):
+                entrada = por_selector[selector]
+                filas.append({
+                    'rol': nombre_rol,
+                    'selector': selector,
+                    'aciertos': entrada['aciertos'],
+                    'fallos': entrada['fallos'],
+                    'tasa': self._tasa(entrada),
+                    'latencia_ms': self._latencia_ms(entrada),
+                })
+        return filas
+
+    def selectores_muertos(self, minimo_intentos: int = 20) -> list:
+        """Filas de los selectores que nunca acertaron en al menos `minimo_intentos` intentos."""
+        return [
+            fila for fila in self.resumen()
+            if fila['aciertos'] == 0 and fila['fallos'] >= minimo_intentos
+        ]
+
+    def guardar(self):
+        """Escribe las estadísticas en disco (reemplazando el archivo de una vez)."""
+        with self._lock:
+            if self._estadisticas is None or not self._pendientes:
+                return
+            contenido = json.dumps(self._estadisticas, ensure_ascii=False, indent=2)
+            self._pendientes = 0
+        try:
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            temporal = f"{self.ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporal, 'w', encoding='utf-8') as f:
+                f.write(contenido)
+            os.replace(temporal, self.ruta)
+        except OSError as e:
+            logger.debug(f"No se pudieron guardar las estadísticas de selectores: {e}")
+
+
+_registro = None
+
+def obtener_registro() -> RegistroSelectores:
+    """Devuelve el registro compartido por todos los notificadores del proceso."""
+    global _registro
+    if _registro is None:
+        _registro = RegistroSelectores()
+        atexit.register(_registro.guardar)
+    return _registro
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de Sesión Persistente
+============================
+
+Mantiene abierto, entre ejecuciones, un Chrome por perfil con WhatsApp Web
+ya iniciado y el puerto de depuración remota habilitado. Con
+SESION_PERSISTENTE=true, WhatsAppNotifier se conecta a ese navegador en lugar
+de abrir uno nuevo, así no se paga en cada ejecución el arranque de Chrome,
+la carga de WhatsApp Web ni la sincronización de los chats, y al terminar se
+desconecta sin cerrarlo.
+
+Chrome se lanza con --remote-debugging-port=0: elige un puerto libre y lo
+anota en el archivo DevToolsActivePort del perfil, que es de donde lo lee el
+notificador. Así cada perfil de PERFILES_CHROME tiene su propio puerto sin
+configurar nada.
+
+Uso:
+    python sesion_persistente.py [iniciar|estado|detener]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import logging
+import subprocess
+import urllib.request
+
+from config import PERFILES_CHROME, URL_WHATSAPP, USER_AGENT, CHROME_BINARIO
+
+logger = logging.getLogger(__name__)
+
+ARCHIVO_PUERTO = 'DevToolsActivePort'  # Lo escribe Chrome dentro del perfil
+ARCHIVO_PID = 'vtv_sesion_persistente.pid'
+
+CANDIDATOS_CHROME = [
+    'google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome',
+    os.path.join(os.environ.get('PROGRAMFILES', r'C:\Program Files'), r'Google\Chrome\Application\chrome.exe'),
+    os.path.join(os.environ.get('PROGRAMFILES(X86)', r'C:\Program Files (x86)'), r'Google\Chrome\Application\chrome.exe'),
+    os.path.join(os.environ.get('LOCALAPPDATA', ''), r'Google\Chrome\Application\chrome.exe'),
+    '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+]
+
+
+def buscar_chrome(binario: str = CHROME_BINARIO) -> str | None:
+    """Devuelve la ruta del ejecutable de Chrome (CHROME_BINARIO o la instalación habitual)."""
+    for candidato in ([binario] if binario else CANDIDATOS_CHROME):
+        ruta = shutil.which(candidato) or (candidato if os.path.isfile(candidato) else None)
+        if ruta:
+            return ruta
+    return None
+
+
+def direccion_depuracion(perfil: str) -> str | None:
+    """
+    Dirección host:puerto del Chrome que tiene abierto el perfil.
+
+    Returns:
+        str | None: La dirección si hay un navegador respondiendo en ese puerto; None si no.
+    """
+    try:
+        with open(os.path.join(perfil, ARCHIVO_PUERTO), 'r', encoding='utf-8') as f:
+            puerto = int(f.readline().strip())
+    except (OSError, ValueError):
+        return None
+
+    direccion = f"127.0.0.1:{puerto}"
+    try:
+        # El archivo puede haber quedado de un Chrome que ya se cerró
+        with urllib.request.urlopen(f"http://{direccion}/json/version", timeout=2) as respuesta:
+            json.load(respuesta)
+    except (OSError, ValueError):
+        return None
+    return direccion
+
+
+def iniciar_sesion(perfil: str, url: str = URL_WHATSAPP, binario: str = CHROME_BINARIO,
+                   plazo: float = 30) -> str | None:
+    """
+    Abre Chrome con el perfil y WhatsApp Web, desacoplado de este proceso.
+
+    Si el perfil ya tiene un navegador persistente respondiendo, lo reutiliza.
+
+    Returns:
+        str | None: Dirección de depuración del navegador, o None si no se pudo iniciar.
+    """
+    direccion = direccion_depuracion(perfil)
+    if direccion:
+        return direccion
+
+    ejecutable = buscar_chrome(binario)
+    if not ejecutable:
+        logger.error("❌ No se encontró Google Chrome. Indicá la ruta con CHROME_BINARIO.")
+        return None
+
+    os.makedirs(perfil, exist_ok=True)
+    try:
+        os.remove(os.path.join(perfil, ARCHIVO_PUERTO))  # Que no se lea el puerto de un Chrome anterior
+    except OSError:
+        pass
+
+    argumentos = [
+        ejecutable,
+        f"--user-data-dir={perfil}",
+        "--remote-debugging-port=0",
+        f"--user-agent={USER_AGENT}",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-extensions",
+        url,
+    ]
+    # El navegador tiene que sobrevivir a este proceso
+    if os.name == 'nt':
+        desacople = {'creationflags': subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        desacople = {'start_new_session': True}
+    logger.info(f"🚀 Abriendo Chrome persistente para el perfil {perfil}...")
+    proceso = subprocess.Popen(argumentos, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, **desacople)
+    with open(os.path.join(perfil, ARCHIVO_PID), 'w', encoding='utf-8') as f:
+        f.write(str(proceso.pid))
+
+    limite = time.monotonic() + plazo
+    while time.monotonic() < limite and proceso.poll() is None:
+        direccion = direccion_depuracion(perfil)
+        if direccion:
+            logger.info(f"✅ Chrome persistente escuchando en {direccion}")
+            return direccion
+        time.sleep(0.2)
+
+    logger.error(f"❌ Chrome no habilitó el puerto de depuración del perfil {perfil}")
+    return None
+
+
+def detener_sesion(perfil: str) -> bool:
+    """Cierra el Chrome persistente del perfil. Devuelve True si había uno abierto por este módulo."""
+    ruta_pid = os.path.join(perfil, ARCHIVO_PID)
+    try:
+        with open(ruta_pid, 'r', encoding='utf-8') as f:
+            pid = int(f.read().strip())
+    except (OSError, ValueError):
+        return False
+
+    try:
+        os.kill(pid, signal.SIGTERM)
+        detenido = True
+    except OSError:
+        detenido = False  # Ya no estaba corriendo
+    for archivo in (ruta_pid, os.path.join(perfil, ARCHIVO_PUERTO)):
+        try:
+            os.remove(archivo)
+        except OSError:
+            pass
+    return detenido
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    accion = sys.argv[1] if len(sys.argv) > 1 else 'iniciar'
+    if accion not in ('iniciar', 'estado', 'detener'):
+        print(__doc__)
+        sys.exit(1)
+
+    print("="*80)
+    print("                  SESIÓN PERSISTENTE DE WHATSAPP WEB")
+    print("="*80)
+    for perfil in PERFILES_CHROME:
+        if accion == 'iniciar':
+            direccion = iniciar_sesion(perfil)
+            print(f"{'✅' if direccion else '❌'} {perfil}: {direccion or 'no se pudo iniciar'}")
+        elif accion == 'estado':
+            direccion = direccion_depuracion(perfil)
+            print(f"{'🟢' if direccion else '⚪'} {perfil}: {direccion or 'sin sesión persistente'}")
+        else:
+            detenido = detener_sesion(perfil)
+            print(f"{'⏹️ ' if detenido else '⚪'} {perfil}: {'cerrada' if detenido else 'no estaba abierta'}")
+    if accion == 'iniciar':
+        print("\n📱 Escaneá el código QR en cada ventana si es la primera vez; la sesión queda abierta")
+        print("   para las próximas ejecuciones con SESION_PERSISTENTE=true.")
+    print("="*80)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,22 +9,130 @@ la validación de datos y la limpieza de texto.
 """
 
 import logging
+import logging.handlers
+import os
 import sys
+import gzip
+import queue
+import atexit
+import shutil
+import threading
 import unicodedata
-import re
+import numpy as np
 import pandas as pd
-from config import LOG_FILE
+from config import (
+    LOG_FILE,
+    LOG_NIVEL,
+    LOG_NIVELES_MODULOS,
+    LOG_ROTACION,
+    LOG_MAX_BYTES,
+    LOG_ROTACION_CUANDO,
+    LOG_ARCHIVOS_RESPALDO,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = pc = None
+
+_listener_logging = None
+
+def _nombre_comprimido(nombre: str) -> str:
+    """Nombre de los archivos de log rotados (se guardan comprimidos)."""
+    return nombre + '.gz'
+
+def _rotar_comprimiendo(origen: str, destino: str):
+    """Comprime el archivo de log rotado con gzip y elimina el original."""
+    with open(origen, 'rb') as entrada, gzip.open(destino, 'wb') as salida:
+        shutil.copyfileobj(entrada, salida)
+    os.remove(origen)
+
+def _crear_handler_archivo() -> logging.Handler:
+    """Handler de archivo con rotación por tamaño o por tiempo y respaldo comprimido."""
+    if LOG_ROTACION == 'tiempo':
+        handler = logging.handlers.TimedRotatingFileHandler(
+            LOG_FILE, when=LOG_ROTACION_CUANDO, backupCount=LOG_ARCHIVOS_RESPALDO, encoding='utf-8'
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_ARCHIVOS_RESPALDO, encoding='utf-8'
+        )
+    handler.namer = _nombre_comprimido
+    handler.rotator = _rotar_comprimiendo
+    return handler
+
+def _aplicar_niveles_modulos(configuracion: str):
+    """Aplica niveles por módulo con el formato 'modulo=NIVEL,otro=NIVEL'."""
+    for entrada in filter(None, (e.strip() for e in configuracion.split(','))):
+        modulo, _, nivel = entrada.partition('=')
+        nivel = nivel.strip().upper()
+        if not modulo.strip() or not isinstance(logging.getLevelName(nivel), int):
+            logging.getLogger(__name__).warning(f"Nivel de log inválido en LOG_NIVELES_MODULOS: '{entrada}'")
+            continue
+        logging.getLogger(modulo.strip()).setLevel(nivel)
+
+class _EscritorLogs(logging.handlers.QueueListener):
+    """QueueListener que además avisa cuando llega a una marca de vaciado (ver vaciar_logs)."""
+
+    def handle(self, record):
+        if isinstance(record, threading.Event):
+            record.set()
+            return
+        super().handle(record)
+
+def vaciar_logs(plazo: float = 5):
+    """
+    Espera a que el hilo escritor termine de escribir todo lo encolado hasta ahora.
+
+    Se llama antes de un input() o de un bloque de print(): si no, los logs
+    anteriores podrían aparecer en la consola después de la pregunta.
+    """
+    if _listener_logging is None:
+        return
+    marca = threading.Event()
+    _listener_logging.queue.put(marca)
+    marca.wait(plazo)
+
+def detener_logging():
+    """Vacía la cola de logging y detiene el hilo escritor."""
+    global _listener_logging
+    if _listener_logging is not None:
+        _listener_logging.stop()
+        for handler in _listener_logging.handlers:
+            handler.close()
+        _listener_logging = None
 
 def configurar_logging():
-    """Configura el sistema de logging para registrar actividades."""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(LOG_FILE, encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    """
+    Configura el sistema de logging para registrar actividades.
+
+    Los registros se encolan con un QueueHandler y un QueueListener los
+    formatea y escribe (archivo rotado y consola) en un hilo aparte, así el
+    envío de mensajes no se bloquea esperando al disco o a la terminal. Antes
+    de pedirle algo al operador, vaciar_logs() espera a que se escriba lo
+    encolado para que la pregunta no quede mezclada con logs atrasados.
+    """
+    global _listener_logging
+    if _listener_logging is not None:
+        return logging.getLogger(__name__)
+
+    formato = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [_crear_handler_archivo(), logging.StreamHandler(sys.stdout)]
+    for handler in handlers:
+        handler.setFormatter(formato)
+
+    cola = queue.SimpleQueue()
+    raiz = logging.getLogger()
+    for handler in raiz.handlers[:]:
+        raiz.removeHandler(handler)
+    raiz.addHandler(logging.handlers.QueueHandler(cola))
+    raiz.setLevel(LOG_NIVEL)
+    _aplicar_niveles_modulos(LOG_NIVELES_MODULOS)
+
+    _listener_logging = _EscritorLogs(cola, *handlers, respect_handler_level=True)
+    _listener_logging.start()
+    atexit.register(detener_logging)
     return logging.getLogger(__name__)
 
 def limpiar_texto_unicode(texto: str) -> str:
@@ -50,36 +158,161 @@ def limpiar_texto_unicode(texto: str) -> str:
     
     return texto_limpio
 
+# Códigos de motivo devueltos por normalizar_telefonos
+MOTIVOS_TELEFONO = [
+    'OK',
+    'NULO',
+    'VACÍO',
+    'SIN_DÍGITOS',
+    'PARECE_FECHA',
+    'MUY_CORTO',
+    'MUY_LARGO',
+    'FORMATO_INVÁLIDO',
+]
+
+# Prefijos que se anteponen al número según el caso (índice 0 = inválido)
+_PREFIJOS_TELEFONO = np.array([0, 54, 549, 5411], dtype=np.int64)
+_POTENCIAS_10 = 10 ** np.arange(19, dtype=np.int64)
+_MAXIMO_DIGITOS = 18  # lo que entra en un int64
+
+def _enteros_a_texto(valores: np.ndarray, index) -> pd.Series:
+    """Convierte un array int64 a una serie de texto (vía pyarrow si está disponible)."""
+    if pa is not None:
+        return pd.Series(pd.array(pc.cast(pa.array(valores), pa.string()), dtype='string'), index=index)
+    return pd.Series(valores, index=index).astype('string')
+
+def _digitos_a_enteros(digitos: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Convierte una serie de texto con solo dígitos a (valor int64, cantidad de dígitos)."""
+    largo = digitos.str.len().to_numpy(dtype=np.int64, na_value=0)
+    convertibles = digitos.where((largo > 0) & (largo <= _MAXIMO_DIGITOS))
+    try:
+        valor = convertibles.astype('Int64').to_numpy(dtype=np.int64, na_value=0)
+    except (ValueError, TypeError):
+        # Dígitos no ASCII (ej: '٣'): conversión lenta pero segura
+        valor = pd.to_numeric(convertibles, errors='coerce').to_numpy(dtype='float64', na_value=0).astype(np.int64)
+    return valor, largo
+
+def normalizar_telefonos(numeros: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """
+    Valida y formatea una columna completa de teléfonos argentinos en una sola pasada.
+
+    Los dígitos de cada celda se llevan a un entero (valor + cantidad de dígitos)
+    y las reglas se aplican con máscaras sobre arrays, sin llamadas por fila.
+    La limpieza con regex solo se aplica a las celdas que no son únicamente
+    dígitos. El resultado usa el formato 549XXXXXXXXXX que espera WhatsApp.
+
+    Reglas (sobre los dígitos, luego de quitar el prefijo 54 y un 0 inicial):
+        - 10 dígitos: 549 + número (si empieza con 9 ya trae el 9: 54 + número)
+        - 11 dígitos: 54 + número
+        - 9 dígitos: 549 + número
+        - 8 dígitos: 5411 + número (número local de CABA)
+
+    Args:
+        numeros (pd.Series): Teléfonos tal como vienen del Excel (str, int o float).
+
+    Returns:
+        tuple[pd.Series, pd.Series]: (números formateados como texto, nulos si son
+        inválidos; motivo por fila, uno de MOTIVOS_TELEFONO).
+    """
+    cantidad = len(numeros)
+
+    if pd.api.types.is_numeric_dtype(numeros) and not pd.api.types.is_bool_dtype(numeros):
+        # Los números que Excel guarda como float se truncan igual que int(numero)
+        flotantes = np.abs(numeros.to_numpy(dtype='float64', na_value=np.nan))
+        nulos = np.isnan(flotantes)
+        fuera_de_rango = ~nulos & (flotantes >= 10.0 ** _MAXIMO_DIGITOS)
+        valor = np.trunc(np.where(nulos | fuera_de_rango, 0, flotantes)).astype(np.int64)
+        largo = np.searchsorted(_POTENCIAS_10, valor, side='right')
+        largo[fuera_de_rango] = _MAXIMO_DIGITOS + 1
+        vacios = np.zeros(cantidad, dtype=bool)
+        sin_digitos = np.zeros(cantidad, dtype=bool)
+        parece_fecha = np.zeros(cantidad, dtype=bool)
+    else:
+        texto = numeros.astype('string').str.strip()
+        nulos = texto.isna().to_numpy()
+        texto = texto.fillna('')
+
+        valor = np.zeros(cantidad, dtype=np.int64)
+        largo = np.zeros(cantidad, dtype=np.int64)
+        vacios = np.zeros(cantidad, dtype=bool)
+        parece_fecha = np.zeros(cantidad, dtype=bool)
+
+        # La mayoría de las celdas ya son solo dígitos: la limpieza con regex se
+        # aplica únicamente al resto
+        solo_digitos = texto.str.isdecimal().to_numpy()
+        if solo_digitos.all():
+            valor, largo = _digitos_a_enteros(texto)
+        else:
+            valor[solo_digitos], largo[solo_digitos] = _digitos_a_enteros(texto[solo_digitos])
+            otros = texto[~solo_digitos]
+            vacios[~solo_digitos] = otros.str.lower().isin(['', 'nan', 'none', 'null']).to_numpy()
+            parece_fecha[~solo_digitos] = otros.str.contains('/', regex=False).to_numpy()
+            # Quitar un '.0' final (floats dentro de columnas mixtas) y todo lo que no sea dígito
+            limpios = otros.str.replace(r'\.0+$|\D', '', regex=True)
+            valor[~solo_digitos], largo[~solo_digitos] = _digitos_a_enteros(limpios)
+
+        vacios &= ~nulos
+        sin_digitos = ~nulos & ~vacios & (largo == 0)
+
+    muy_largo = largo > _MAXIMO_DIGITOS
+    largo = np.where(muy_largo, 0, largo)
+
+    # Remover prefijo de país Argentina (54) si existe
+    divisor = _POTENCIAS_10[np.clip(largo - 2, 0, None)]
+    tiene_54 = (largo >= 2) & (valor // divisor == 54)
+    valor = np.where(tiene_54, valor % divisor, valor)
+    largo = largo - 2 * tiene_54
+
+    # Manejar números que empiezan con 0 (quedan con menos dígitos que su largo)
+    primer_digito = valor // _POTENCIAS_10[np.clip(largo - 1, 0, None)]
+    tiene_0 = (largo >= 1) & (primer_digito == 0)
+    largo = largo - tiene_0
+    primer_digito = valor // _POTENCIAS_10[np.clip(largo - 1, 0, None)]
+
+    # Índice del prefijo a anteponer: 0 = inválido, 1 = '54', 2 = '549', 3 = '5411'
+    codigo_prefijo = np.select(
+        [
+            (largo == 10) & (primer_digito == 9),
+            largo == 10,
+            largo == 11,
+            largo == 9,
+            largo == 8,
+        ],
+        [1, 2, 1, 2, 3],
+        default=0,
+    )
+    codigo_prefijo[nulos | vacios | sin_digitos | muy_largo] = 0
+    validos = codigo_prefijo > 0
+
+    resultado = _PREFIJOS_TELEFONO[codigo_prefijo] * _POTENCIAS_10[largo] + valor
+    formateados = _enteros_a_texto(resultado, numeros.index).where(validos)
+
+    # El orden de las condiciones define la prioridad de cada motivo
+    codigo_motivo = np.select(
+        [validos, nulos, vacios, sin_digitos, parece_fecha, ~muy_largo & (largo < 8), muy_largo | (largo > 11)],
+        range(7),
+        default=MOTIVOS_TELEFONO.index('FORMATO_INVÁLIDO'),
+    )
+    motivos = pd.Series(pd.Categorical.from_codes(codigo_motivo, MOTIVOS_TELEFONO), index=numeros.index)
+
+    return formateados, motivos
+
 def validar_numero_telefono(numero) -> str | None:
     """
-    Valida y formatea un número de teléfono argentino.
+    Valida y formatea un único número de teléfono argentino.
+
+    Para columnas completas usar normalizar_telefonos, que aplica las mismas
+    reglas de forma vectorizada.
 
     Args:
         numero: El número de teléfono (puede ser str, int, float).
 
     Returns:
-        str | None: El número formateado con "+54" o None si es inválido.
+        str | None: El número formateado con "549..." o None si es inválido.
     """
-    if pd.isna(numero):
+    if numero is None or pd.isna(numero):
         return None
-        
-    numero_str = str(numero).split('.')[0] # Convertir a str y quitar decimales
-    numero_limpio = re.sub(r'[\s\-()+]', '', numero_str)
-    
-    # Quitar prefijo de país si existe
-    if numero_limpio.startswith('54'):
-        numero_limpio = numero_limpio[2:]
-        
-    # Verificar que tenga el formato de 10 dígitos (sin el 9 de móvil)
-    # WhatsApp requiere el formato +549... para móviles, pero lo gestiona internamente
-    if re.match(r'^(11|\d{2,4})?\d{6,8}$', numero_limpio) and len(numero_limpio) >= 10:
-         # Si no incluye el '9' entre el código de país y el de área, WhatsApp puede no encontrarlo.
-         # El formato estándar es +54 9 CódArea Número.
-         if len(numero_limpio) == 10: # CódArea + Número
-            return f"549{numero_limpio}"
-         elif len(numero_limpio) == 11 and numero_limpio.startswith('9'): # Ya tiene el 9
-            return f"54{numero_limpio}"
-         else: # Otros casos
-            return f"54{numero_limpio}"
-
-    return None
\ No newline at end of file
+
+    formateados, _ = normalizar_telefonos(pd.Series([numero], dtype=object))
+    resultado = formateados.iloc[0]
+    return None if pd.isna(resultado) else str(resultado)
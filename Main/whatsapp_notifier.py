@@ -8,8 +8,11 @@ Versión optimizada que solo verifica modales una vez al iniciar sesión
 y luego se enfoca en las tareas de envío sin verificaciones adicionales.
 """
 
+import os
 import time
 import logging
+import unicodedata
+from urllib.parse import quote
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -22,33 +25,521 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.action_chains import ActionChains
 
 from utils import limpiar_texto_unicode
-from config import CHROME_PROFILE_PATH, USER_AGENT
+from selectores import obtener_registro
+from sesion_persistente import direccion_depuracion, iniciar_sesion
+from config import (
+    CHROME_PROFILE_PATH, USER_AGENT, URL_WHATSAPP, MODO_NAVEGACION, TIEMPOS_ESPERA, METODO_ESCRITURA,
+    SESION_PERSISTENTE, MODO_NAVEGADOR,
+)
 
 logger = logging.getLogger(__name__)
 
+# Tiempo máximo (segundos) de cada paso del envío. Las esperas terminan apenas se cumple
+# la condición del paso, así que estos valores solo pesan cuando algo falla.
+PLAZOS_ESPERA = {
+    'sesion': 20,               # Caja de búsqueda visible con la sesión ya iniciada
+    'codigo_qr': 60,            # Escaneo del código QR
+    'modal': 5,                 # Aparición de una ventana modal al iniciar
+    'modal_cerrado': 5,         # Desaparición de la ventana modal
+    'campo_busqueda': 5,        # Caja de búsqueda lista para usar
+    'foco': 2,                  # Un campo recibe el foco después del clic
+    'busqueda_limpia': 3,       # La caja de búsqueda queda vacía
+    'resultados_busqueda': 5,   # Los resultados de la búsqueda dejan de cambiar
+    'chat_abierto': 10,         # Caja de mensaje del chat nuevo
+    'encabezado_chat': 5,       # Encabezado del chat con el nombre o número
+    'panel_info': 3,            # Panel de información del contacto
+    'enlace': 8,                # Chat abierto con el enlace inyectado
+    'enlace_completo': 30,      # Chat abierto navegando a la URL del enlace
+    'caja_mensaje': 10,         # Caja de mensaje lista para escribir
+    'texto_escrito': 5,         # El texto aparece en la caja de mensaje
+    'texto_insertado': 1,       # El editor termina de mostrar el texto insertado
+    'mensaje_enviado': 10,      # Burbuja del mensaje saliente
+    'cierre': 10,               # Mensajes pendientes (reloj) antes de cerrar el navegador
+}
+
+# --- Modo de navegador liviano ---
+# Sin ventana y con una ventana chica (WhatsApp Web necesita al menos ~1000 px de ancho
+# para mostrar la lista de chats y el chat a la vez), sin tareas de fondo de Chrome
+ARGUMENTOS_LIVIANO = [
+    "--headless=new",
+    "--window-size=1100,800",
+    "--mute-audio",
+    "--no-first-run",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-component-update",
+    "--disable-background-networking",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    # Sin ventana visible Chrome frenaría los temporizadores de la página
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+]
+# Recursos que no se descargan (Network.setBlockedURLs): imágenes, fotos de perfil,
+# archivos de los chats, audio, video y fuentes. Los emojis de la caja de mensaje
+# se siguen leyendo de su atributo alt, así que no hace falta su imagen.
+URLS_BLOQUEADAS_LIVIANO = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico",
+    "*.mp4", "*.webm", "*.ogg", "*.opus", "*.mp3",
+    "*.woff", "*.woff2", "*.ttf",
+    "*://pps.whatsapp.net/*",           # Fotos de perfil
+    "*://mmg.whatsapp.net/*",           # Archivos de los chats
+    "*://media*.cdn.whatsapp.net/*",
+]
+
+# Espera con un MutationObserver a que una condición sobre el DOM devuelva un valor
+# verdadero. /*CONDICION*/ se reemplaza por el cuerpo de la condición, que recibe los
+# argumentos extra en `argumentos`. Con `quietud` > 0 la condición además tiene que
+# mantenerse esa cantidad de milisegundos sin cambios en el DOM. Devuelve null al vencer el plazo.
+PLANTILLA_ESPERA_DOM = """
+const argumentos = Array.prototype.slice.call(arguments, 0, -3);
+const plazo = arguments[arguments.length - 3];
+const quietud = arguments[arguments.length - 2];
+const listo = arguments[arguments.length - 1];
+const condicion = () => { /*CONDICION*/ };
+let terminado = false;
+let espera = null;
+const observador = new MutationObserver(revisar);
+const limite = setTimeout(() => terminar(null), plazo);
+function terminar(valor) {
+    if (terminado) { return; }
+    terminado = true;
+    observador.disconnect();
+    clearTimeout(limite);
+    clearTimeout(espera);
+    listo(valor === undefined ? null : valor);
+}
+function revisar() {
+    clearTimeout(espera);
+    const valor = condicion();
+    if (!valor) { return; }
+    if (quietud > 0) {
+        espera = setTimeout(() => { const final = condicion(); if (final) { terminar(final); } }, quietud);
+    } else {
+        terminar(valor);
+    }
+}
+observador.observe(document.body, {childList: true, subtree: true, characterData: true, attributes: true});
+revisar();
+"""
+
+# Cuenta los cambios en la lista de chats desde antes de escribir la búsqueda
+SCRIPT_OBSERVAR_RESULTADOS = """
+if (window.vtvObservadorResultados) { window.vtvObservadorResultados.disconnect(); }
+window.vtvCambiosResultados = 0;
+const panel = document.querySelector('#pane-side') || document.querySelector('#side') || document.body;
+window.vtvObservadorResultados = new MutationObserver(() => { window.vtvCambiosResultados++; });
+window.vtvObservadorResultados.observe(panel, {childList: true, subtree: true, characterData: true});
+"""
+
+SCRIPT_DEJAR_OBSERVAR_RESULTADOS = """
+if (window.vtvObservadorResultados) { window.vtvObservadorResultados.disconnect(); }
+window.vtvObservadorResultados = null;
+"""
+
+CONDICION_ENCABEZADO_CHAT = """
+const encabezado = document.querySelector("#main header, header[data-testid='conversation-header']");
+return encabezado && (encabezado.innerText || '').trim() ? 'encabezado' : null;
+"""
+
+# Texto de la caja de mensaje tal como se va a enviar: los emojis que el editor muestra
+# como imágenes se leen de su atributo alt y los saltos de línea se conservan
+FUNCION_TEXTO_CAJA = """
+function textoCaja(caja) {
+    const copia = caja.cloneNode(true);
+    copia.querySelectorAll('img[alt]').forEach((imagen) => imagen.replaceWith(imagen.alt));
+    copia.querySelectorAll('br').forEach((salto) => salto.replaceWith('\\n'));
+    copia.querySelectorAll('p, div').forEach((bloque) => bloque.append('\\n'));
+    return copia.textContent;
+}
+"""
+
+SCRIPT_TEXTO_CAJA = FUNCION_TEXTO_CAJA + "return textoCaja(arguments[0]);"
+
+# Reemplaza el contenido de la caja por el texto completo en una sola llamada, como si
+# se pegara: el editor de WhatsApp recibe el evento de entrada normal. Devuelve el
+# contenido de la caja una vez que el editor terminó de actualizarla.
+SCRIPT_INSERTAR_TEXTO = FUNCION_TEXTO_CAJA + """
+const caja = arguments[0];
+const texto = arguments[1];
+caja.focus();
+window.getSelection().selectAllChildren(caja);
+if (!document.execCommand('insertText', false, texto)) {
+    caja.dispatchEvent(new InputEvent('beforeinput', {
+        inputType: 'insertText', data: texto, bubbles: true, cancelable: true
+    }));
+}
+return new Promise((resolver) => setTimeout(() => resolver(textoCaja(caja)), 0));
+"""
+
+SCRIPT_SELECCIONAR_CONTENIDO = """
+arguments[0].focus();
+window.getSelection().selectAllChildren(arguments[0]);
+"""
+
+SCRIPT_CONTAR_SALIENTES = "return document.querySelectorAll('.message-out').length;"
+
+# Aparece una burbuja saliente nueva después de presionar Enter
+CONDICION_MENSAJE_ENVIADO = """
+return document.querySelectorAll('.message-out').length > argumentos[0] ? 'burbuja' : null;
+"""
+
+# No quedan mensajes con el reloj de pendiente de envío
+CONDICION_SIN_PENDIENTES = """
+return document.querySelector("span[data-icon='msg-time']") ? null : 'listo';
+"""
+
+# --- Verificación del contacto ---
+# Selectores del encabezado del chat, de los más específicos a los más generales
+SELECTORES_ENCABEZADO = [
+    "//header[@data-testid='conversation-header']//span",
+    "//div[@data-testid='conversation-header']//span",
+    "//header//div[contains(@class, 'chat-title')]//span",
+    "//div[@data-testid='conversation-panel-header']//span",
+    "//header//span[@title]",
+    "//header//span[contains(@class, 'ggj6brxn')]",
+    "//div[contains(@class, 'zoWT4')]//span[contains(@class, 'ggj6brxn')]",
+    "//div[contains(@class, 'chat-title')]//span",
+    "//header//span[contains(@dir, 'auto')]",
+    "//header//span[text()]",
+    "//div[@role='button']//span[contains(@class, 'ggj6brxn')]",
+    "//div[@data-testid='cell-frame-title']//span",
+    "//div[contains(@class, 'chat-header')]//span",
+]
+
+# Elementos del encabezado que abren el panel de información del contacto
+SELECTORES_ENCABEZADO_CLIC = [
+    "//header[@data-testid='conversation-header']",
+    "//div[@data-testid='conversation-header']",
+    "//header//div[contains(@class, 'chat-title')]",
+    "//div[@data-testid='conversation-panel-header']",
+    "//header//span[contains(@class, 'ggj6brxn')]",
+]
+
+# Textos del panel de información del contacto
+SELECTORES_INFO_CONTACTO = [
+    "//div[contains(@class, 'contact-info')]//span",
+    "//div[@data-testid='drawer-right']//span",
+    "//div[contains(@class, 'drawer')]//span",
+    "//div[contains(@class, 'panel-right')]//span",
+    "//*[contains(text(), '+')]",
+]
+
+# Atributos que pueden contener el número del chat
+ATRIBUTOS_NUMERO = ['data-id', 'aria-label', 'data-testid', 'data-phone', 'data-number']
+
+# Funciones comunes de los scripts de verificación. `coincide` aplica los criterios de
+# coincidencia de números: igualdad, uno contenido en el otro, o los mismos últimos 8 o 10 dígitos.
+FUNCIONES_VERIFICACION = """
+function digitos(texto) { return (texto || '').replace(/\\D/g, ''); }
+function coincide(esperado, encontrado) {
+    if (!esperado || !encontrado) { return false; }
+    if (esperado.includes(encontrado) || encontrado.includes(esperado)) { return true; }
+    if (esperado.length >= 8 && encontrado.length >= 8 && esperado.slice(-8) === encontrado.slice(-8)) { return true; }
+    return esperado.length >= 10 && encontrado.length >= 10 && esperado.slice(-10) === encontrado.slice(-10);
+}
+function nodos(xpath) {
+    const resultado = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const lista = [];
+    for (let i = 0; i < resultado.snapshotLength; i++) { lista.push(resultado.snapshotItem(i)); }
+    return lista;
+}
+function visible(elemento) {
+    return !!(elemento.offsetWidth || elemento.offsetHeight || elemento.getClientRects().length);
+}
+function buscarEnEncabezado(numero, selectoresEncabezado) {
+    const vacios = [];
+    for (let indice = 0; indice < selectoresEncabezado.length; indice++) {
+        let visibles = 0;
+        for (const elemento of nodos(selectoresEncabezado[indice])) {
+            if (!visible(elemento)) { continue; }
+            visibles++;
+            const texto = [elemento.innerText, elemento.getAttribute('title'), elemento.getAttribute('aria-label')]
+                .map((valor) => valor || '').join(' ').trim();
+            if (coincide(numero, digitos(texto))) {
+                return {metodo: 'header', texto: texto, indice: indice, vacios: vacios};
+            }
+        }
+        if (!visibles) { vacios.push(indice); }
+    }
+    return {metodo: null, texto: null, indice: null, vacios: vacios};
+}
+"""
+
+# Busca el número en el encabezado visible, la URL y los atributos del chat, en ese orden.
+# Devuelve {metodo, texto, indice, vacios}: metodo es null si nada coincide, indice es el
+# selector de encabezado que coincidió y vacios los selectores de encabezado sin elementos visibles.
+SCRIPT_VERIFICAR_CHAT = FUNCIONES_VERIFICACION + """
+const [numero, selectoresEncabezado, atributos] = arguments;
+const encabezado = buscarEnEncabezado(numero, selectoresEncabezado);
+if (encabezado.metodo) { return encabezado; }
+const vacios = encabezado.vacios;
+if (coincide(numero, digitos(location.href))) {
+    return {metodo: 'URL', texto: location.href, indice: null, vacios: vacios};
+}
+for (const elemento of document.querySelectorAll(atributos.map((atributo) => '[' + atributo + ']').join(', '))) {
+    for (const atributo of atributos) {
+        const valor = elemento.getAttribute(atributo) || '';
+        if (coincide(numero, digitos(valor))) {
+            return {metodo: 'atributo ' + atributo, texto: valor, indice: null, vacios: vacios};
+        }
+    }
+}
+return {metodo: null, texto: null, indice: null, vacios: vacios};
+"""
+
+# Devuelve el primer texto del panel de información que contiene el número, o null
+SCRIPT_BUSCAR_EN_PANEL = FUNCIONES_VERIFICACION + """
+const [numero, selectores] = arguments;
+for (const selector of selectores) {
+    for (const elemento of nodos(selector)) {
+        const texto = elemento.innerText || '';
+        if (coincide(numero, digitos(texto))) { return texto; }
+    }
+}
+return null;
+"""
+
+SCRIPT_INFO_DEBUG = FUNCIONES_VERIFICACION + """
+const encabezados = Array.from(document.querySelectorAll('header'))
+    .map((encabezado) => encabezado.innerText || '').filter((texto) => texto.trim());
+const spans = [];
+for (const span of document.querySelectorAll('span')) {
+    const texto = span.innerText || '';
+    if (visible(span) && texto.trim() && /\\d/.test(texto)) { spans.push(texto); }
+    if (spans.length >= 5) { break; }
+}
+return {url: location.href, titulo: document.title, encabezados: encabezados, spans: spans};
+"""
+
+# --- Resultados de la búsqueda ---
+# {numero} se reemplaza por el número buscado
+SELECTORES_RESULTADO = [
+    "//div[@data-testid='cell-frame-container']",
+    "//div[contains(@class, 'zoWT4')]",
+    "//div[contains(@class, '_21S-L')]",
+    "//div[contains(@class, 'zoWT4')]//span[contains(@class, 'ggj6brxn')]",
+    "//div[contains(@class, 'cell-frame-container')]",
+    "//div[@role='listitem']",
+    "//div[contains(@class, 'chat-title')]",
+    "//div[contains(@class, 'chat')]//span[contains(@title, '{numero}')]",
+]
+
+# Resuelve los resultados de la búsqueda en una sola pasada, una vez que la lista cambió:
+# - 'coincidencia': la fila cuyo texto contiene los últimos 8 dígitos del número
+# - 'unico': un único resultado sin el número a la vista (contacto agendado con nombre)
+# - 'sin_resultados': no hay filas y WhatsApp muestra el aviso de que no encontró nada (el
+#   aviso se busca fuera de las filas: la vista previa de un chat puede contener la misma frase)
+# - 'ambiguo': hay varios resultados y ninguno muestra el número
+# `indice` es el selector que encontró la fila elegida y `vacios` los que no encontraron filas visibles.
+CONDICION_RESOLVER_RESULTADO = FUNCIONES_VERIFICACION + """
+const [numero, selectores] = argumentos;
+if (!window.vtvCambiosResultados) { return null; }
+const sufijo = digitos(numero).slice(-8);
+const panel = document.querySelector('#pane-side') || document.querySelector('#side') || document.body;
+const vistas = new Set();
+const candidatas = [];
+const vacios = [];
+for (let indice = 0; indice < selectores.length; indice++) {
+    let visibles = 0;
+    for (const elemento of nodos(selectores[indice])) {
+        const fila = elemento.closest("[role='listitem'], [data-testid='cell-frame-container']") || elemento;
+        if (!visible(fila)) { continue; }
+        visibles++;
+        if (vistas.has(fila)) { continue; }
+        vistas.add(fila);
+        const texto = [fila.innerText, elemento.getAttribute('title')].map((valor) => valor || '').join(' ').trim();
+        if (sufijo && digitos(texto).includes(sufijo)) {
+            return {estado: 'coincidencia', elemento: fila, texto: texto, indice: indice, vacios: vacios};
+        }
+        candidatas.push([fila, indice]);
+    }
+    if (!visibles) { vacios.push(indice); }
+}
+if (!candidatas.length) {
+    // El aviso reemplaza a la lista de resultados: un texto visible del panel que no está en ninguna fila
+    const textos = document.createTreeWalker(panel, NodeFilter.SHOW_TEXT);
+    while (textos.nextNode()) {
+        const contenedor = textos.currentNode.parentElement;
+        if (/no se encontr|sin resultados|no .*found/i.test(textos.currentNode.textContent)
+            && !contenedor.closest("[role='listitem'], [data-testid='cell-frame-container']") && visible(contenedor)) {
+            return {estado: 'sin_resultados'};
+        }
+    }
+    return null;
+}
+if (candidatas.length === 1) {
+    const [fila, indice] = candidatas[0];
+    return {estado: 'unico', elemento: fila, texto: (fila.innerText || '').trim(), indice: indice, vacios: vacios};
+}
+return {estado: 'ambiguo', cantidad: candidatas.length};
+"""
+
+# Botones que cierran las ventanas modales al iniciar sesión
+SELECTORES_BOTON_MODAL = [
+    "//div[@role='dialog']//div[@role='button'][contains(text(), 'Continuar')]",
+    "//div[@role='dialog']//button[contains(text(), 'Continuar')]",
+    "//div[@role='dialog']//span[contains(text(), 'Continuar')]",
+    "//div[@role='dialog']//div[contains(text(), 'Continuar')]",
+    "//div[@role='dialog']//div[@role='button']",
+    "//div[@role='dialog']//button",
+    "//div[@role='dialog']//button[contains(@aria-label, 'Cerrar')]",
+    "//div[@role='dialog']//div[contains(@aria-label, 'Close')]",
+    "//div[@role='dialog']//button[contains(@aria-label, 'Close')]",
+    "//div[@role='dialog']//*[@role='button']",
+    "//div[@role='dialog']//button[@type='button']",
+]
+
+# Caja de búsqueda de chats
+SELECTORES_CAMPO_BUSQUEDA = [
+    "//div[@contenteditable='true'][@data-tab='3']",
+    "//div[@role='textbox'][@data-tab='3']",
+    "//div[contains(@aria-label, 'Buscar')][@contenteditable='true']",
+    "//div[@aria-label='Cuadro de texto para ingresar la búsqueda']",
+]
+
+SELECTOR_PANEL_INFO = "//div[@data-testid='drawer-right'] | //div[contains(@class, 'drawer')] | //div[contains(@class, 'contact-info')]"
+
+# Marca la caja de mensaje del chat anterior y devuelve el estado de la navegación
+# por enlace: 'chat' cuando aparece una caja de mensaje nueva, 'invalido' cuando
+# WhatsApp muestra el diálogo de número inválido, o null mientras tanto.
+SCRIPT_MARCAR_CHAT_ANTERIOR = """
+const caja = document.querySelector("div[contenteditable='true'][data-tab='10']");
+if (caja) { caja.setAttribute('data-vtv-anterior', '1'); }
+"""
+
+SCRIPT_ABRIR_ENLACE = """
+const enlace = document.createElement('a');
+enlace.href = arguments[0];
+enlace.style.display = 'none';
+document.body.appendChild(enlace);
+enlace.click();
+enlace.remove();
+"""
+
+SCRIPT_ESTADO_CHAT = """
+const caja = document.querySelector("div[contenteditable='true'][data-tab='10']");
+if (caja && !caja.hasAttribute('data-vtv-anterior')) { return 'chat'; }
+for (const dialogo of document.querySelectorAll("div[role='dialog'], div[data-animate-modal-popup]")) {
+    const texto = (dialogo.innerText || '').toLowerCase();
+    if (texto.includes('no es válido') || texto.includes('inválido') || texto.includes('invalid')) {
+        return 'invalido';
+    }
+}
+return null;
+"""
+
+
+# Modo enlace: espera el chat nuevo (o el aviso de número inválido) y, en la misma llamada,
+# busca el número en su encabezado. La URL no sirve para verificar: el enlace siempre lo
+# contiene. Devuelve 'invalido' o {estado: 'chat', metodo, texto, indice, vacios}.
+CONDICION_CHAT_ENLACE = FUNCIONES_VERIFICACION + """
+const [numero, selectoresEncabezado] = argumentos;
+const estado = (function () {""" + SCRIPT_ESTADO_CHAT + """})();
+if (estado !== 'chat') { return estado; }
+if (!(function () {""" + CONDICION_ENCABEZADO_CHAT + """})()) { return null; }
+return Object.assign({estado: 'chat'}, buscarEnEncabezado(numero, selectoresEncabezado));
+"""
+
+
+def cargar_plazos_espera(configuracion: str = TIEMPOS_ESPERA) -> dict:
+    """Devuelve PLAZOS_ESPERA con los ajustes 'paso=segundos,otro=segundos' aplicados."""
+    plazos = dict(PLAZOS_ESPERA)
+    for entrada in filter(None, (e.strip() for e in configuracion.split(','))):
+        paso, _, segundos = entrada.partition('=')
+        paso = paso.strip()
+        try:
+            segundos = float(segundos)
+        except ValueError:
+            segundos = -1
+        if paso not in plazos or segundos <= 0:
+            logger.warning(f"Tiempo de espera inválido en TIEMPOS_ESPERA: '{entrada}'")
+            continue
+        plazos[paso] = segundos
+    return plazos
+
+
 class WhatsAppNotifier:
     """
     Clase para automatizar el envío de mensajes de VTV por WhatsApp.
     Optimizada para verificar modales solo al iniciar sesión.
     """
 
-    def __init__(self):
+    MODOS_NAVEGACION = ('busqueda', 'enlace')
+    METODOS_ESCRITURA = ('insertar', 'teclado')
+    MODOS_NAVEGADOR = ('normal', 'liviano')
+
+    def __init__(self, modo_navegacion: str = MODO_NAVEGACION, url_whatsapp: str = URL_WHATSAPP,
+                 perfil_chrome: str = CHROME_PROFILE_PATH, plazos: dict = None,
+                 metodo_escritura: str = METODO_ESCRITURA, sesion_persistente: bool = SESION_PERSISTENTE,
+                 modo_navegador: str = MODO_NAVEGADOR):
         """Inicializa el notificador."""
         self.driver = None
+        self.sesion_persistente = sesion_persistente
+        self.conectado_a_sesion = False  # True si el navegador es el de sesion_persistente.py
+        self.plazos = plazos or cargar_plazos_espera()
+        self.selectores = obtener_registro()
+        self.url_whatsapp = url_whatsapp.rstrip('/')
+        self.perfil_chrome = perfil_chrome
         self.modal_verificado = False  # Flag para controlar la verificación de modales
+        if modo_navegacion not in self.MODOS_NAVEGACION:
+            logger.warning(f"Modo de navegación desconocido '{modo_navegacion}', se usa 'busqueda'.")
+            modo_navegacion = 'busqueda'
+        self.modo_navegacion = modo_navegacion
+        if metodo_escritura not in self.METODOS_ESCRITURA:
+            logger.warning(f"Método de escritura desconocido '{metodo_escritura}', se usa 'insertar'.")
+            metodo_escritura = 'insertar'
+        self.metodo_escritura = metodo_escritura
+        if modo_navegador not in self.MODOS_NAVEGADOR:
+            logger.warning(f"Modo de navegador desconocido '{modo_navegador}', se usa 'normal'.")
+            modo_navegador = 'normal'
+        self.modo_navegador = modo_navegador
+
+    def _conectar_sesion_persistente(self) -> bool:
+        """
+        Se conecta al Chrome persistente del perfil (abriéndolo si todavía no existe).
+
+        Returns:
+            bool: True si quedó conectado; False para abrir un navegador propio como siempre.
+        """
+        direccion = direccion_depuracion(self.perfil_chrome) or iniciar_sesion(self.perfil_chrome, self.url_whatsapp)
+        if not direccion:
+            logger.warning("⚠️ No hay sesión persistente disponible; se abre un navegador nuevo.")
+            return False
+        try:
+            chrome_options = Options()
+            chrome_options.debugger_address = direccion
+            self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo conectar a la sesión persistente en {direccion}: {e}")
+            return False
+        self.conectado_a_sesion = True
+        logger.info(f"🔗 Conectado a la sesión persistente de Chrome en {direccion}")
+        return True
 
     def inicializar_driver(self):
         """
         Inicializa el driver de Chrome con configuración optimizada.
+
+        Con SESION_PERSISTENTE se conecta al navegador que mantiene sesion_persistente.py.
         """
         try:
+            if self.sesion_persistente and self._conectar_sesion_persistente():
+                self.driver.set_script_timeout(max(self.plazos.values()) + 5)
+                if self.modo_navegador == 'liviano':
+                    self._bloquear_recursos()
+                return True
+
             logger.info("Inicializando el driver de Chrome...")
             chrome_options = Options()
-            chrome_options.add_argument(f"--user-data-dir={CHROME_PROFILE_PATH}")
+            chrome_options.add_argument(f"--user-data-dir={self.perfil_chrome}")
             chrome_options.add_argument(f"--user-agent={USER_AGENT}")
             chrome_options.add_argument("--no-sandbox")
             chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--start-maximized")
+            if self.modo_navegador == 'liviano':
+                for argumento in ARGUMENTOS_LIVIANO:
+                    chrome_options.add_argument(argumento)
+            else:
+                chrome_options.add_argument("--start-maximized")
             chrome_options.add_argument("--disable-gpu")
             chrome_options.add_argument("--disable-extensions")
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
@@ -59,6 +550,10 @@ class WhatsAppNotifier:
             
             # Script para ocultar que es un navegador automatizado
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            # Las esperas asíncronas vencen solas con el plazo de su paso; esto es solo un tope
+            self.driver.set_script_timeout(max(self.plazos.values()) + 5)
+            if self.modo_navegador == 'liviano':
+                self._bloquear_recursos()
             
             logger.info("Driver de Chrome inicializado correctamente.")
             return True
@@ -67,6 +562,79 @@ class WhatsAppNotifier:
             logger.critical("Asegúrate de tener Google Chrome instalado y una conexión a internet.")
             return False
 
+    def _bloquear_recursos(self):
+        """Evita que la pestaña descargue imágenes, archivos y fuentes (modo liviano)."""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': URLS_BLOQUEADAS_LIVIANO})
+            logger.info("🪶 Modo liviano: sin ventana y sin descargar imágenes, archivos ni fuentes.")
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo activar el bloqueo de recursos: {e}")
+
+    def _esperar(self, paso: str, condicion):
+        """
+        Espera con WebDriverWait a que se cumpla `condicion`, con el plazo del paso.
+
+        Raises:
+            TimeoutException: Si la condición no se cumple dentro del plazo.
+        """
+        return WebDriverWait(self.driver, self.plazos[paso], poll_frequency=0.1).until(condicion)
+
+    def _esperar_dom(self, paso: str, condicion: str, *argumentos, quietud_ms: int = 0):
+        """
+        Espera dentro del navegador, con un MutationObserver, a que la condición JavaScript
+        devuelva un valor verdadero. Devuelve ese valor, o None si vence el plazo del paso.
+        """
+        script = PLANTILLA_ESPERA_DOM.replace('/*CONDICION*/', condicion)
+        try:
+            return self.driver.execute_async_script(script, *argumentos, int(self.plazos[paso] * 1000), quietud_ms)
+        except TimeoutException:
+            return None
+
+    def _esperar_foco(self, elemento) -> bool:
+        """Espera a que el elemento tenga el foco después de un clic."""
+        try:
+            self._esperar('foco', lambda driver: driver.switch_to.active_element == elemento)
+            return True
+        except TimeoutException:
+            logger.debug("El campo no recibió el foco dentro del plazo")
+            return False
+
+    def _localizar(self, rol: str, selectores: list, paso: str, condicion=EC.element_to_be_clickable):
+        """
+        Devuelve el primer elemento que cumple `condicion`, probando los selectores
+        en el orden del registro (el que más acierta primero), o None.
+        """
+        def intentar(selector):
+            try:
+                return self._esperar(paso, condicion((By.XPATH, selector)))
+            except TimeoutException:
+                return None
+
+        selector, elemento = self.selectores.buscar(rol, selectores, intentar)
+        if selector:
+            logger.debug(f"{rol} encontrado con selector: {selector}")
+        return elemento
+
+    def _campo_busqueda_presente(self):
+        """Condición que se cumple con cualquiera de los selectores del campo de búsqueda."""
+        return EC.any_of(*(EC.presence_of_element_located((By.XPATH, s)) for s in SELECTORES_CAMPO_BUSQUEDA))
+
+    def _registrar_pasada(self, rol: str, selectores: list, resultado: dict):
+        """Registra en el registro de selectores el resultado de una búsqueda hecha dentro de la página."""
+        for indice in resultado.get('vacios', []):
+            self.selectores.registrar(rol, selectores[indice], False)
+        if resultado.get('indice') is not None:
+            self.selectores.registrar(rol, selectores[resultado['indice']], True)
+
+    def _esperar_cierre_modal(self) -> bool:
+        """Espera a que no quede ninguna ventana modal visible."""
+        try:
+            self._esperar('modal_cerrado', EC.invisibility_of_element_located((By.XPATH, "//div[@role='dialog']")))
+            return True
+        except TimeoutException:
+            return False
+
     def _cerrar_ventanas_modales(self):
         """
         Detecta y cierra ventanas modales que pueden aparecer en WhatsApp Web.
@@ -75,18 +643,12 @@ class WhatsAppNotifier:
         try:
             logger.info("Verificando si hay ventanas modales que cerrar...")
 
-            # Esperar un poco para que el modal se cargue completamente
-            time.sleep(3)
-
             # Verificar si hay un modal general usando role="dialog"
             modal_dialog_found = False
             try:
-                modal_dialog = WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.XPATH, "//div[@role='dialog']"))
-                )
-                if modal_dialog.is_displayed():
-                    logger.info("Modal detectado usando role='dialog'")
-                    modal_dialog_found = True
+                self._esperar('modal', EC.visibility_of_element_located((By.XPATH, "//div[@role='dialog']")))
+                logger.info("Modal detectado usando role='dialog'")
+                modal_dialog_found = True
             except TimeoutException:
                 logger.debug("No se encontró modal con role='dialog'")
 
@@ -94,24 +656,11 @@ class WhatsAppNotifier:
                 logger.info("No se encontraron ventanas modales para cerrar.")
                 return
 
-            # Lista de selectores específicos para el modal
-            selectores_botones = [
-                "//div[@role='dialog']//div[@role='button'][contains(text(), 'Continuar')]",
-                "//div[@role='dialog']//button[contains(text(), 'Continuar')]",
-                "//div[@role='dialog']//span[contains(text(), 'Continuar')]",
-                "//div[@role='dialog']//div[contains(text(), 'Continuar')]",
-                "//div[@role='dialog']//div[@role='button']",
-                "//div[@role='dialog']//button",
-                "//div[@role='dialog']//button[contains(@aria-label, 'Cerrar')]",
-                "//div[@role='dialog']//div[contains(@aria-label, 'Close')]",
-                "//div[@role='dialog']//button[contains(@aria-label, 'Close')]",
-                "//div[@role='dialog']//*[@role='button']",
-                "//div[@role='dialog']//button[@type='button']",
-            ]
-
             modal_cerrado = False
 
-            for i, selector in enumerate(selectores_botones):
+            # Selectores de botones ordenados por su tasa de acierto en ejecuciones anteriores
+            for i, selector in enumerate(self.selectores.ordenar('boton_modal', SELECTORES_BOTON_MODAL)):
+                inicio = time.perf_counter()
                 try:
                     logger.debug(f"Probando selector {i+1}: {selector}")
                     elementos = self.driver.find_elements(By.XPATH, selector)
@@ -124,7 +673,6 @@ class WhatsAppNotifier:
                                 if elemento.is_displayed() and elemento.is_enabled():
                                     # Hacer scroll al elemento
                                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elemento)
-                                    time.sleep(0.5)
 
                                     # Intentar diferentes métodos de clic
                                     try:
@@ -149,26 +697,25 @@ class WhatsAppNotifier:
                                                 continue
                             except Exception:
                                 continue
-                            
-                        if modal_cerrado:
-                            break
 
                 except Exception:
-                    continue
+                    pass
+
+                self.selectores.registrar('boton_modal', selector, modal_cerrado, time.perf_counter() - inicio)
+                if modal_cerrado:
+                    break
                 
             # Si no se pudo cerrar con los selectores específicos, intentar presionar ESC
             if not modal_cerrado:
                 logger.info("Intentando cerrar modal con tecla ESC...")
                 try:
                     self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                    time.sleep(2)
                     modal_cerrado = True
                     logger.info("Modal cerrado con tecla ESC")
                 except Exception:
                     pass
 
-            if modal_cerrado:
-                time.sleep(3)
+            if modal_cerrado and self._esperar_cierre_modal():
                 logger.info("Modal cerrado exitosamente")
             else:
                 logger.warning("No se pudo cerrar el modal automáticamente")
@@ -182,26 +729,31 @@ class WhatsAppNotifier:
         Incluye verificación de modales SOLO una vez.
         """
         try:
-            logger.info("Accediendo a WhatsApp Web...")
-            self.driver.get("https://web.whatsapp.com")
+            if self.conectado_a_sesion and self.driver.current_url.startswith(self.url_whatsapp):
+                # La pestaña ya tiene WhatsApp Web cargado y sincronizado: no recargarla
+                logger.info("Usando la pestaña de WhatsApp Web de la sesión persistente.")
+            else:
+                logger.info("Accediendo a WhatsApp Web...")
+                self.driver.get(self.url_whatsapp)
 
             logger.info("Esperando autenticación. Escanea el código QR si es necesario.")
             
             # Intentar detectar si ya está logueado
             try:
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.XPATH, "//div[@contenteditable='true'][@data-tab='3']"))
-                )
+                self._esperar('sesion', self._campo_busqueda_presente())
                 logger.info("Sesión de WhatsApp ya activa.")
             except TimeoutException:
                 # Si no está logueado, esperar el código QR
                 logger.info("Esperando escaneo de código QR (máximo 60 segundos)...")
-                WebDriverWait(self.driver, 60).until_not(
+                if self.modo_navegador == 'liviano':
+                    # Sin ventana el código no se ve: guardarlo como imagen para poder escanearlo
+                    ruta_qr = os.path.join(self.perfil_chrome, 'codigo_qr.png')
+                    self.driver.save_screenshot(ruta_qr)
+                    logger.warning(f"⚠️ Modo liviano sin sesión iniciada: escaneá el código QR guardado en {ruta_qr}")
+                WebDriverWait(self.driver, self.plazos['codigo_qr']).until_not(
                     EC.presence_of_element_located((By.XPATH, "//canvas[@aria-label='Scan me!']"))
                 )
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.XPATH, "//div[@contenteditable='true'][@data-tab='3']"))
-                )
+                self._esperar('sesion', self._campo_busqueda_presente())
                 logger.info("Autenticación por código QR exitosa.")
             
             # VERIFICACIÓN DE MODALES - SOLO UNA VEZ
@@ -226,25 +778,8 @@ class WhatsAppNotifier:
         SIN verificación de modales.
         """
         try:
-            # Buscar el campo de búsqueda con múltiples selectores
-            selectores_busqueda = [
-                "//div[@contenteditable='true'][@data-tab='3']",
-                "//div[@role='textbox'][@data-tab='3']",
-                "//div[contains(@aria-label, 'Buscar')][@contenteditable='true']",
-                "//div[@aria-label='Cuadro de texto para ingresar la búsqueda']",
-            ]
-
-            search_box = None
-            for selector in selectores_busqueda:
-                try:
-                    search_box = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    if search_box:
-                        logger.debug(f"Campo de búsqueda encontrado con selector: {selector}")
-                        break
-                except TimeoutException:
-                    continue
+            # Buscar el campo de búsqueda con múltiples selectores, empezando por el que más acierta
+            search_box = self._localizar('campo_busqueda', SELECTORES_CAMPO_BUSQUEDA, 'campo_busqueda')
                 
             if not search_box:
                 logger.error("No se pudo encontrar el campo de búsqueda")
@@ -252,7 +787,6 @@ class WhatsAppNotifier:
 
             # Hacer scroll al campo de búsqueda
             self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", search_box)
-            time.sleep(1)
 
             # Intentar diferentes métodos para hacer clic
             click_successful = False
@@ -279,18 +813,15 @@ class WhatsAppNotifier:
                 logger.warning("No se pudo hacer clic en el campo de búsqueda")
                 return False
 
-            time.sleep(0.5)
+            self._esperar_foco(search_box)
 
             # Limpiar el campo usando múltiples métodos
             try:
                 search_box.send_keys(Keys.CONTROL + "a")
-                time.sleep(0.2)
                 search_box.send_keys(Keys.DELETE)
-                time.sleep(0.2)
                 search_box.send_keys(Keys.BACKSPACE)
-                time.sleep(0.2)
                 self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                time.sleep(0.5)
+                self._esperar('busqueda_limpia', lambda driver: not (search_box.get_attribute('innerText') or '').strip())
 
                 logger.debug("Campo de búsqueda limpiado exitosamente")
                 return True
@@ -316,84 +847,109 @@ class WhatsAppNotifier:
                 return False
             
             # Paso 2: Encontrar y hacer clic en el campo de búsqueda
-            search_box = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//div[@contenteditable='true'][@data-tab='3']"))
-            )
+            search_box = self._localizar('campo_busqueda', SELECTORES_CAMPO_BUSQUEDA, 'campo_busqueda')
+            if not search_box:
+                logger.error("No se pudo encontrar el campo de búsqueda")
+                return False
             
             # Paso 3: Escribir el número de teléfono
             search_box.click()
-            time.sleep(0.5)
+            self._esperar_foco(search_box)
+            self.driver.execute_script(SCRIPT_OBSERVAR_RESULTADOS)
             search_box.send_keys(numero)
-            time.sleep(2)  # Esperar a que aparezcan los resultados
-            
-            # Paso 4: Buscar el contacto en los resultados
-            selectores_resultado = [
-                "//div[@data-testid='cell-frame-container']",
-                "//div[contains(@class, 'zoWT4')]",
-                "//div[contains(@class, '_21S-L')]",
-                "//div[contains(@class, 'zoWT4')]//span[contains(@class, 'ggj6brxn')]",
-                "//div[contains(@class, 'cell-frame-container')]",
-                "//div[@role='listitem']",
-                "//div[contains(@class, 'chat-title')]",
-                "//div[contains(@class, 'chat')]//span[contains(@title, '{}')]".format(numero)
-            ]
-            
-            contacto_encontrado = False
-            
-            for i, selector in enumerate(selectores_resultado):
-                try:
-                    logger.debug(f"Intentando selector {i+1}: {selector}")
-                    
-                    resultados = WebDriverWait(self.driver, 3).until(
-                        EC.presence_of_all_elements_located((By.XPATH, selector))
-                    )
-                    
-                    # Buscar en todos los resultados
-                    for resultado in resultados:
-                        try:
-                            texto_resultado = resultado.get_attribute('innerText') or ''
-                            if numero in texto_resultado or any(digit in texto_resultado for digit in numero[-4:]):
-                                
-                                # Hacer scroll al elemento si es necesario
-                                self.driver.execute_script("arguments[0].scrollIntoView(true);", resultado)
-                                time.sleep(0.5)
-                                
-                                # Hacer clic en el resultado
-                                resultado.click()
-                                contacto_encontrado = True
-                                logger.debug(f"Contacto encontrado y seleccionado con selector {i+1}")
-                                break
-                        except Exception:
-                            continue
-                    
-                    if contacto_encontrado:
-                        break
-                        
-                except TimeoutException:
-                    continue
-                except Exception:
-                    continue
-            
-            if not contacto_encontrado:
+
+            # Paso 4: Resolver los resultados en el navegador apenas dejan de cambiar
+            selectores = self.selectores.ordenar('resultado_busqueda', SELECTORES_RESULTADO)
+            resultado = self._esperar_dom(
+                'resultados_busqueda', CONDICION_RESOLVER_RESULTADO, numero,
+                [selector.replace('{numero}', numero) for selector in selectores], quietud_ms=300
+            )
+            self.driver.execute_script(SCRIPT_DEJAR_OBSERVAR_RESULTADOS)
+            if resultado and resultado.get('indice') is not None:
+                self._registrar_pasada('resultado_busqueda', selectores, resultado)
+
+            if not resultado:
+                logger.warning(f"No se cargaron resultados de búsqueda para: {numero}")
+                return False
+            if resultado['estado'] == 'sin_resultados':
                 logger.warning(f"No se encontró contacto para: {numero}")
                 return False
+            if resultado['estado'] == 'ambiguo':
+                logger.warning(f"Ninguno de los {resultado['cantidad']} resultados coincide con: {numero}")
+                return False
+
+            logger.debug(f"Resultado elegido ({resultado['estado']}): {resultado['texto']}")
+            fila = resultado['elemento']
+            self.driver.execute_script("arguments[0].scrollIntoView(true);", fila)
+
+            # Hacer clic en el resultado (marcando antes la caja de mensaje del chat anterior)
+            self.driver.execute_script(SCRIPT_MARCAR_CHAT_ANTERIOR)
+            fila.click()
             
-            # Paso 5: Verificar que se abrió el chat
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, "//div[@contenteditable='true'][@data-tab='10']"))
-                )
+            # Paso 5: Verificar que se abrió el chat (una caja de mensaje nueva, no la del chat anterior)
+            if self._esperar_dom('chat_abierto', SCRIPT_ESTADO_CHAT) == 'chat':
                 logger.info(f"Chat abierto correctamente para: {numero}")
                 return True
-                
-            except TimeoutException:
-                logger.error(f"No se pudo abrir el chat para: {numero}")
-                return False
+
+            logger.error(f"No se pudo abrir el chat para: {numero}")
+            return False
                 
         except Exception as e:
             logger.error(f"Error al buscar contacto {numero}: {str(e)}")
             return False
 
+    def _abrir_chat_por_enlace(self, numero: str) -> tuple[bool, str]:
+        """
+        Abre el chat directamente con el enlace /send?phone=<número> y verifica el contacto.
+
+        El enlace se inyecta y se cliquea dentro de la sesión ya cargada, así
+        WhatsApp Web navega sin recargar la aplicación. Si no reacciona, se
+        recurre a una navegación completa a la misma URL. La misma espera que
+        detecta el chat nuevo revisa el número en su encabezado; solo si no
+        aparece ahí (un contacto agendado muestra el nombre) se abre el panel
+        de información del contacto.
+
+        Returns:
+            tuple[bool, str]: (True si quedó abierto el chat del número, motivo del fallo).
+        """
+        url = f"{self.url_whatsapp}/send?phone={quote(numero)}"
+        numero_limpio = ''.join(filter(str.isdigit, numero))
+        selectores = self.selectores.ordenar('encabezado', SELECTORES_ENCABEZADO)
+        logger.info(f"Abriendo chat por enlace: {numero}")
+
+        try:
+            self.driver.execute_script(SCRIPT_MARCAR_CHAT_ANTERIOR)
+            self.driver.execute_script(SCRIPT_ABRIR_ENLACE, url)
+            estado = self._esperar_dom('enlace', CONDICION_CHAT_ENLACE, numero_limpio, selectores)
+            if estado is None:
+                logger.info("El enlace no abrió el chat dentro de la sesión, navegando a la URL...")
+                self.driver.get(url)
+                estado = self._esperar_dom('enlace_completo', CONDICION_CHAT_ENLACE, numero_limpio, selectores)
+            if estado is None:
+                return False, f"No se pudo abrir el chat del número {numero}."
+        except Exception as e:
+            logger.error(f"Error al abrir chat por enlace {numero}: {str(e)}")
+            return False, f"No se pudo abrir el chat del número {numero}."
+
+        if estado == 'invalido':
+            logger.warning(f"WhatsApp indica que el número no es válido: {numero}")
+            try:
+                self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
+            except Exception:
+                pass
+            return False, f"El número {numero} no está registrado en WhatsApp."
+
+        self._registrar_pasada('encabezado', selectores, estado)
+        if estado['metodo']:
+            logger.info(f"✓ Contacto verificado por {estado['metodo']}: {estado['texto']}")
+        elif not self._verificar_info_contacto(numero_limpio):
+            logger.error(f"El chat abierto NO corresponde al número esperado: {numero}")
+            self._log_debug_info()
+            return False, f"El chat abierto no corresponde al número {numero}. Envío cancelado por seguridad."
+
+        logger.info(f"Chat abierto correctamente para: {numero}")
+        return True, ""
+
     def _enviar_mensaje(self, mensaje: str) -> bool:
         """
         Envía un mensaje al chat actualmente abierto.
@@ -405,25 +961,27 @@ class WhatsAppNotifier:
             bool: True si el mensaje se envió correctamente, False en caso contrario.
         """
         try:
-            # Limpiar el mensaje de caracteres problemáticos
-            mensaje_limpio = limpiar_texto_unicode(mensaje)
-            
             # Buscar el campo de texto del mensaje
-            message_box = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//div[@contenteditable='true'][@data-tab='10']"))
-            )
+            message_box = self._esperar('caja_mensaje', EC.element_to_be_clickable(
+                (By.XPATH, "//div[@contenteditable='true'][@data-tab='10']")
+            ))
             
             # Hacer clic en el campo de mensaje
             message_box.click()
-            time.sleep(0.5)
+            self._esperar_foco(message_box)
             
             # Escribir el mensaje
-            message_box.send_keys(mensaje_limpio)
-            time.sleep(1)
+            if not self._escribir_mensaje(message_box, mensaje):
+                return False
             
-            # Enviar el mensaje presionando Enter
+            # Enviar el mensaje presionando Enter y esperar la burbuja del mensaje saliente
+            salientes = self.driver.execute_script(SCRIPT_CONTAR_SALIENTES)
             message_box.send_keys(Keys.ENTER)
-            time.sleep(1)
+            if self._esperar_dom('mensaje_enviado', CONDICION_MENSAJE_ENVIADO, salientes) is None:
+                if (message_box.get_attribute('innerText') or '').strip():
+                    logger.error("El mensaje quedó sin enviar en la caja de texto.")
+                    return False
+                logger.warning("No apareció la burbuja del mensaje, pero la caja de texto quedó vacía.")
             
             logger.info("Mensaje enviado correctamente.")
             return True
@@ -435,10 +993,68 @@ class WhatsAppNotifier:
             logger.error(f"Error al enviar mensaje: {str(e)}")
             return False
 
+    @staticmethod
+    def _texto_coincide(esperado: str, obtenido: str) -> bool:
+        """Compara textos ignorando diferencias de espacios y de forma de normalización Unicode."""
+        def normalizar(texto):
+            return ' '.join(unicodedata.normalize('NFC', texto or '').split())
+        return normalizar(esperado) == normalizar(obtenido)
+
+    def _texto_caja(self, message_box) -> str:
+        """Devuelve el texto actual de la caja de mensaje."""
+        return self.driver.execute_script(SCRIPT_TEXTO_CAJA, message_box)
+
+    def _escribir_mensaje(self, message_box, mensaje: str) -> bool:
+        """
+        Escribe el mensaje en la caja y verifica su contenido antes de enviarlo.
+
+        En modo 'insertar' el texto completo entra en una sola llamada (execCommand
+        insertText, o Input.insertText de CDP si el editor no lo aceptó). Si el
+        contenido no coincide, o en modo 'teclado', se tipea con send_keys.
+
+        Returns:
+            bool: True si la caja contiene el mensaje.
+        """
+        if self.metodo_escritura == 'insertar':
+            contenido = self.driver.execute_script(SCRIPT_INSERTAR_TEXTO, message_box, mensaje)
+            if self._texto_coincide(mensaje, contenido):
+                return True
+            try:
+                self._esperar('texto_insertado',
+                              lambda driver: self._texto_coincide(mensaje, self._texto_caja(message_box)))
+                return True
+            except TimeoutException:
+                logger.debug("execCommand no insertó el texto completo, probando con CDP...")
+
+            try:
+                self.driver.execute_script(SCRIPT_SELECCIONAR_CONTENIDO, message_box)
+                self.driver.execute_cdp_cmd('Input.insertText', {'text': mensaje})
+                self._esperar('texto_insertado',
+                              lambda driver: self._texto_coincide(mensaje, self._texto_caja(message_box)))
+                return True
+            except Exception:
+                logger.warning("No se pudo insertar el mensaje de una vez; se escribe con el teclado.")
+
+            # Vaciar lo que haya quedado antes de tipear
+            message_box.send_keys(Keys.CONTROL + "a")
+            message_box.send_keys(Keys.DELETE)
+
+        # Tipeo tecla por tecla: ChromeDriver no soporta caracteres fuera del BMP
+        message_box.send_keys(limpiar_texto_unicode(mensaje))
+        try:
+            self._esperar('texto_escrito', lambda driver: (message_box.get_attribute('innerText') or '').strip())
+        except TimeoutException:
+            logger.error("El mensaje no apareció en la caja de texto.")
+            return False
+        return True
+
     def _verificar_contacto_correcto(self, numero_esperado: str) -> bool:
         """
         Verifica que el chat abierto corresponde al número esperado.
-        Versión mejorada con más selectores y métodos de verificación.
+
+        El encabezado, la URL y los atributos del chat se revisan dentro del
+        navegador con un único script; solo si ninguno coincide se abre el
+        panel de información del contacto.
         
         Args:
             numero_esperado (str): Número que se espera que esté abierto.
@@ -452,31 +1068,19 @@ class WhatsAppNotifier:
             # Limpiar el número esperado (quitar espacios, guiones, etc.)
             numero_limpio = ''.join(filter(str.isdigit, numero_esperado))
             
-            # Esperar a que el chat se cargue completamente
-            time.sleep(2)
-            
-            # Método 1: Verificar el header del chat
-            contacto_verificado = self._verificar_header_chat(numero_limpio)
-            
-            if contacto_verificado:
-                return True
-                
-            # Método 2: Verificar información del contacto mediante clic en el header
-            contacto_verificado = self._verificar_info_contacto(numero_limpio)
-            
-            if contacto_verificado:
-                return True
-                
-            # Método 3: Verificar URL del chat
-            contacto_verificado = self._verificar_url_chat(numero_limpio)
+            # Esperar a que el encabezado del chat se cargue
+            self._esperar_dom('encabezado_chat', CONDICION_ENCABEZADO_CHAT)
             
-            if contacto_verificado:
+            # Métodos 1 a 3: encabezado, URL y atributos del chat, en una sola llamada
+            selectores = self.selectores.ordenar('encabezado', SELECTORES_ENCABEZADO)
+            resultado = self.driver.execute_script(SCRIPT_VERIFICAR_CHAT, numero_limpio, selectores, ATRIBUTOS_NUMERO)
+            self._registrar_pasada('encabezado', selectores, resultado)
+            if resultado['metodo']:
+                logger.info(f"✓ Contacto verificado por {resultado['metodo']}: {resultado['texto']}")
                 return True
                 
-            # Método 4: Verificar mediante atributos data-* y aria-*
-            contacto_verificado = self._verificar_atributos_chat(numero_limpio)
-            
-            if contacto_verificado:
+            # Método 4: Verificar información del contacto mediante clic en el header
+            if self._verificar_info_contacto(numero_limpio):
                 return True
                 
             logger.warning(f"⚠️ No se pudo verificar que el chat corresponde a: {numero_esperado}")
@@ -490,126 +1094,31 @@ class WhatsAppNotifier:
             logger.error(f"Error al verificar contacto: {str(e)}")
             return False
 
-    def _verificar_header_chat(self, numero_limpio: str) -> bool:
-        """Verifica el contacto usando el header del chat."""
-        try:
-            # Selectores actualizados para el header del chat
-            selectores_header = [
-                # Selectores más específicos primero
-                "//header[@data-testid='conversation-header']//span",
-                "//div[@data-testid='conversation-header']//span",
-                "//header//div[contains(@class, 'chat-title')]//span",
-                "//div[@data-testid='conversation-panel-header']//span",
-                
-                # Selectores más generales
-                "//header//span[@title]",
-                "//header//span[contains(@class, 'ggj6brxn')]",
-                "//div[contains(@class, 'zoWT4')]//span[contains(@class, 'ggj6brxn')]",
-                "//div[contains(@class, 'chat-title')]//span",
-                "//header//span[contains(@dir, 'auto')]",
-                "//header//span[text()]",
-                
-                # Selectores alternativos
-                "//div[@role='button']//span[contains(@class, 'ggj6brxn')]",
-                "//div[@data-testid='cell-frame-title']//span",
-                "//div[contains(@class, 'chat-header')]//span",
-            ]
-            
-            for i, selector in enumerate(selectores_header):
-                try:
-                    logger.debug(f"Verificando header con selector {i+1}: {selector}")
-                    
-                    elementos = self.driver.find_elements(By.XPATH, selector)
-                    
-                    for elemento in elementos:
-                        try:
-                            if not elemento.is_displayed():
-                                continue
-                                
-                            # Obtener texto del elemento
-                            texto = elemento.get_attribute('innerText') or ''
-                            titulo = elemento.get_attribute('title') or ''
-                            aria_label = elemento.get_attribute('aria-label') or ''
-                            
-                            # Buscar números en el texto
-                            texto_completo = f"{texto} {titulo} {aria_label}".strip()
-                            numeros_encontrados = ''.join(filter(str.isdigit, texto_completo))
-                            
-                            logger.debug(f"Texto encontrado: '{texto_completo}'")
-                            logger.debug(f"Números extraídos: '{numeros_encontrados}'")
-                            
-                            # Verificar coincidencia
-                            if self._verificar_coincidencia_numeros(numero_limpio, numeros_encontrados):
-                                logger.info(f"✓ Contacto verificado por header: {texto_completo}")
-                                return True
-                                
-                        except Exception as e:
-                            logger.debug(f"Error al procesar elemento del header: {e}")
-                            continue
-                            
-                except Exception as e:
-                    logger.debug(f"Error con selector header {i+1}: {e}")
-                    continue
-                    
-            return False
-            
-        except Exception as e:
-            logger.debug(f"Error en verificación de header: {e}")
-            return False
-
     def _verificar_info_contacto(self, numero_limpio: str) -> bool:
         """Verifica el contacto haciendo clic en la información del contacto."""
         try:
             logger.debug("Intentando verificar mediante información del contacto")
             
-            # Selectores para hacer clic en el header y abrir info del contacto
-            selectores_header_click = [
-                "//header[@data-testid='conversation-header']",
-                "//div[@data-testid='conversation-header']",
-                "//header//div[contains(@class, 'chat-title')]",
-                "//div[@data-testid='conversation-panel-header']",
-                "//header//span[contains(@class, 'ggj6brxn')]",
-            ]
-            
-            for selector in selectores_header_click:
+            for selector in SELECTORES_ENCABEZADO_CLIC:
                 try:
                     header_element = self.driver.find_element(By.XPATH, selector)
                     if header_element.is_displayed():
                         # Hacer clic en el header
                         header_element.click()
-                        time.sleep(1)
+                        try:
+                            self._esperar('panel_info', EC.presence_of_element_located((By.XPATH, SELECTOR_PANEL_INFO)))
+                        except TimeoutException:
+                            logger.debug("No se abrió el panel de información del contacto")
                         
-                        # Buscar información del contacto en el panel que se abre
-                        selectores_info = [
-                            "//div[contains(@class, 'contact-info')]//span",
-                            "//div[@data-testid='drawer-right']//span",
-                            "//div[contains(@class, 'drawer')]//span",
-                            "//div[contains(@class, 'panel-right')]//span",
-                            "//*[contains(text(), '+')]",
-                        ]
+                        # Buscar el número en el panel que se abre, en una sola llamada
+                        texto = self.driver.execute_script(SCRIPT_BUSCAR_EN_PANEL, numero_limpio, SELECTORES_INFO_CONTACTO)
                         
-                        for info_selector in selectores_info:
-                            try:
-                                info_elements = self.driver.find_elements(By.XPATH, info_selector)
-                                for info_element in info_elements:
-                                    texto = info_element.get_attribute('innerText') or ''
-                                    numeros = ''.join(filter(str.isdigit, texto))
-                                    
-                                    if self._verificar_coincidencia_numeros(numero_limpio, numeros):
-                                        logger.info(f"✓ Contacto verificado por info del contacto: {texto}")
-                                        
-                                        # Cerrar el panel de información
-                                        self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                                        time.sleep(0.5)
-                                        
-                                        return True
-                                        
-                            except Exception:
-                                continue
+                        # Cerrar el panel de información
+                        self._cerrar_panel_info()
                         
-                        # Cerrar el panel de información si se abrió
-                        self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-                        time.sleep(0.5)
+                        if texto:
+                            logger.info(f"✓ Contacto verificado por info del contacto: {texto}")
+                            return True
                         break
                         
                 except Exception:
@@ -621,146 +1130,30 @@ class WhatsAppNotifier:
             logger.debug(f"Error en verificación de info del contacto: {e}")
             return False
 
-    def _verificar_url_chat(self, numero_limpio: str) -> bool:
-        """Verifica el contacto usando la URL del chat."""
+    def _cerrar_panel_info(self):
+        """Cierra el panel de información del contacto y espera a que desaparezca."""
+        self.driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
         try:
-            logger.debug("Verificando mediante URL del chat")
-            
-            url_actual = self.driver.current_url
-            logger.debug(f"URL actual: {url_actual}")
-            
-            # Extraer números de la URL
-            numeros_url = ''.join(filter(str.isdigit, url_actual))
-            
-            if self._verificar_coincidencia_numeros(numero_limpio, numeros_url):
-                logger.info(f"✓ Contacto verificado por URL: {url_actual}")
-                return True
-                
-            return False
-            
-        except Exception as e:
-            logger.debug(f"Error en verificación de URL: {e}")
-            return False
-
-    def _verificar_atributos_chat(self, numero_limpio: str) -> bool:
-        """Verifica el contacto usando atributos data-* y aria-*."""
-        try:
-            logger.debug("Verificando mediante atributos del chat")
-            
-            # Buscar elementos con atributos que puedan contener el número
-            selectores_atributos = [
-                "//*[@data-id]",
-                "//*[@aria-label]",
-                "//*[@data-testid]",
-                "//*[@data-phone]",
-                "//*[@data-number]",
-            ]
-            
-            for selector in selectores_atributos:
-                try:
-                    elementos = self.driver.find_elements(By.XPATH, selector)
-                    
-                    for elemento in elementos:
-                        try:
-                            # Revisar diferentes atributos
-                            atributos = ['data-id', 'aria-label', 'data-testid', 'data-phone', 'data-number']
-                            
-                            for atributo in atributos:
-                                valor = elemento.get_attribute(atributo) or ''
-                                numeros = ''.join(filter(str.isdigit, valor))
-                                
-                                if numeros and self._verificar_coincidencia_numeros(numero_limpio, numeros):
-                                    logger.info(f"✓ Contacto verificado por atributo {atributo}: {valor}")
-                                    return True
-                                    
-                        except Exception:
-                            continue
-                            
-                except Exception:
-                    continue
-                    
-            return False
-            
-        except Exception as e:
-            logger.debug(f"Error en verificación de atributos: {e}")
-            return False
-
-    def _verificar_coincidencia_numeros(self, numero_esperado: str, numero_encontrado: str) -> bool:
-        """Verifica si dos números coinciden usando diferentes criterios."""
-        try:
-            if not numero_esperado or not numero_encontrado:
-                return False
-                
-            # Criterio 1: Coincidencia exacta
-            if numero_esperado == numero_encontrado:
-                return True
-                
-            # Criterio 2: Uno contiene al otro
-            if numero_esperado in numero_encontrado or numero_encontrado in numero_esperado:
-                return True
-                
-            # Criterio 3: Coincidencia de los últimos 8 dígitos
-            if len(numero_esperado) >= 8 and len(numero_encontrado) >= 8:
-                if numero_esperado[-8:] == numero_encontrado[-8:]:
-                    return True
-                    
-            # Criterio 4: Coincidencia de los últimos 10 dígitos (sin código país)
-            if len(numero_esperado) >= 10 and len(numero_encontrado) >= 10:
-                if numero_esperado[-10:] == numero_encontrado[-10:]:
-                    return True
-                    
-            # Criterio 5: Verificar si el número esperado está al final del encontrado
-            if numero_encontrado.endswith(numero_esperado):
-                return True
-                
-            return False
-            
-        except Exception as e:
-            logger.debug(f"Error en verificación de coincidencia: {e}")
-            return False
+            self._esperar('panel_info', EC.invisibility_of_element_located((By.XPATH, SELECTOR_PANEL_INFO)))
+        except TimeoutException:
+            logger.debug("El panel de información del contacto sigue visible")
 
     def _log_debug_info(self):
         """Log información adicional para debug."""
         try:
+            info = self.driver.execute_script(SCRIPT_INFO_DEBUG)
             logger.debug("=== DEBUG INFO ===")
-            
-            # Log URL actual
-            url_actual = self.driver.current_url
-            logger.debug(f"URL actual: {url_actual}")
-            
-            # Log título de la página
-            titulo = self.driver.title
-            logger.debug(f"Título: {titulo}")
-            
-            # Log algunos elementos del header
-            try:
-                header_elements = self.driver.find_elements(By.TAG_NAME, "header")
-                for i, header in enumerate(header_elements):
-                    text = header.get_attribute('innerText') or ''
-                    if text.strip():
-                        logger.debug(f"Header {i+1}: {text[:100]}...")
-            except Exception:
-                pass
-                
-            # Log algunos spans visibles
-            try:
-                spans = self.driver.find_elements(By.TAG_NAME, "span")
-                span_count = 0
-                for span in spans:
-                    if span.is_displayed():
-                        text = span.get_attribute('innerText') or ''
-                        if text.strip() and any(c.isdigit() for c in text):
-                            logger.debug(f"Span con números: {text}")
-                            span_count += 1
-                            if span_count >= 5:  # Limitar cantidad de logs
-                                break
-            except Exception:
-                pass
-                
+            logger.debug(f"URL actual: {info['url']}")
+            logger.debug(f"Título: {info['titulo']}")
+            for i, texto in enumerate(info['encabezados']):
+                logger.debug(f"Header {i+1}: {texto[:100]}...")
+            for texto in info['spans']:
+                logger.debug(f"Span con números: {texto}")
             logger.debug("=== END DEBUG INFO ===")
             
         except Exception as e:
             logger.debug(f"Error en debug info: {e}")
+
     def enviar_notificacion(self, numero: str, mensaje: str) -> tuple[bool, str]:
         """
         Orquesta el proceso completo: buscar contacto, verificar y enviar mensaje.
@@ -772,10 +1165,18 @@ class WhatsAppNotifier:
         Returns:
             tuple[bool, str]: (True/False si fue exitoso, Razón del fallo).
         """
+        if self.modo_navegacion == 'enlace':
+            # El enlace abre el chat del número sin pasar por el buscador; el contacto se
+            # verifica igual (por el encabezado) antes de escribir
+            abierto, razon = self._abrir_chat_por_enlace(numero)
+            if not abierto:
+                return False, razon
+            if not self._enviar_mensaje(mensaje):
+                return False, f"Fallo al enviar el mensaje a {numero}."
+            return True, "Enviado"
+
         if not self._buscar_contacto(numero):
             return False, f"No se pudo encontrar o seleccionar el contacto {numero}."
-        
-        time.sleep(1)  # Pequeña pausa entre la selección y la verificación
 
         # NUEVA VERIFICACIÓN: Confirmar que el chat correcto está abierto
         if not self._verificar_contacto_correcto(numero):
@@ -783,8 +1184,6 @@ class WhatsAppNotifier:
             self._limpiar_campo_busqueda()  # Limpiar búsqueda
             return False, f"El chat abierto no corresponde al número {numero}. Envío cancelado por seguridad."
 
-        time.sleep(0.5)  # Pequeña pausa entre la verificación y el envío
-
         if not self._enviar_mensaje(mensaje):
             return False, f"Fallo al enviar el mensaje a {numero}."
         
@@ -796,6 +1195,21 @@ class WhatsAppNotifier:
     def cerrar(self):
         """Cierra el navegador y finaliza la sesión."""
         if self.driver:
-            logger.info("Cerrando el navegador...")
-            time.sleep(3)
-            self.driver.quit()
\ No newline at end of file
+            if self.conectado_a_sesion:
+                # Con un navegador conectado por debuggerAddress, quit() termina la sesión de
+                # ChromeDriver pero deja Chrome abierto para la próxima ejecución
+                logger.info("Desconectando de la sesión persistente (el navegador queda abierto)...")
+            else:
+                logger.info("Cerrando el navegador...")
+            self.selectores.guardar()
+            # Dar tiempo a que salgan los mensajes que todavía muestran el reloj de pendiente
+            try:
+                if self._esperar_dom('cierre', CONDICION_SIN_PENDIENTES) is None:
+                    logger.warning("Quedan mensajes pendientes de envío al cerrar el navegador.")
+            except Exception:
+                pass
+            try:
+                self.driver.quit()
+            finally:
+                # Cerrar dos veces no hace nada (el pool puede cerrar una sesión que todavía se está iniciando)
+                self.driver = None
\ No newline at end of file